@@ -107,6 +107,14 @@ def _format_failures(
     )
 
 
+def _format_member_changes(member_changes: list[dict]) -> str:
+    """Summarize changes to the members of a zipfile, like ``+a.csv ~b.csv``."""
+    symbols = {"CREATE": "+", "UPDATE": "~", "DELETE": "-"}
+    return " ".join(
+        f"{symbols[change['diff_type']]}{change['name']}" for change in member_changes
+    )
+
+
 def _format_summary(
     summary: dict,
     include_action: bool = True,
@@ -128,6 +136,10 @@ def _format_summary(
         file_change_table["partition_changes"] = (
             file_change_table["partition_changes"].astype(str).replace("[]", "")
         )  # Replace no partition change with empty string
+        if "member_changes" in file_change_table:
+            file_change_table["member_changes"] = file_change_table[
+                "member_changes"
+            ].apply(_format_member_changes)
         # Convert to Markdown table
         changes = file_change_table.to_markdown(index=False)
         action = "Reviewed and published to Zenodo" if include_action else None
@@ -3,12 +3,22 @@
 import asyncio
 import json
 import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import aiohttp
+from pydantic import BaseModel
 
+from pudl_archiver.archivers.browser_pool import close_browser_pool
 from pudl_archiver.archivers.classes import AbstractDatasetArchiver
+from pudl_archiver.archivers.cpu_pool import close_cpu_pool
+from pudl_archiver.archivers.plan import ChangePlan, predict_changes
+from pudl_archiver.archivers.validate import RunSummary
+from pudl_archiver.depositors import get_published_datapackage
 from pudl_archiver.frictionless import Partitions
+from pudl_archiver.journal import RunJournal
 from pudl_archiver.orchestrator import orchestrate_run
 from pudl_archiver.utils import RunSettings
 
@@ -51,12 +61,8 @@ def all_archivers():
 ARCHIVERS = {archiver.name: archiver for archiver in all_archivers()}
 
 
-async def archive_dataset(
-    dataset: str,
-    run_settings: RunSettings,
-    skip_partitions: dict[str, Partitions] | None = None,
-):
-    """A CLI for the PUDL Zenodo Storage system."""
+def _trace_config() -> aiohttp.TraceConfig:
+    """Log the start and end of every request made by a session at debug level."""
 
     async def on_request_start(session, trace_config_ctx, params):
         logger.debug(f"Starting request {params.url}: headers {params.headers}")
@@ -72,45 +78,235 @@ async def archive_dataset(
     trace_config.on_request_start.append(on_request_start)
     trace_config.on_response_chunk_received.append(on_response_chunk_received)
     trace_config.on_request_end.append(on_request_end)
+    return trace_config
 
+
+@asynccontextmanager
+async def archiver_session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Create the HTTP session used by archivers and depositors.
+
+    The per-host connection limit applies to everything using the session, so
+    datasets archived concurrently with one session share it.
+    """
     connector = aiohttp.TCPConnector(limit_per_host=20, force_close=True)
     async with aiohttp.ClientSession(
-        trace_configs=[trace_config],
+        trace_configs=[_trace_config()],
         connector=connector,
         raise_for_status=False,
         timeout=aiohttp.ClientTimeout(total=10 * 60),
     ) as session:
-        # List to gather all archivers to run asyncronously
-        cls = ARCHIVERS.get(dataset)
-        if not cls:
-            raise RuntimeError(f"Dataset {dataset} not supported")
-        downloader = cls(
-            session,
-            run_settings.only_years,
+        yield session
+
+
+def _validation_failure_message(summary: RunSummary) -> str:
+    """Describe the failed validation tests in a run summary."""
+    failed = summary.get_failed_tests()
+    lines = [f"Archive validation failed: {len(failed)} test(s) did not pass.\n"]
+    for test in failed:
+        required = "required" if test.required_for_run_success else "optional"
+        lines.append(f"  FAILED [{required}] {test.name}")
+        lines.append(f"    {test.description}")
+        if test.notes:
+            lines.append(f"    Notes: {'; '.join(test.notes)}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _get_downloader(
+    dataset: str, run_settings: RunSettings, session: aiohttp.ClientSession
+) -> AbstractDatasetArchiver:
+    """Create the archiver for a dataset."""
+    cls = ARCHIVERS.get(dataset)
+    if not cls:
+        raise RuntimeError(f"Dataset {dataset} not supported")
+    return cls(
+        session,
+        run_settings.only_years,
+        max_disk_bytes=run_settings.max_disk_bytes,
+        incremental=run_settings.incremental,
+    )
+
+
+async def _plan_dataset(
+    dataset: str, run_settings: RunSettings, session: aiohttp.ClientSession
+) -> ChangePlan:
+    """Predict which resources will change compared to the published version."""
+    downloader = _get_downloader(dataset, run_settings, session)
+    planned_resources = await downloader.plan_resources()
+    datapackage = await get_published_datapackage(dataset, session, run_settings)
+    change_plan = predict_changes(dataset, planned_resources, datapackage)
+    logger.info(change_plan.summarize())
+    return change_plan
+
+
+async def plan_dataset(
+    dataset: str, run_settings: RunSettings, plan_file: str | None = None
+) -> ChangePlan:
+    """Predict which resources of a dataset will change without downloading them.
+
+    Args:
+        dataset: Name of the dataset.
+        run_settings: Settings for the run, used to find the published version.
+        plan_file: If passed, write the predicted changes to this JSON file.
+    """
+    try:
+        async with archiver_session() as session:
+            change_plan = await _plan_dataset(dataset, run_settings, session)
+    finally:
+        await close_cpu_pool()
+        await close_browser_pool()
+    if plan_file is not None:
+        await asyncio.to_thread(
+            Path(plan_file).write_text, change_plan.model_dump_json(indent=2)
         )
-        summary, _published = await orchestrate_run(
-            dataset=dataset,
-            downloader=downloader,
-            run_settings=run_settings,
-            session=session,
-            skip_partitions=skip_partitions,
+    return change_plan
+
+
+async def _run_dataset(
+    dataset: str,
+    run_settings: RunSettings,
+    session: aiohttp.ClientSession,
+    skip_partitions: dict[str, Partitions] | None = None,
+    journal: RunJournal | None = None,
+) -> RunSummary:
+    """Archive a single dataset and write its run summary.
+
+    Unless resuming from an existing journal, a new journal is started if the run
+    settings have a ``journal_file``. The journal is deleted once the run succeeds,
+    since it's only needed to resume an interrupted run. If the run settings have
+    ``only_changed``, resources predicted to be unchanged are skipped.
+    """
+    if journal is None and run_settings.journal_file is not None:
+        journal = await asyncio.to_thread(
+            RunJournal.create, run_settings.journal_file, dataset, run_settings
         )
+    if run_settings.only_changed and not run_settings.initialize:
+        change_plan = await _plan_dataset(dataset, run_settings, session)
+        skip_partitions = change_plan.unchanged_partitions | (skip_partitions or {})
+    downloader = _get_downloader(dataset, run_settings, session)
+    summary, _published = await orchestrate_run(
+        dataset=dataset,
+        downloader=downloader,
+        run_settings=run_settings,
+        session=session,
+        skip_partitions=skip_partitions,
+        journal=journal,
+    )
 
     if run_settings.summary_file is not None:
         await asyncio.to_thread(
             Path(run_settings.summary_file).write_text,
             json.dumps(summary.model_dump(), indent=2),
         )
+    if journal is not None and summary.success:
+        await asyncio.to_thread(journal.path.unlink, missing_ok=True)
+    return summary
+
+
+async def archive_dataset(
+    dataset: str,
+    run_settings: RunSettings,
+    skip_partitions: dict[str, Partitions] | None = None,
+    journal: RunJournal | None = None,
+):
+    """A CLI for the PUDL Zenodo Storage system."""
+    try:
+        async with archiver_session() as session:
+            summary = await _run_dataset(
+                dataset, run_settings, session, skip_partitions, journal
+            )
+    finally:
+        await close_cpu_pool()
+        await close_browser_pool()
 
     # Check validation results of all runs that aren't unchanged
     if not summary.success:
-        failed = summary.get_failed_tests()
-        lines = [f"Archive validation failed: {len(failed)} test(s) did not pass.\n"]
-        for test in failed:
-            required = "required" if test.required_for_run_success else "optional"
-            lines.append(f"  FAILED [{required}] {test.name}")
-            lines.append(f"    {test.description}")
-            if test.notes:
-                lines.append(f"    Notes: {'; '.join(test.notes)}")
-            lines.append("")
-        raise RuntimeError("\n".join(lines))
+        raise RuntimeError(_validation_failure_message(summary))
+
+
+class DatasetRunResult(BaseModel):
+    """Outcome of archiving one dataset as part of a batch."""
+
+    dataset: str
+    success: bool
+    duration_s: float
+    error: str | None = None
+
+
+async def archive_datasets(
+    run_settings: dict[str, RunSettings],
+    max_concurrent_datasets: int = 8,
+) -> list[DatasetRunResult]:
+    """Archive several datasets concurrently in one process.
+
+    All datasets share a single HTTP session, so the per-host connection limit is
+    shared between them, as is the process pool for CPU-bound work. Zenodo rate
+    limits apply to the whole account, so depositors talking to the same server also
+    share one read and one write budget (see
+    :mod:`pudl_archiver.depositors.zenodo.rate_limit`). Archiving more datasets at
+    once speeds up downloads, but their uploads queue behind the same cap on
+    concurrent writes while each waiting dataset keeps its downloaded files on disk.
+
+    At most ``max_concurrent_datasets`` are archived at once. A dataset failing
+    doesn't stop the others. Each dataset writes its own run summary file as
+    configured in its run settings.
+
+    Args:
+        run_settings: Settings for each dataset to archive, keyed by dataset name.
+        max_concurrent_datasets: Maximum number of datasets to archive at once.
+
+    Returns:
+        Result of each dataset, in the order they were passed in.
+
+    Raises:
+        RuntimeError: if any dataset failed to archive or validate.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent_datasets)
+
+    async def _archive(
+        dataset: str, settings: RunSettings, session: aiohttp.ClientSession
+    ) -> DatasetRunResult:
+        async with semaphore:
+            logger.info(f"Archiving {dataset}.")
+            start = time.perf_counter()
+            error = None
+            try:
+                summary = await _run_dataset(dataset, settings, session)
+                if not summary.success:
+                    error = _validation_failure_message(summary)
+                    logger.error(f"{dataset}: {error}")
+            except Exception as e:
+                logger.exception(f"Error archiving {dataset}")
+                error = repr(e)
+            return DatasetRunResult(
+                dataset=dataset,
+                success=error is None,
+                duration_s=time.perf_counter() - start,
+                error=error,
+            )
+
+    start = time.perf_counter()
+    try:
+        async with archiver_session() as session:
+            results = await asyncio.gather(
+                *[
+                    _archive(dataset, settings, session)
+                    for dataset, settings in run_settings.items()
+                ]
+            )
+    finally:
+        await close_cpu_pool()
+        await close_browser_pool()
+    total_s = time.perf_counter() - start
+
+    lines = [f"Archived {len(results)} datasets in {total_s:.1f}s:"]
+    lines += [
+        f"  {result.dataset}: {'succeeded' if result.success else 'FAILED'} "
+        f"in {result.duration_s:.1f}s"
+        for result in results
+    ]
+    logger.info("\n".join(lines))
+
+    if failed := [result.dataset for result in results if not result.success]:
+        raise RuntimeError(f"Failed to archive datasets: {', '.join(failed)}")
+    return results
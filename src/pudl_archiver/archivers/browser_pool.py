@@ -0,0 +1,176 @@
+"""Share Playwright browsers between every archiver and resource in a run.
+
+Some data sources can only be scraped or downloaded with a real browser. Launching
+one takes a few seconds and a few hundred MB of memory, which adds up when every
+resource launches its own. ``BrowserPool`` launches at most one browser per engine,
+the first time it's needed, and hands out isolated browser contexts and pages from
+it. All archivers in an event loop share one pool, which is closed at the end of the
+run, so browser startup is paid once per run.
+
+Each context or page handed out holds one of a limited number of slots until it's
+closed, so archivers downloading many resources at once don't open more pages than
+the browser can handle. Code that's holding a page shouldn't ask for another, or it
+may wait for a slot forever.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Literal
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+from pydantic import BaseModel
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+BrowserEngine = Literal["chromium", "firefox", "webkit"]
+
+#: Maximum number of browser contexts open at once, across all engines
+MAX_BROWSER_CONTEXTS = 8
+
+
+class BrowserPoolMetrics(BaseModel):
+    """Browser launches and page usage of a ``BrowserPool`` over a run."""
+
+    launches: dict[str, int] = {}
+    contexts: int = 0
+    #: most contexts open at once
+    max_open_contexts: int = 0
+    #: total time spent waiting for a free context slot
+    slot_wait_s: float = 0.0
+    #: total time spent launching browsers
+    launch_s: float = 0.0
+
+    def summarize(self) -> str:
+        """Describe pool usage in a human readable way."""
+        launches = ", ".join(
+            f"{count} {engine}" for engine, count in sorted(self.launches.items())
+        )
+        return (
+            f"Browser pool launched {launches} and opened {self.contexts} contexts "
+            f"in {self.launch_s:.1f}s of startup: at most {self.max_open_contexts} "
+            f"open at once, {self.slot_wait_s:.1f}s total waiting for a slot."
+        )
+
+
+class BrowserPool:
+    """Lazily launched browsers, handing out contexts and pages with bounded concurrency."""
+
+    def __init__(self, max_contexts: int = MAX_BROWSER_CONTEXTS):
+        """Create a pool. Nothing is launched until a browser is needed.
+
+        Args:
+            max_contexts: Maximum number of contexts and pages open at once.
+        """
+        self.max_contexts = max_contexts
+        self.metrics = BrowserPoolMetrics()
+        self._playwright: Playwright | None = None
+        self._browsers: dict[str, Browser] = {}
+        self._launch_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_contexts)
+        self._open_contexts = 0
+
+    async def get_browser(self, engine: BrowserEngine = "webkit") -> Browser:
+        """Get the shared browser for an engine, launching it if needed.
+
+        Prefer ``context`` or ``page``, which limit how many pages are open at once.
+        """
+        if (browser := self._browsers.get(engine)) is not None:
+            return browser
+        async with self._launch_lock:
+            if engine not in self._browsers:
+                start = time.monotonic()
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                logger.info(f"Launching shared {engine} browser.")
+                self._browsers[engine] = await getattr(self._playwright, engine).launch(
+                    headless=True
+                )
+                self.metrics.launches[engine] = self.metrics.launches.get(engine, 0) + 1
+                self.metrics.launch_s += time.monotonic() - start
+        return self._browsers[engine]
+
+    @asynccontextmanager
+    async def context(
+        self, engine: BrowserEngine = "webkit", **kwargs: Any
+    ) -> AsyncIterator[BrowserContext]:
+        """Open a new browser context, closing it when done.
+
+        Contexts don't share cookies or storage, so each resource can be downloaded
+        in a clean session.
+
+        Args:
+            engine: Browser engine to use.
+            kwargs: Options to pass to ``Browser.new_context``.
+        """
+        start = time.monotonic()
+        async with self._slots:
+            self.metrics.slot_wait_s += time.monotonic() - start
+            browser = await self.get_browser(engine)
+            context = await browser.new_context(**kwargs)
+            self.metrics.contexts += 1
+            self._open_contexts += 1
+            self.metrics.max_open_contexts = max(
+                self.metrics.max_open_contexts, self._open_contexts
+            )
+            try:
+                yield context
+            finally:
+                self._open_contexts -= 1
+                await context.close()
+
+    @asynccontextmanager
+    async def page(
+        self, engine: BrowserEngine = "webkit", **kwargs: Any
+    ) -> AsyncIterator[Page]:
+        """Open a page in a new browser context, closing both when done.
+
+        Args:
+            engine: Browser engine to use.
+            kwargs: Options to pass to ``Browser.new_context``.
+        """
+        async with self.context(engine, **kwargs) as context:
+            yield await context.new_page()
+
+    async def close(self):
+        """Close every browser and stop Playwright."""
+        for browser in self._browsers.values():
+            await browser.close()
+        self._browsers = {}
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        if self.metrics.launches:
+            logger.info(self.metrics.summarize())
+
+
+_browser_pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BrowserPool] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the pool shared by all archivers in this event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _browser_pools:
+        _browser_pools[loop] = BrowserPool()
+    return _browser_pools[loop]
+
+
+async def close_browser_pool():
+    """Close the browsers shared by archivers in this event loop, if there are any.
+
+    Called at the end of a run. A later call to ``get_browser_pool`` creates a new
+    pool.
+    """
+    if (pool := _browser_pools.pop(asyncio.get_running_loop(), None)) is not None:
+        await pool.close()
@@ -1,15 +1,15 @@
 """Defines base class for archiver."""
 
 import asyncio
+import inspect
 import io
 import json
 import logging
 import math
-import tempfile
 import typing
 import zipfile
 from abc import ABC, abstractmethod
-from contextlib import nullcontext
+from contextlib import AbstractAsyncContextManager, nullcontext
 from html.parser import HTMLParser
 from pathlib import Path
 from secrets import randbelow
@@ -18,13 +18,29 @@ from typing import Any, ClassVar
 import aiohttp
 import bs4
 import pandas as pd
-from playwright.async_api import Browser as PlaywrightBrowser
+from playwright.async_api import BrowserContext as PlaywrightContext
 from playwright.async_api import Error as PlaywrightError
-
-from pudl_archiver.archivers import validate
+from playwright.async_api import Locator as PlaywrightLocator
+from playwright.async_api import Page as PlaywrightPage
+from playwright.async_api import Response as PlaywrightResponse
+
+from pudl_archiver.archivers import plan, validate
+from pudl_archiver.archivers.browser_pool import BrowserEngine, get_browser_pool
+from pudl_archiver.archivers.cpu_pool import get_cpu_pool
+from pudl_archiver.archivers.page_waits import (
+    LINKS_IDLE_TIMEOUT_MS,
+    WAIT_TIMEOUT_MS,
+    PageWaitMetrics,
+    wait_for_network_idle,
+    wait_for_response,
+    wait_for_stable_count,
+)
+from pudl_archiver.archivers.workspace import DownloadWorkspace
+from pudl_archiver.depositors.depositor import StreamingFileReader
 from pudl_archiver.frictionless import DataPackage, Partitions, ResourceInfo
 from pudl_archiver.utils import (
     add_to_archive_stable_hash,
+    add_to_zipfile,
     retry_async,
 )
 
@@ -54,6 +70,7 @@ updated periodically."""
 
 ArchiveAwaitable = typing.AsyncGenerator[
     typing.Awaitable[ResourceInfo | list[ResourceInfo]]
+    | typing.AsyncIterator[ResourceInfo]
 ]
 """Return type of method get_resources.
 
@@ -61,6 +78,10 @@ The method get_resources should yield an awaitable that returns a ResourceInfo c
 The awaitable should be an `async` function that will download a resource, then return the
 ResourceInfo. This contains a path to the downloaded resource, and the working partitions
 pertaining to the resource.
+
+Helpers that download several resources at once can instead be async generators
+yielding each ResourceInfo as soon as it's downloaded, so each one is validated
+and deposited without waiting for the rest.
 """
 
 
@@ -96,6 +117,22 @@ class _HyperlinkExtractor(HTMLParser):
         self.current_hyperlink = None
 
 
+async def _close_resource(
+    resource: typing.Awaitable[ResourceInfo | list[ResourceInfo]]
+    | typing.AsyncIterator[ResourceInfo],
+):
+    """Close a resource from ``get_resources`` that won't be downloaded.
+
+    Resources are coroutines, or async generators for archivers that stream them.
+    Closing them instead of just dropping the reference stops Python from warning
+    that they were never awaited.
+    """
+    if inspect.isasyncgen(resource):
+        await resource.aclose()
+    elif inspect.iscoroutine(resource):
+        resource.close()
+
+
 async def _download_file(
     session: aiohttp.ClientSession,
     url: str,
@@ -136,6 +173,8 @@ class AbstractDatasetArchiver(ABC):
         self,
         session: aiohttp.ClientSession,
         only_years: list[int] | None = None,
+        max_disk_bytes: int | None = None,
+        incremental: bool = False,
     ):
         """Initialize Archiver object.
 
@@ -143,13 +182,20 @@ class AbstractDatasetArchiver(ABC):
             session: Async HTTP client session manager.
             only_years: a list of years to download data for. If empty list or
                 None, download all years' data.
-            download_directory: where to save data to. Defaults to temp dir.
+            max_disk_bytes: pause downloads while downloaded resources that haven't
+                been released take up more than this many bytes. See
+                :mod:`pudl_archiver.archivers.workspace`.
+            incremental: reuse unchanged files from the previous version of the
+                archive, for archivers that support it. See ``get_previous_file``.
         """
         self.session = session
+        self.incremental = incremental
+        # Set by the orchestrator once the published deposition has been found
+        self.previous_version: StreamingFileReader | None = None
 
-        # Create a temporary directory for downloading data
-        self.download_directory_manager = tempfile.TemporaryDirectory()
-        self.download_directory = Path(self.download_directory_manager.name)
+        # Create a temporary workspace for downloading data
+        self.workspace = DownloadWorkspace(high_water_bytes=max_disk_bytes)
+        self.download_directory = self.workspace.directory
 
         if only_years is None:
             only_years = []
@@ -157,6 +203,7 @@ class AbstractDatasetArchiver(ABC):
         self.file_validations: list[validate.FileUniversalValidation] = []
 
         self.failed_partitions: dict[str, Partitions] = {}
+        self.page_wait_metrics = PageWaitMetrics()
 
         # Create logger
         self.logger = logging.getLogger(f"catalystcoop.{__name__}")
@@ -170,6 +217,41 @@ class AbstractDatasetArchiver(ABC):
         # tag for tab content - so we use html.parser, which is slower.
         return bs4.BeautifulSoup(await response.text(), "html.parser")
 
+    async def get_previous_file(self, filename: str, path: Path) -> Path | None:
+        """Download a file from the previous version of the archive, if there is one.
+
+        Args:
+            filename: Name of the file in the previous version.
+            path: Local path to download the file to.
+
+        Returns:
+            ``path``, or None if there's no previous version or it doesn't contain
+            the file.
+        """
+        if self.previous_version is None:
+            return None
+        try:
+            return await self.previous_version.get_file_to(filename, path)
+        except FileNotFoundError:
+            path.unlink(missing_ok=True)
+            return None
+
+    async def run_cpu(self, fn: typing.Callable, /, *args, **kwargs) -> Any:
+        """Run a CPU-bound function in a worker process and await its result.
+
+        Use this for work like building CSVs, compressing files or parsing large
+        documents, which would otherwise block downloads running concurrently. The
+        worker pool is shared by every archiver in the run. See
+        :mod:`pudl_archiver.archivers.cpu_pool`.
+
+        Args:
+            fn: Module level function to run. It and its arguments must be
+                picklable.
+            args: Positional arguments to pass to ``fn``.
+            kwargs: Keyword arguments to pass to ``fn``.
+        """
+        return await get_cpu_pool().run(fn, *args, **kwargs)
+
     @abstractmethod
     def get_resources(self) -> ArchiveAwaitable | tuple[ArchiveAwaitable, Partitions]:
         """Abstract method that each data source must implement to download all resources.
@@ -194,22 +276,116 @@ class AbstractDatasetArchiver(ABC):
         """
         ...
 
-    async def download_zipfile_via_playwright(
+    def browser_context(
+        self, engine: BrowserEngine = "webkit", **kwargs
+    ) -> AbstractAsyncContextManager[PlaywrightContext]:
+        """Open a context in the browser shared by every archiver in the run.
+
+        The context is closed when leaving the ``async with`` block. See
+        :mod:`pudl_archiver.archivers.browser_pool`.
+
+        Args:
+            engine: Browser engine to use.
+            kwargs: Options to pass to ``Browser.new_context``.
+        """
+        return get_browser_pool().context(engine, **kwargs)
+
+    def browser_page(
+        self, engine: BrowserEngine = "webkit", **kwargs
+    ) -> AbstractAsyncContextManager[PlaywrightPage]:
+        """Open a page in the browser shared by every archiver in the run.
+
+        The page is closed when leaving the ``async with`` block. See
+        :mod:`pudl_archiver.archivers.browser_pool`.
+
+        Args:
+            engine: Browser engine to use.
+            kwargs: Options to pass to ``Browser.new_context``.
+        """
+        return get_browser_pool().page(engine, **kwargs)
+
+    async def wait_for_stable_count(
         self,
-        playwright_browser: PlaywrightBrowser,
-        url: str,
-        zip_path: Path,
-    ):
+        locator: PlaywrightLocator,
+        min_count: int = 1,
+        stable_for_ms: int = 500,
+        timeout_ms: int = WAIT_TIMEOUT_MS,
+    ) -> int:
+        """Wait until a locator matches enough elements, and the number stops changing.
+
+        Use this instead of sleeping while a page renders a list of links. See
+        :mod:`pudl_archiver.archivers.page_waits`.
+
+        Args:
+            locator: Locator for the elements to wait for.
+            min_count: Minimum number of elements to wait for.
+            stable_for_ms: How long the number of elements must stay the same.
+            timeout_ms: Maximum time to wait.
+
+        Returns:
+            Number of elements matched.
+        """
+        return await wait_for_stable_count(
+            locator,
+            min_count=min_count,
+            stable_for_ms=stable_for_ms,
+            timeout_ms=timeout_ms,
+            metrics=self.page_wait_metrics,
+        )
+
+    async def wait_for_network_idle(
+        self, page: PlaywrightPage, timeout_ms: int = WAIT_TIMEOUT_MS
+    ) -> bool:
+        """Wait until a page stops making requests, continuing if it never does.
+
+        See :mod:`pudl_archiver.archivers.page_waits`.
+
+        Args:
+            page: Page to wait for.
+            timeout_ms: Maximum time to wait.
+
+        Returns:
+            Whether the page went idle in time.
+        """
+        return await wait_for_network_idle(
+            page, timeout_ms=timeout_ms, metrics=self.page_wait_metrics
+        )
+
+    async def wait_for_response(
+        self,
+        page: PlaywrightPage,
+        url_pattern: str | typing.Pattern,
+        action: typing.Callable[[], typing.Awaitable],
+        timeout_ms: int = WAIT_TIMEOUT_MS,
+    ) -> PlaywrightResponse:
+        """Run an action, like clicking a tab, and wait for the response it triggers.
+
+        See :mod:`pudl_archiver.archivers.page_waits`.
+
+        Args:
+            page: Page the action makes requests from.
+            url_pattern: Glob pattern or regex matching the URL of the request.
+            action: Coroutine function triggering the request.
+            timeout_ms: Maximum time to wait for the response.
+        """
+        return await wait_for_response(
+            page,
+            url_pattern,
+            action,
+            timeout_ms=timeout_ms,
+            metrics=self.page_wait_metrics,
+        )
+
+    async def download_zipfile_via_playwright(self, url: str, zip_path: Path):
         """Attempt to download a zipfile using playwright and fail if zipfile is invalid.
 
         Args:
-            playwright_browser: async browser instance to use for fetching the URL.
             url: URL of zipfile.
             zip_path: Local path to write file to disk.
         """
-        await self.download_file_via_playwright(playwright_browser, url, zip_path)
+        await self.download_file_via_playwright(url, zip_path)
 
-        if zipfile.is_zipfile(zip_path):
+        if plan.planning() or zipfile.is_zipfile(zip_path):
             return
 
         # If it makes it here that means it couldn't download a valid zipfile
@@ -232,7 +408,7 @@ class AbstractDatasetArchiver(ABC):
         for _ in range(retries):
             await self.download_file(url, zip_path, **kwargs)
 
-            if zipfile.is_zipfile(zip_path):
+            if plan.planning() or zipfile.is_zipfile(zip_path):
                 return
 
         # If it makes it here that means it couldn't download a valid zipfile
@@ -241,36 +417,36 @@ class AbstractDatasetArchiver(ABC):
                 f"Failed to download valid zipfile from {url}. File head: {f.read(128).lower().strip()}"
             )
 
-    async def download_file_via_playwright(
-        self, playwright_browser: PlaywrightBrowser, url: str, file_path: Path
-    ) -> int:
-        """Download a file using playwright.
+    async def download_file_via_playwright(self, url: str, file_path: Path) -> int:
+        """Download a file using the shared playwright browser.
 
         Args:
-            playwright_browser: async browser instance to use for fetching the URL.
             url: URL to file to download.
             file_path: Local path to write file to disk.
         """
-        page = await playwright_browser.new_page()
-
-        # timeout: 10 minutes, same as we use for the aiohttp session
-        async with page.expect_download(timeout=10 * 60 * 1000) as download_info:
-            try:
-                # page.goto within a page.expect_download context always generates
-                # an error with message "Page.goto: Download is starting" and a call
-                # log. All evidence suggests this error is harmless and does not
-                # affect the downloaded file. See also:
-                # https://github.com/microsoft/playwright/issues/18430#issuecomment-1309638711
-                # https://stackoverflow.com/questions/73652378/download-files-with-goto-in-playwright-python/74144570#74144570
-                await page.goto(url, timeout=10 * 60 * 1000)
-            except PlaywrightError as e:
-                # ...but we're going to check our assumptions just in case:
-                if not e.message.startswith("Page.goto: Download is starting"):
-                    raise
-        download = await download_info.value
-        # [2025 km] NB: playwright.download.save_as can't save to a BytesIO
-        await download.save_as(file_path)
-        await page.close()
+        if plan.planning():
+            # Browser downloads don't expose response headers to check
+            plan.record_source(plan.RemoteSource(url=url))
+            return
+        await self.workspace.wait_for_space()
+        async with self.browser_page() as page:
+            # timeout: 10 minutes, same as we use for the aiohttp session
+            async with page.expect_download(timeout=10 * 60 * 1000) as download_info:
+                try:
+                    # page.goto within a page.expect_download context always
+                    # generates an error with message "Page.goto: Download is
+                    # starting" and a call log. All evidence suggests this error is
+                    # harmless and does not affect the downloaded file. See also:
+                    # https://github.com/microsoft/playwright/issues/18430#issuecomment-1309638711
+                    # https://stackoverflow.com/questions/73652378/download-files-with-goto-in-playwright-python/74144570#74144570
+                    await page.goto(url, timeout=10 * 60 * 1000)
+                except PlaywrightError as e:
+                    # ...but we're going to check our assumptions just in case:
+                    if not e.message.startswith("Page.goto: Download is starting"):
+                        raise
+            download = await download_info.value
+            # [2025 km] NB: playwright.download.save_as can't save to a BytesIO
+            await download.save_as(file_path)
 
     async def download_file(
         self, url: str, file_path: Path | io.BytesIO, post: bool = False, **kwargs
@@ -284,33 +460,62 @@ class AbstractDatasetArchiver(ABC):
 
         Returns: status of the HTTP response written to file_path
         """
+        if plan.planning():
+            return await self._head(url, post=post, **kwargs)
+        if isinstance(file_path, Path):
+            await self.workspace.wait_for_space()
         return await retry_async(
             _download_file, [self.session, url, file_path, post], kwargs
         )
 
+    async def _head(self, url: str, post: bool = False, **kwargs) -> int:
+        """Record metadata about a file instead of downloading it, when planning.
+
+        Args:
+            url: URL to file that would be downloaded.
+            post: Whether the file would be downloaded with a POST request, which
+                can't be checked without downloading it.
+            kwargs: Key word args to pass to the request.
+
+        Returns: status of the HTTP response to the HEAD request
+        """
+        if post:
+            plan.record_source(plan.RemoteSource(url=url))
+            return 200
+        response = await retry_async(
+            self.session.head, args=[url], kwargs={"allow_redirects": True} | kwargs
+        )
+        response.release()
+        if response.status >= 400:
+            plan.record_source(plan.RemoteSource(url=url))
+        else:
+            plan.record_source(plan.RemoteSource.from_headers(url, response.headers))
+        return response.status
+
     async def download_and_zip_file(
         self, url: str, filename: str, zip_path: Path, **kwargs
     ):
         """Download and zip a file using async session manager.
 
+        The file is downloaded next to the zipfile first, so only its path is sent
+        to the worker process that compresses it, rather than its whole contents.
+
         Args:
             url: URL to file to download.
             filename: name of file to be zipped
             zip_path: Local path to write file to disk.
             kwargs: Key word args to pass to retry_async.
         """
-        response = await retry_async(self.session.get, args=[url], kwargs=kwargs)
-        response_bytes = await retry_async(response.read)
+        download_path = Path(f"{zip_path}.download")
+        await self.download_file(url, download_path, **kwargs)
+        if plan.planning():
+            return
 
         # Write to zipfile
-        with zipfile.ZipFile(
-            zip_path,
-            "w",
-            compression=zipfile.ZIP_DEFLATED,
-        ) as archive:
-            add_to_archive_stable_hash(
-                archive=archive, filename=filename, data=response_bytes
-            )
+        try:
+            await self.run_cpu(add_to_zipfile, zip_path, filename, download_path, "w")
+        finally:
+            download_path.unlink(missing_ok=True)
 
     def add_to_archive(self, zip_path: Path, filename: str, blob: typing.BinaryIO):
         """Add a file to a ZIP archive.
@@ -345,11 +550,9 @@ class AbstractDatasetArchiver(ABC):
         """
         download_path = self.download_directory / filename
         await self.download_file(url, download_path, headers=headers)
-        self.add_to_archive(
-            zip_path=zip_path,
-            filename=filename,
-            blob=download_path.open("rb"),
-        )
+        if plan.planning():
+            return
+        await self.run_cpu(add_to_zipfile, zip_path, filename, download_path)
         # Don't want to leave multiple files on disk, so delete
         # immediately after they're safely stored in the ZIP
         download_path.unlink()
@@ -432,8 +635,8 @@ class AbstractDatasetArchiver(ABC):
     async def get_hyperlinks_via_playwright(
         self,
         url: str,
-        playwright_browser: PlaywrightBrowser,
         filter_pattern: typing.Pattern | None = None,
+        idle_timeout_ms: int = LINKS_IDLE_TIMEOUT_MS,
     ) -> dict[str, str]:
         """Return all hyperlinks from a specific web page.
 
@@ -444,14 +647,20 @@ class AbstractDatasetArchiver(ABC):
 
         Args:
             url: URL of web page.
-            playwright_browser: async browser instance to use for fetching the URL.
             filter_pattern: If present, only return links that contain pattern.
-            verify: Verify ssl certificate (EPACEMS https source has bad certificate).
+            idle_timeout_ms: How long to wait for the page to stop making requests,
+                so scripts can add links. If it's still busy, like pages running
+                analytics or polling for updates, links are read from the page as it
+                is.
         """
         # Parse web page to get all hyperlinks
-        page = await playwright_browser.new_page()
-        await page.goto(url, timeout=10 * 60 * 1000)
-        text = await page.content()
+        async with self.browser_page() as page:
+            # Links are often added by scripts after the document loads, so wait
+            # briefly for the page to finish making requests rather than for every
+            # image to load
+            await page.goto(url, wait_until="domcontentloaded", timeout=10 * 60 * 1000)
+            await self.wait_for_network_idle(page, timeout_ms=idle_timeout_ms)
+            text = await page.content()
         return self.get_hyperlinks_from_text(text, filter_pattern, url)
 
     def get_hyperlinks_from_text(
@@ -793,11 +1002,30 @@ class AbstractDatasetArchiver(ABC):
     async def _filter_resources(
         self,
         skip_partitions: list[Partitions],
+        resumed_partitions: list[Partitions] | None = None,
     ) -> list[Partitions]:
-        """Filter to only partitions that failed in previous run if retrying."""
+        """Filter to only partitions that failed in previous run if retrying.
+
+        Args:
+            skip_partitions: Partitions to skip, which requires the archiver to
+                return partitions from ``get_resources``.
+            resumed_partitions: Partitions completed by an interrupted run. These are
+                only skipped if the archiver returns partitions, otherwise every
+                resource is downloaded again.
+        """
         # Get all awaitables from get_resources
         resources, partitions = await self._unpack_resources()
 
+        if resumed_partitions:
+            if len(partitions) == 0:
+                logger.warning(
+                    f"{self.name} doesn't return partitions from `get_resources`, so "
+                    "resources completed by the interrupted run will be downloaded "
+                    "again."
+                )
+            else:
+                skip_partitions = [*skip_partitions, *resumed_partitions]
+
         if len(skip_partitions) > 0:
             if len(partitions) == 0:
                 raise RuntimeError(
@@ -809,25 +1037,112 @@ class AbstractDatasetArchiver(ABC):
             kept_resources = []
             for resource, parts in zip(resources, partitions):
                 if parts in skip_partitions:
-                    # Close skipped coroutines instead of just dropping the
-                    # reference, so Python doesn't warn that they were never
-                    # awaited.
-                    resource.close()
+                    await _close_resource(resource)
                 else:
                     kept_resources.append(resource)
             resources = kept_resources
         return resources
 
+    async def plan_resources(self) -> list[plan.PlannedResource] | None:
+        """Find the remote files each resource would be downloaded from.
+
+        Runs the awaitables returned by ``get_resources`` with the download helpers
+        in plan mode, so they send ``HEAD`` requests instead of downloading files.
+        See :mod:`pudl_archiver.archivers.plan`.
+
+        Returns:
+            Planned resources, or None if the archiver doesn't return partitions
+            from ``get_resources``, so planned resources can't be matched to
+            published ones.
+        """
+        resources, partitions = await self._unpack_resources()
+        if len(partitions) != len(resources):
+            for resource in resources:
+                await _close_resource(resource)
+            logger.warning(
+                f"{self.name} doesn't return partitions from `get_resources`, so "
+                "changes can't be predicted and every resource will be downloaded."
+            )
+            return None
+        return await plan.gather_planned_resources(
+            resources, partitions, self.concurrency_limit
+        )
+
+    async def _download_resource(
+        self,
+        resource: typing.Awaitable[ResourceInfo | list[ResourceInfo]]
+        | typing.AsyncIterator[ResourceInfo],
+        results: asyncio.Queue,
+    ):
+        """Download a resource, passing each ResourceInfo to the queue when done.
+
+        Errors are passed to the queue too, and None once the resource is done.
+        """
+        try:
+            async with self.workspace.downloading():
+                if isinstance(resource, typing.AsyncIterator):
+                    async for resource_info in resource:
+                        await self.workspace.add(resource_info.local_path)
+                        results.put_nowait(resource_info)
+                # resource can return list or individual resource
+                # If individual resource, create list of 1 to make iterable
+                elif not isinstance(resources := await resource, list):
+                    await self.workspace.add(resources.local_path)
+                    results.put_nowait(resources)
+                else:
+                    for resource_info in resources:
+                        await self.workspace.add(resource_info.local_path)
+                        results.put_nowait(resource_info)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:  # noqa: BLE001
+            results.put_nowait(e)
+        finally:
+            results.put_nowait(None)
+
+    async def _validate_downloaded_resource(self, resource_info: ResourceInfo):
+        """Run file validations on a downloaded resource and record any failures."""
+        current_file_validations = await self.run_cpu(
+            validate.validate_downloaded_file,
+            resource_info.local_path,
+            resource_info.layout,
+            self.fail_on_empty_invalid_files,
+        )
+
+        # Check if there are failed file level validations
+        failed_validations = [
+            validation
+            for validation in current_file_validations
+            if not validation.success
+        ]
+        self.file_validations.extend(current_file_validations)
+        if len(failed_validations) > 0:
+            logger.error(
+                "The following validation tests failed with file-validation-fail-fast set:"
+                f" {[validation.name for validation in failed_validations]}"
+            )
+            self.failed_partitions[resource_info.local_path.name] = (
+                resource_info.partitions
+            )
+
     async def download_all_resources(
         self,
         skip_partitions: list[Partitions] | None = None,
+        resumed_partitions: list[Partitions] | None = None,
     ) -> typing.Generator[tuple[str, ResourceInfo]]:
         """Download all resources.
 
         This method uses the awaitables returned by `get_resources`. It
         coordinates downloading all resources concurrently.
+
+        Args:
+            skip_partitions: Partitions to skip, from a previous run summary.
+            resumed_partitions: Partitions completed by an interrupted run, which are
+                skipped if the archiver returns partitions from `get_resources`.
         """
-        resources = await self._filter_resources(skip_partitions or [])
+        resources = await self._filter_resources(
+            list(skip_partitions or []), list(resumed_partitions or [])
+        )
         # When running the publish-run command we should end up with no resources to download
         if len(resources) == 0:
             logger.info("Found no resources to download, returning immediately.")
@@ -847,56 +1162,41 @@ class AbstractDatasetArchiver(ABC):
 
         # Download resources concurrently and prepare metadata
         for resource_chunk in resource_chunks:
-            for resource_coroutine in asyncio.as_completed(resource_chunk):
-                # resource_coroutine can return list or individual resource
-                # If individual resource, create list of 1 to make iterable
-                if not isinstance(resources := await resource_coroutine, list):
-                    resources = [resources]
-
-                for resource_info in resources:
-                    self.logger.info(f"Downloaded {resource_info.local_path}.")
-
-                    # Perform various file validations
-                    current_file_validations = [
-                        validate.validate_filetype(
-                            resource_info.local_path,
-                            self.fail_on_empty_invalid_files,
-                        ),
-                        validate.validate_file_not_empty(
-                            resource_info.local_path,
-                            self.fail_on_empty_invalid_files,
-                        ),
-                        validate.validate_zip_layout(
-                            resource_info.local_path,
-                            resource_info.layout,
-                            self.fail_on_empty_invalid_files,
-                        ),
-                    ]
-
-                    # Check if there are failed file level validations
-                    failed_validations = [
-                        validation
-                        for validation in current_file_validations
-                        if not validation.success
-                    ]
-                    self.file_validations.extend(current_file_validations)
-                    if len(failed_validations) > 0:
-                        logger.error(
-                            "The following validation tests failed with file-validation-fail-fast set:"
-                            f" {[validation.name for validation in failed_validations]}"
-                        )
-                        self.failed_partitions[resource_info.local_path.name] = (
-                            resource_info.partitions
-                        )
-
-                    # Return downloaded
-                    yield str(resource_info.local_path.name), resource_info
-
-            # If requested, create a new temporary directory per resource chunk
+            # If requested, download each chunk of resources into a new directory,
+            # deleting anything left in the previous one
             if self.directory_per_resource_chunk:
-                tmp_dir = tempfile.TemporaryDirectory()
-                self.download_directory = Path(tmp_dir.name)
+                self.download_directory = self.workspace.new_directory()
                 self.logger.info(f"New download directory {self.download_directory}")
+            results = asyncio.Queue()
+            tasks = [
+                asyncio.create_task(self._download_resource(resource, results))
+                for resource in resource_chunk
+            ]
+            running = len(tasks)
+            try:
+                while running:
+                    if (resource_info := await results.get()) is None:
+                        running -= 1
+                        continue
+                    if isinstance(resource_info, BaseException):
+                        raise resource_info
+
+                    self.logger.info(f"Downloaded {resource_info.local_path}.")
+                    await self._validate_downloaded_resource(resource_info)
+
+                    # Return downloaded. Downloads waiting for disk space keep
+                    # waiting until the resource has been added to the draft and
+                    # released, which frees its space.
+                    with self.workspace.depositing():
+                        yield str(resource_info.local_path.name), resource_info
+            finally:
+                # Stop downloading the rest of the chunk if anything failed
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self.page_wait_metrics.waits:
+            self.logger.info(self.page_wait_metrics.summarize())
 
         # subclass cleanup when necessary
         await self.after_download()
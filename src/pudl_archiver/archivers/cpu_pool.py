@@ -0,0 +1,161 @@
+"""Run CPU-bound steps of archivers in a process pool shared by the whole run.
+
+Archivers do most of their work waiting on the network, but some steps, like
+converting data to CSV, compressing files, validating downloads and parsing XBRL
+taxonomies, keep the CPU busy. Run inline, these block the event loop, so every
+other download and upload in the process stalls until they finish. Threads don't
+help much either, since most of this work holds the GIL.
+
+``AbstractDatasetArchiver.run_cpu`` sends a function to a ``CPUPool`` instead, and
+awaits its result. All archivers in an event loop share one pool, sized to the
+number of CPUs available, so archiving several datasets at once doesn't start more
+processes than the machine can run. Functions and their arguments are sent to
+worker processes, so they must be picklable: module level functions taking paths
+and plain data, rather than methods or lambdas.
+
+The pool tracks how many tasks are waiting for a free worker and how busy the
+workers are, and logs this when it's shut down at the end of a run.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import time
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+
+class CPUPoolMetrics(BaseModel):
+    """Queue depth and utilization of a ``CPUPool`` over a run."""
+
+    workers: int
+    tasks: int = 0
+    #: most tasks waiting for a free worker at once
+    max_queue_depth: int = 0
+    #: total time tasks spent waiting for a free worker
+    queue_wait_s: float = 0.0
+    #: total time workers spent running tasks
+    busy_s: float = 0.0
+    #: time since the pool was created
+    elapsed_s: float = 0.0
+
+    @property
+    def saturation(self) -> float:
+        """Fraction of available worker time spent running tasks."""
+        if self.elapsed_s <= 0:
+            return 0.0
+        return self.busy_s / (self.workers * self.elapsed_s)
+
+    def summarize(self) -> str:
+        """Describe pool usage in a human readable way."""
+        return (
+            f"CPU pool ran {self.tasks} tasks on {self.workers} workers: "
+            f"{self.saturation:.0%} saturated, max queue depth {self.max_queue_depth}, "
+            f"{self.queue_wait_s:.1f}s total queue wait."
+        )
+
+
+def _timed(fn: Callable, *args, **kwargs) -> tuple[float, float, Any]:
+    """Run a function in a worker, recording when it started and how long it took."""
+    # Wall clock time, since it's compared to times in the parent process
+    started = time.time()
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return started, time.perf_counter() - start, result
+
+
+class CPUPool:
+    """Process pool for CPU-bound work, with metrics on queue depth and saturation."""
+
+    def __init__(self, max_workers: int | None = None):
+        """Create a pool. Worker processes aren't started until they're needed.
+
+        Args:
+            max_workers: Number of worker processes. Defaults to the number of CPUs
+                this process can use.
+        """
+        self.max_workers = max_workers or os.process_cpu_count() or 1
+        self.metrics = CPUPoolMetrics(workers=self.max_workers)
+        self._executor: Executor | None = None
+        self._created = time.monotonic()
+        self._in_flight = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            # Forking a process with running threads can deadlock, so start workers
+            # from a clean server process where possible
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                # Nothing is preloaded in the server: importing any module of this
+                # package runs its __init__, which can fetch the PUDL datapackage,
+                # and the server only survives ImportErrors while preloading.
+                context = multiprocessing.get_context("forkserver")
+            else:
+                context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=context
+            )
+        return self._executor
+
+    async def run(self, fn: Callable, /, *args, **kwargs) -> Any:
+        """Run a function in a worker process and return its result.
+
+        Args:
+            fn: Picklable function to run.
+            args: Positional arguments to pass to ``fn``.
+            kwargs: Keyword arguments to pass to ``fn``.
+        """
+        loop = asyncio.get_running_loop()
+        submitted = time.time()
+        self.metrics.tasks += 1
+        self._in_flight += 1
+        self.metrics.max_queue_depth = max(
+            self.metrics.max_queue_depth, self._in_flight - self.max_workers
+        )
+        try:
+            started, duration, result = await loop.run_in_executor(
+                self._get_executor(), functools.partial(_timed, fn, *args, **kwargs)
+            )
+        finally:
+            self._in_flight -= 1
+        self.metrics.queue_wait_s += max(started - submitted, 0.0)
+        self.metrics.busy_s += duration
+        return result
+
+    async def shutdown(self):
+        """Wait for running tasks, then stop the worker processes."""
+        self.metrics.elapsed_s = time.monotonic() - self._created
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown, cancel_futures=True)
+            self._executor = None
+        if self.metrics.tasks:
+            logger.info(self.metrics.summarize())
+
+
+_cpu_pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, CPUPool] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_cpu_pool() -> CPUPool:
+    """Get the pool shared by all archivers in this event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _cpu_pools:
+        _cpu_pools[loop] = CPUPool()
+    return _cpu_pools[loop]
+
+
+async def close_cpu_pool():
+    """Shut down the pool shared by archivers in this event loop, if there is one.
+
+    Called at the end of a run. A later call to ``get_cpu_pool`` creates a new pool.
+    """
+    if (pool := _cpu_pools.pop(asyncio.get_running_loop(), None)) is not None:
+        await pool.shutdown()
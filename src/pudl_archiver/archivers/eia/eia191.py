@@ -1,18 +1,18 @@
 """Download EIA 191 data."""
 
 import logging
-import zipfile
 from collections import defaultdict
 
-import pandas as pd
-
 from pudl_archiver.archivers.classes import (
     ArchiveAwaitable,
     ResourceInfo,
 )
-from pudl_archiver.archivers.eia.naturalgas import EIANaturalGasData, EiaNGQVArchiver
+from pudl_archiver.archivers.eia.naturalgas import (
+    EIANaturalGasData,
+    EiaNGQVArchiver,
+    write_report_csv,
+)
 from pudl_archiver.frictionless import ZipLayout
-from pudl_archiver.utils import add_to_archive_stable_hash
 
 logger = logging.getLogger(f"catalystcoop.{__name__}")
 
@@ -74,29 +74,12 @@ class Eia191Archiver(EiaNGQVArchiver):
             )
 
             self.logger.info(f"Retrieving data for {year}")
-            json_response = await self.get_json(download_url)
-            dataframe = pd.DataFrame.from_dict(json_response["data"], orient="columns")
-
-            # Rename columns
-            column_dict = {
-                item["field"]: self.clean_header_name(str(item["headerName"]))
-                for item in json_response["columns"]
-            }
-            dataframe = dataframe.rename(columns=column_dict)
-
-            # Convert to CSV in-memory and write to .zip with stable hash
-            csv_data = dataframe.to_csv(
-                encoding="utf-8",
-                index=False,
-            )
-            with zipfile.ZipFile(
-                archive_path,
-                "a",
-                compression=zipfile.ZIP_DEFLATED,
-            ) as archive:
-                add_to_archive_stable_hash(
-                    archive=archive, filename=csv_name, data=csv_data
-                )
+            json_path = self.download_directory / f"{self.name}_{year}_{freq}.json"
+            try:
+                await self.download_file(download_url, json_path)
+                await self.run_cpu(write_report_csv, archive_path, csv_name, json_path)
+            finally:
+                json_path.unlink(missing_ok=True)
 
             csv_names.add(csv_name)
 
@@ -5,7 +5,6 @@ from pathlib import Path
 from urllib.parse import urljoin
 
 import pandas as pd
-from playwright.async_api import async_playwright, expect
 
 from pudl_archiver.archivers.classes import (
     AbstractDatasetArchiver,
@@ -40,25 +39,18 @@ class Eia930Archiver(AbstractDatasetArchiver):
             partitions={"half_year": "all", "form": "reference"},
         )
 
-    async def after_download(self) -> None:
-        """Clean up playwright once downloads are complete."""
-        await self.browser.close()
-        await self.playwright.stop()
-
     async def get_eia930a_files(self) -> dict[str, str]:
         """Get a dictionary of EIA 930A file download URLs indexed by year."""
         link_dict = {}
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.webkit.launch()
-
         link_pattern = re.compile(r"EIA_930A_(\d{4})_with layout.xlsx")
         # Get main table links using playwright.
-        page = await self.browser.new_page()
-        await page.goto(ABOUT_URL, timeout=10 * 60 * 1000)
-        await expect(
-            page.get_by_text("About the EIA-930 data")
-        ).to_be_visible()  # Wait for reference URL to load before proceeding.
-        text = await page.content()
+        async with self.browser_page() as page:
+            await page.goto(
+                ABOUT_URL, wait_until="domcontentloaded", timeout=10 * 60 * 1000
+            )
+            # Wait for the links to the 930A files to finish rendering
+            await self.wait_for_stable_count(page.locator("a[href*='EIA_930A_']"))
+            text = await page.content()
         links = self.get_hyperlinks_from_text(text, link_pattern, ABOUT_URL)
 
         for link in links:
@@ -6,8 +6,9 @@ as it is for EIA 176, or be contained entirely in one report (as it is for EIA 7
 
 """
 
-import zipfile
+import json
 from collections.abc import Iterable
+from pathlib import Path
 
 import pandas as pd
 from pydantic import BaseModel, ConfigDict, Field
@@ -19,7 +20,7 @@ from pudl_archiver.archivers.classes import (
     ResourceInfo,
 )
 from pudl_archiver.frictionless import ZipLayout
-from pudl_archiver.utils import add_to_archive_stable_hash
+from pudl_archiver.utils import add_to_zipfile
 
 
 class EIANaturalGasData(BaseModel):
@@ -48,6 +49,43 @@ class EIANaturalGasData(BaseModel):
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
 
 
+def clean_header_name(header_name: str) -> str:
+    """Perform a standard series of transformations on NGQV headername items."""
+    return header_name.lower().replace("<br>", "_").replace(" ", "_")
+
+
+def write_report_csv(archive_path: Path, csv_name: str, json_path: Path):
+    """Convert a report downloaded as JSON to a CSV and add it to a zipfile.
+
+    Parsing the JSON and building large CSVs is slow, so archivers run this in a
+    worker process with :meth:`AbstractDatasetArchiver.run_cpu`. The report is
+    passed as a path, so it isn't copied to the worker.
+
+    Args:
+        archive_path: path to the zipfile.
+        csv_name: name of the CSV within the zipfile.
+        json_path: path to the report's JSON response.
+    """
+    try:
+        report = json.loads(json_path.read_bytes())
+    except json.JSONDecodeError as e:
+        raise AssertionError(f"Invalid JSON in {json_path}") from e
+    dataframe = pd.DataFrame.from_dict(report["data"], orient="columns")
+    # Rename columns
+    dataframe = dataframe.rename(
+        columns={
+            item["field"]: clean_header_name(str(item["headerName"]))
+            for item in report["columns"]
+        }
+    )
+    # Convert to CSV in-memory and write to .zip with stable hash
+    csv_data = dataframe.to_csv(
+        encoding="utf-8",
+        index=False,
+    )
+    add_to_zipfile(archive_path, csv_name, csv_data)
+
+
 class EiaNGQVArchiver(AbstractDatasetArchiver):
     """EIA NGQV generic archiver. Subclass by form."""
 
@@ -78,7 +116,7 @@ class EiaNGQVArchiver(AbstractDatasetArchiver):
 
     def clean_header_name(self, col: pd.Series) -> pd.Series:
         """Perform a standard series of transformations on NGQV headername items."""
-        return col.lower().replace("<br>", "_").replace(" ", "_")
+        return clean_header_name(col)
 
     async def get_year_resource(
         self, year: str, report: EIANaturalGasData
@@ -100,29 +138,12 @@ class EiaNGQVArchiver(AbstractDatasetArchiver):
         )
 
         self.logger.info(f"Retrieving data for {year}")
-        json_response = await self.get_json(download_url)
-        dataframe = pd.DataFrame.from_dict(json_response["data"], orient="columns")
-
-        # Rename columns
-        column_dict = {
-            item["field"]: self.clean_header_name(str(item["headerName"]))
-            for item in json_response["columns"]
-        }
-        dataframe = dataframe.rename(columns=column_dict)
-
-        # Convert to CSV in-memory and write to .zip with stable hash
-        csv_data = dataframe.to_csv(
-            encoding="utf-8",
-            index=False,
-        )
-        with zipfile.ZipFile(
-            archive_path,
-            "a",
-            compression=zipfile.ZIP_DEFLATED,
-        ) as archive:
-            add_to_archive_stable_hash(
-                archive=archive, filename=csv_name, data=csv_data
-            )
+        json_path = self.download_directory / f"{self.name}_{year}.json"
+        try:
+            await self.download_file(download_url, json_path)
+            await self.run_cpu(write_report_csv, archive_path, csv_name, json_path)
+        finally:
+            json_path.unlink(missing_ok=True)
 
         partitions = await self.get_year_partitions(year)
 
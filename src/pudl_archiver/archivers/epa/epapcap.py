@@ -4,8 +4,6 @@ import re
 from pathlib import Path
 from urllib.parse import urljoin, urlsplit
 
-from playwright.async_api import async_playwright
-
 from pudl_archiver.archivers.classes import (
     AbstractDatasetArchiver,
     ArchiveAwaitable,
@@ -106,12 +104,7 @@ class EpaPcapArchiver(AbstractDatasetArchiver):
                     self.logger.info(
                         f"Got HTML instead of PDF at {link}; trying playwright"
                     )
-                    async with async_playwright() as p:
-                        browser = await p.webkit.launch()
-                        await self.download_file_via_playwright(
-                            browser, link, download_path
-                        )
-                        await browser.close()
+                    await self.download_file_via_playwright(link, download_path)
                     with download_path.open("rb") as f:
                         header = f.read(128).lower().strip()
                 # fail if first try wasn't a PDF and wasn't HTML either
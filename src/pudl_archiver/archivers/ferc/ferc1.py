@@ -24,5 +24,9 @@ class Ferc1Archiver(AbstractDatasetArchiver):
         )
 
         yield xbrl.archive_xbrl_for_form(
-            xbrl.FercForm.FORM_1, self.download_directory, self.valid_year, self.session
+            xbrl.FercForm.FORM_1,
+            self.download_directory,
+            self.valid_year,
+            self.session,
+            previous_file=self.get_previous_file if self.incremental else None,
         )
@@ -28,4 +28,5 @@ class Ferc2Archiver(AbstractDatasetArchiver):
             self.download_directory,
             self.valid_year,
             self.session,
+            previous_file=self.get_previous_file if self.incremental else None,
         )
@@ -29,4 +29,5 @@ class Ferc6Archiver(AbstractDatasetArchiver):
             self.download_directory,
             self.valid_year,
             self.session,
+            previous_file=self.get_previous_file if self.incremental else None,
         )
@@ -2,8 +2,6 @@
 
 from pathlib import Path
 
-from playwright.async_api import async_playwright
-
 from pudl_archiver.archivers.classes import (
     AbstractDatasetArchiver,
     ArchiveAwaitable,
@@ -28,6 +26,7 @@ class Ferc714Archiver(AbstractDatasetArchiver):
             self.download_directory,
             self.valid_year,
             self.session,
+            previous_file=self.get_previous_file if self.incremental else None,
         )
 
     async def get_bulk_csv(self) -> tuple[Path, dict]:
@@ -38,8 +37,5 @@ class Ferc714Archiver(AbstractDatasetArchiver):
         """
         url = "https://www.ferc.gov/sites/default/files/2021-06/Form-714-csv-files-June-2021.zip"
         download_path = self.download_directory / "ferc714.zip"
-        async with async_playwright() as p:
-            browser = await p.webkit.launch()
-            await self.download_zipfile_via_playwright(browser, url, download_path)
-            await browser.close()
+        await self.download_zipfile_via_playwright(url, download_path)
         return ResourceInfo(local_path=download_path, partitions={})
@@ -1,48 +1,105 @@
 """Utilities for working with the ferc online web app which serves DBF and historical EQR data."""
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any, Literal
 
-from playwright.async_api import async_playwright
+from playwright.async_api import BrowserContext, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
+from pudl_archiver.archivers.browser_pool import get_browser_pool
 from pudl_archiver.archivers.classes import ResourceInfo
 
 logger = logging.getLogger(f"catalystcoop.{__name__}")
 
+FORM_DOWNLOAD_CONCURRENCY = 3
+"""Number of pages downloading years of a form from the ferc online app at once."""
+
+FORM_DOWNLOAD_TIMEOUT_MS = 10 * 60 * 1000
+"""How long to wait for each year to download, the same as the aiohttp session."""
+
+
+async def _open_form_page(
+    context: BrowserContext, ferc_form: str, timeout_ms: int
+) -> Page:
+    """Open a new page at the list of years available for a form."""
+    page = await context.new_page()
+    await page.goto("https://forms.ferc.gov/", timeout=timeout_ms)
+
+    # Navigate to form specific page
+    await page.get_by_role("link", name=f"Form {ferc_form} Data").click(
+        timeout=timeout_ms
+    )
+    return page
+
 
 async def get_resources_for_form(
     ferc_form: Literal["1", "2", "6", "60"],
     years: list[int],
     partitions_base: dict[str, Any],
     download_directory: Path,
-) -> ResourceInfo:
-    """Download a resource corresponding to a single year/form combo from ferc online app."""
+    concurrency: int = FORM_DOWNLOAD_CONCURRENCY,
+    timeout_ms: int = FORM_DOWNLOAD_TIMEOUT_MS,
+) -> AsyncIterator[ResourceInfo]:
+    """Download years of a form from ferc online app, yielding each once it's done.
+
+    Years are downloaded concurrently from a small pool of pages in a single browser
+    context, and each is yielded as soon as it's finished, so it can be validated and
+    deposited while the others are still downloading.
+
+    Args:
+        ferc_form: FERC form number.
+        years: Years to download.
+        partitions_base: Partitions shared by every year's resource.
+        download_directory: Directory to save downloads in.
+        concurrency: Number of years to download at once.
+        timeout_ms: How long to wait for each year to download.
+    """
     logger.info(f"Downloading the following years for ferc{ferc_form}: {years}")
-    async with async_playwright() as pw:
-        browser = await pw.webkit.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
-        await page.goto("https://forms.ferc.gov/")
-
-        # Navigate to form specific page
-        await page.get_by_role("link", name=f"Form {ferc_form} Data").click()
-
-        # Loop through all years and download
-        resources = []
-        for year in years:
-            logger.info(f"Attempting to download ferc{ferc_form} {year}")
-            async with page.expect_download() as download_info:
-                name = "2021 Q1 & Q2" if year == 2021 else str(year)
-                await page.get_by_role("link", name=name, exact=True).click()
+    if not years:
+        return
+    async with get_browser_pool().context() as context:
+        pages: asyncio.Queue[Page] = asyncio.Queue()
+        opened = 0
+
+        async def _download_year(year: int) -> ResourceInfo:
+            nonlocal opened
+            # Open another page if all the open ones are busy
+            if pages.empty() and opened < concurrency:
+                opened += 1
+                page = await _open_form_page(context, ferc_form, timeout_ms)
+            else:
+                page = await pages.get()
 
-            download = await download_info.value
+            logger.info(f"Attempting to download ferc{ferc_form} {year}")
             download_path = download_directory / f"ferc{ferc_form}-{year}.zip"
-            await download.save_as(download_path)
-            resources.append(
-                ResourceInfo(
-                    local_path=download_path,
-                    partitions=partitions_base | {"year": year},
-                )
+            try:
+                async with page.expect_download(timeout=timeout_ms) as download_info:
+                    name = "2021 Q1 & Q2" if year == 2021 else str(year)
+                    await page.get_by_role("link", name=name, exact=True).click(
+                        timeout=timeout_ms
+                    )
+                download = await download_info.value
+                await download.save_as(download_path)
+            except PlaywrightTimeoutError as e:
+                raise RuntimeError(
+                    f"Timed out waiting for ferc{ferc_form} {year} download"
+                ) from e
+            finally:
+                pages.put_nowait(page)
+            return ResourceInfo(
+                local_path=download_path,
+                partitions=partitions_base | {"year": year},
             )
-        return resources
+
+        tasks = [asyncio.create_task(_download_year(year)) for year in years]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # Stop downloading other years if one failed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -6,7 +6,6 @@ from pathlib import Path
 from bs4 import Tag
 from dateutil import parser as date_parser
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-from playwright.async_api import async_playwright
 
 from pudl_archiver.archivers.classes import (
     AbstractDatasetArchiver,
@@ -76,10 +75,7 @@ class FercCIDArchiver(AbstractDatasetArchiver):
         timeout_ms: int = 15_000,
     ) -> ResourceInfo:
         """Download FERC CID dataset using the Download button modal."""
-        async with async_playwright() as pw:
-            browser = await pw.chromium.launch(headless=True)
-            page = await browser.new_page()
-
+        async with self.browser_page("chromium") as page:
             await page.goto(page_url, timeout=timeout_ms)
 
             # Click the main Download button
@@ -121,10 +117,7 @@ class FercCIDArchiver(AbstractDatasetArchiver):
         timeout_ms: int = 15_000,
     ) -> ResourceInfo:
         """Download FERC CID data dictionary using the Download button modal."""
-        async with async_playwright() as pw:
-            browser = await pw.chromium.launch(headless=True)
-            page = await browser.new_page()
-
+        async with self.browser_page("chromium") as page:
             await page.goto(page_url, timeout=timeout_ms)
 
             # Click the main Download button
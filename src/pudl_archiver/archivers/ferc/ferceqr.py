@@ -1,12 +1,10 @@
 """Download FERC EQR data."""
 
-import asyncio
 import logging
 import re
 from pathlib import Path
 
 import pandas as pd
-from playwright.async_api import async_playwright
 
 from pudl_archiver.archivers.classes import (
     AbstractDatasetArchiver,
@@ -17,6 +15,8 @@ from pudl_archiver.archivers.classes import (
 
 logger = logging.getLogger(f"catalystcoop.{__name__}")
 YEAR_QUARTER_PATT = re.compile(r"CSV_(\d{4})_Q(\d).zip")
+#: How long the number of download links must stay the same before reading them, in ms
+LINKS_STABLE_FOR_MS = 2000
 
 
 class FercEQRArchiver(AbstractDatasetArchiver):
@@ -84,20 +84,16 @@ class FercEQRArchiver(AbstractDatasetArchiver):
         logger.info(
             "Launching browser with playwright to get EQR year-quarter download links"
         )
-        async with async_playwright() as pw:
-            browser = await pw.webkit.launch(headless=True)
-            context = await browser.new_context()
-            page = await context.new_page()
-
+        async with self.browser_page() as page:
             await page.goto("https://eqrreportviewer.ferc.gov/")
-            # Navigate to Downlaods tab, and wait for tab to finish loading
+            # Navigate to Downloads tab, and wait for tab to finish rendering links
             await page.get_by_text("Downloads", exact=True).click()
-            await asyncio.sleep(10)
+            links = page.get_by_text(YEAR_QUARTER_PATT)
+            await self.wait_for_stable_count(links, stable_for_ms=LINKS_STABLE_FOR_MS)
 
             # Find all links matching expected pattern and return
             return [
-                await locator.get_attribute("href")
-                for locator in await page.get_by_text(YEAR_QUARTER_PATT).all()
+                await locator.get_attribute("href") for locator in await links.all()
             ]
 
     async def get_quarter_csv(
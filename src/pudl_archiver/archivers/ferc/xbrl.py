@@ -1,18 +1,24 @@
 """A command line interface (CLI) to archive data from an RSS feed."""
 
 import asyncio
+import contextlib
 import datetime
+import functools
 import io
 import json
 import logging
+import os
 import re
+import shutil
+import time
+import weakref
 import zipfile
 from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable, Coroutine, Iterable
 from enum import Enum
 from pathlib import Path
-from typing import Annotated
-from urllib.parse import urlparse
+from typing import Annotated, Any, BinaryIO
+from urllib.parse import parse_qs, quote, urlparse
 from zipfile import ZIP_DEFLATED
 
 import aiohttp
@@ -23,6 +29,7 @@ from pydantic import BaseModel, Field, HttpUrl, model_validator
 from tqdm import tqdm
 
 from pudl_archiver.archivers.classes import ResourceInfo
+from pudl_archiver.archivers.cpu_pool import get_cpu_pool
 from pudl_archiver.frictionless import ZipLayout
 from pudl_archiver.utils import add_to_archive_stable_hash, retry_async
 
@@ -36,6 +43,21 @@ TAXONOMY_URL_PATTERN = re.compile(
 )
 """Regex pattern to extract taxonomies from XBRL filings."""
 
+_TAXONOMY_URL_BYTES_PATTERN = re.compile(
+    TAXONOMY_URL_PATTERN.pattern.encode(), re.IGNORECASE
+)
+"""Case-insensitive version of ``TAXONOMY_URL_PATTERN`` to search raw filings with."""
+
+TAXONOMY_SEARCH_WINDOW = 2**20
+"""Bytes at the start of a filing searched for the taxonomy it references.
+
+Filings reference their taxonomy in a ``schemaRef`` element, which XBRL requires to
+come before any facts, so it's always within the first few KB.
+"""
+
+TAXONOMY_SEARCH_CHUNK_SIZE = 2**16
+"""Bytes of a filing searched at a time for the taxonomy it references."""
+
 BASE_RSS_URL = "https://ecollection.ferc.gov/api/rssfeed"
 """URL to latest RSS feed.
 The most recent 650 filings will be contained in this feed. All older filings can
@@ -43,6 +65,22 @@ be found in month specific feeds that can be retrieved by appending a query stri
 to this URL to specify the month and year desired.
 """
 
+RSS_FEED_CONCURRENCY = 8
+"""Maximum number of RSS feeds to fetch from FERC at once."""
+
+FILING_DOWNLOAD_CONCURRENCY = 10
+"""Maximum number of filings to download from FERC at once, across all years."""
+
+FILING_DOWNLOAD_WINDOW = 4 * FILING_DOWNLOAD_CONCURRENCY
+"""Maximum number of downloaded filings held in memory until they're written to
+their archive, across all years."""
+
+TAXONOMY_DOWNLOAD_CONCURRENCY = 10
+"""Maximum number of files to download from FERC at once for each taxonomy."""
+
+RSS_CACHE_REVALIDATE_AFTER = datetime.timedelta(days=30)
+"""How long cached feeds for closed months are used without checking with FERC."""
+
 Year = Annotated[int, Field(ge=1994, le=datetime.datetime.now(tz=datetime.UTC).year)]
 """Constrained pydantic integer type with all years containing XBRL data."""
 
@@ -119,6 +157,10 @@ class FeedEntry(BaseModel):
     @classmethod
     def extract_url_timestamp(cls, entry: dict):
         """Get download URL from inline html in feed entry and parse timestamp."""
+        # Entries read back from the RSS cache have already been parsed
+        if "summary_detail" not in entry:
+            return entry
+
         # Get download URL
         link = XBRL_LINK_PATTERN.search(entry["summary_detail"]["value"])
         entry["download_url"] = link.group(1)
@@ -144,7 +186,9 @@ class IndexedFilings(BaseModel):
     filings_per_year: dict[Year, set[FeedEntry]]
 
     @classmethod
-    def index_available_entries(cls, form: FercForm) -> IndexedFilings:
+    async def index_available_entries(
+        cls, form: FercForm, session: aiohttp.ClientSession
+    ) -> IndexedFilings:
         """Parse all RSS feeds and index the available filings by Form number and year.
 
         FERC provides an RSS feed for accessing XBRL filings. However, primary RSS feed
@@ -152,39 +196,262 @@ class IndexedFilings(BaseModel):
         provide month specific feeds that contain all filings submitted for a specific
         month.
 
+        Entries from every feed are only fetched once per event loop, and shared by
+        all forms archived in it. See :func:`_get_all_feed_entries`.
+
+        Args:
+            form: FERC form to index filings for.
+            session: Async http client session.
+
         Returns:
             Dictionary mapping a year to all available filings for that year.
         """
-        rss_feeds = _get_rss_feeds()
-        indexed_filings = defaultdict(set)
+        entries, invalid_entries = await _get_all_feed_entries(session)
+        # Entries for other forms that couldn't be parsed don't affect this form
+        if errors := invalid_entries.get(form.value):
+            raise RuntimeError(
+                f"Couldn't parse {len(errors)} RSS feed entries for {form.value}: "
+                f"{errors[0]}"
+            )
 
-        # Loop through all feeds and index available filings
-        logger.info("Indexing filings available in all RSS feeds")
-        for feed in rss_feeds:
-            logger.info(f"Parsing RSS feed: {feed}")
-            parsed_feed = feedparser.parse(feed)
+        # Get filings specific to FERC form. Entries are sorted by download URL for
+        # deterministic ordering.
+        indexed_filings = defaultdict(list)
+        for entry in entries:
+            if entry.ferc_formname == form:
+                indexed_filings[entry.ferc_year].append(entry)
+        return IndexedFilings(
+            filings_per_year={
+                year: indexed_filings[year] for year in sorted(indexed_filings)
+            }
+        )
 
-            for entry in parsed_feed.entries:
-                # Validate FERC form name
-                if entry["ferc_formname"] != form.value:
-                    continue
 
-                # There are a number of test filings in the feed. Skip these
-                if "Test" in entry["title"]:
-                    continue
+class CachedFeed(BaseModel):
+    """Parsed entries of an RSS feed, saved with the headers to revalidate them."""
 
-                parsed_entry = FeedEntry(**entry)
+    url: str
+    fetched_at: datetime.datetime
+    etag: str | None = None
+    last_modified: str | None = None
+    entries: list[FeedEntry]
+    #: Errors from entries that couldn't be parsed, by FERC form name
+    invalid_entries: dict[str, list[str]] = {}
 
-                # Get filings specific to FERC form and append new filing
-                indexed_filings[parsed_entry.ferc_year].add(parsed_entry)
 
-        # Sort filings by download URL for determenistic ordering
-        return IndexedFilings(
-            filings_per_year={
-                year: sorted(year_filings, key=lambda f: f.download_url)
-                for year, year_filings in indexed_filings.items()
-            }
+def _cache_dir() -> Path:
+    """Directory FERC feeds and archives are cached in.
+
+    Set the ``PUDL_ARCHIVER_CACHE_DIR`` environment variable to change where
+    cached files are kept.
+    """
+    return Path(
+        os.getenv(
+            "PUDL_ARCHIVER_CACHE_DIR", str(Path.home() / ".cache" / "pudl_archiver")
         )
+    )
+
+
+def _rss_cache_dir() -> Path:
+    """Directory parsed RSS feeds are cached in."""
+    return _cache_dir() / "ferc_rss"
+
+
+def _xbrl_cache_dir() -> Path:
+    """Directory the latest archive of each year of XBRL filings is cached in."""
+    return _cache_dir() / "ferc_xbrl"
+
+
+def _read_cached_feed(path: Path) -> CachedFeed | None:
+    """Read a cached feed, or return None if it's missing or can't be read."""
+    try:
+        return CachedFeed.model_validate_json(path.read_text())
+    except FileNotFoundError:
+        return None
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"Ignoring unreadable cached RSS feed {path}: {e!r}")
+        return None
+
+
+def _write_cached_feed(path: Path, cached_feed: CachedFeed):
+    """Write a cached feed, replacing the previous version atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(cached_feed.model_dump_json())
+    tmp_path.replace(path)
+
+
+def _is_closed_feed(feed: str) -> bool:
+    """Check whether a feed is for a month before the most recent monthly feed.
+
+    Filings for closed months aren't expected to change. The most recent monthly
+    feed may still get late filings, and the feed of latest filings changes
+    constantly.
+    """
+    query = parse_qs(urlparse(feed).query)
+    if "month" not in query or "year" not in query:
+        return False
+    latest_month = datetime.datetime.now(tz=datetime.UTC).replace(
+        day=1
+    ) - datetime.timedelta(days=1)
+    return (int(query["year"][0]), int(query["month"][0])) < (
+        latest_month.year,
+        latest_month.month,
+    )
+
+
+def _parse_feed(content: bytes) -> tuple[list[FeedEntry], dict[str, list[str]]]:
+    """Parse an RSS feed and return the entries for filings of supported forms.
+
+    Entries are shared by every form, so an entry that can't be parsed isn't
+    raised here, where it would fail every form. Its error is returned by form
+    name instead, and raised when indexing filings for that form.
+
+    Returns:
+        Parsed entries, and errors from entries that couldn't be parsed by form.
+    """
+    forms = {form.value for form in FercForm}
+    entries = []
+    invalid_entries = defaultdict(list)
+    for entry in feedparser.parse(content).entries:
+        # Validate FERC form name
+        if (form := entry.get("ferc_formname")) not in forms:
+            continue
+
+        # There are a number of test filings in the feed. Skip these
+        if "Test" in entry.get("title", ""):
+            continue
+
+        try:
+            entries.append(FeedEntry(**entry))
+        except Exception as e:  # noqa: BLE001
+            invalid_entries[form].append(f"{entry.get('title')}: {e!r}")
+    return entries, dict(invalid_entries)
+
+
+async def _fetch_feed(
+    feed: str, session: aiohttp.ClientSession
+) -> tuple[CachedFeed, str]:
+    """Get the entries in an RSS feed, using the on-disk cache where possible.
+
+    Cached feeds for closed months are used as they are, until they're older than
+    ``RSS_CACHE_REVALIDATE_AFTER``. Other cached feeds are revalidated with a
+    conditional request, and only downloaded and parsed again if they've changed.
+
+    Returns:
+        Parsed feed, and whether it was read from the cache, revalidated or
+        fetched.
+    """
+    cache_path = _rss_cache_dir() / f"{quote(feed, safe='')}.json"
+    cached = await asyncio.to_thread(_read_cached_feed, cache_path)
+    now = datetime.datetime.now(tz=datetime.UTC)
+    if (
+        cached is not None
+        and _is_closed_feed(feed)
+        and now - cached.fetched_at < RSS_CACHE_REVALIDATE_AFTER
+    ):
+        return cached, "cached"
+
+    headers = {}
+    if cached is not None and cached.etag is not None:
+        headers["If-None-Match"] = cached.etag
+    if cached is not None and cached.last_modified is not None:
+        headers["If-Modified-Since"] = cached.last_modified
+    response = await retry_async(
+        session.get, args=[feed], kwargs={"raise_for_status": True, "headers": headers}
+    )
+    if response.status == 304 and cached is not None:
+        response.release()
+        cached.fetched_at = now
+        await asyncio.to_thread(_write_cached_feed, cache_path, cached)
+        return cached, "revalidated"
+
+    content = await retry_async(response.read)
+    entries, invalid_entries = await asyncio.to_thread(_parse_feed, content)
+    parsed = CachedFeed(
+        url=feed,
+        fetched_at=now,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        entries=entries,
+        invalid_entries=invalid_entries,
+    )
+    await asyncio.to_thread(_write_cached_feed, cache_path, parsed)
+    return parsed, "fetched"
+
+
+async def _fetch_all_feed_entries(
+    session: aiohttp.ClientSession,
+) -> tuple[list[FeedEntry], dict[str, list[str]]]:
+    """Get entries from all RSS feeds, merged and sorted by download URL.
+
+    Feeds are fetched concurrently, at most ``RSS_FEED_CONCURRENCY`` at a time, and
+    parsed in threads so parsing doesn't block other downloads. The same filing can
+    appear in more than one feed. Entries are merged in the order of
+    ``_get_rss_feeds``, however long each feed takes to fetch, and the first entry
+    for each filing is kept, as when feeds were fetched one at a time.
+    """
+    rss_feeds = _get_rss_feeds()
+    semaphore = asyncio.Semaphore(RSS_FEED_CONCURRENCY)
+
+    async def _limited_fetch(feed: str) -> tuple[CachedFeed, str]:
+        async with semaphore:
+            logger.debug(f"Getting RSS feed: {feed}")
+            return await _fetch_feed(feed, session)
+
+    logger.info("Indexing filings available in all RSS feeds")
+    start = time.monotonic()
+    results = await asyncio.gather(*[_limited_fetch(feed) for feed in rss_feeds])
+
+    filings = {}
+    invalid_entries = defaultdict(list)
+    sources = defaultdict(int)
+    for parsed, source in results:
+        sources[source] += 1
+        for entry in parsed.entries:
+            filings.setdefault(str(entry.download_url), entry)
+        for form, errors in parsed.invalid_entries.items():
+            logger.warning(
+                f"Couldn't parse {len(errors)} {form} entries in RSS feed {parsed.url}"
+            )
+            invalid_entries[form] += errors
+    logger.info(
+        f"Indexed {len(filings)} filings from {len(rss_feeds)} RSS feeds in "
+        f"{time.monotonic() - start:.1f}s ("
+        + ", ".join(f"{count} {source}" for source, count in sorted(sources.items()))
+        + ")."
+    )
+    return [filings[url] for url in sorted(filings)], dict(invalid_entries)
+
+
+_feed_entries: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop,
+    asyncio.Task[tuple[list[FeedEntry], dict[str, list[str]]]],
+] = weakref.WeakKeyDictionary()
+
+
+async def _get_all_feed_entries(
+    session: aiohttp.ClientSession,
+) -> tuple[list[FeedEntry], dict[str, list[str]]]:
+    """Get entries from all RSS feeds, shared by every form in this event loop.
+
+    The first form to be archived starts fetching the feeds, and other forms
+    archived at the same time wait for the same result. If fetching fails, the
+    next form tries again.
+
+    Returns:
+        Entries from all feeds, and errors from entries that couldn't be parsed by
+        form. See :func:`_parse_feed`.
+    """
+    loop = asyncio.get_running_loop()
+    task = _feed_entries.get(loop)
+    if task is None or (
+        task.done() and (task.cancelled() or task.exception() is not None)
+    ):
+        task = loop.create_task(_fetch_all_feed_entries(session))
+        _feed_entries[loop] = task
+    # Don't cancel fetching for every form if one of them is cancelled
+    return await asyncio.shield(task)
 
 
 def _taxonomy_zip_name_from_url(url: str) -> str:
@@ -193,6 +460,38 @@ def _taxonomy_zip_name_from_url(url: str) -> str:
     return f"{match.group(1).replace('_', '-')}.zip"
 
 
+def find_taxonomy_url(
+    filing: BinaryIO,
+    window: int = TAXONOMY_SEARCH_WINDOW,
+    chunk_size: int = TAXONOMY_SEARCH_CHUNK_SIZE,
+) -> str | None:
+    """Find the URL of the taxonomy referenced by an XBRL filing.
+
+    The filing is read a chunk at a time, and searching stops at the first taxonomy
+    URL, which is the ``schemaRef`` near the top of the filing. Only the first
+    ``window`` bytes are searched, so a filing that doesn't reference a taxonomy
+    isn't read to the end. The search is case-insensitive, and the URL is returned
+    in lower case.
+
+    Args:
+        filing: Binary file object containing the filing.
+        window: Maximum number of bytes to search.
+        chunk_size: Number of bytes to read at a time.
+    """
+    # Keep the end of the previous chunk, in case a URL is split between chunks
+    overlap = 256
+    buffer = b""
+    searched = 0
+    while searched < window and (
+        chunk := filing.read(min(chunk_size, window - searched))
+    ):
+        searched += len(chunk)
+        buffer = buffer[-overlap:] + chunk
+        if match := _TAXONOMY_URL_BYTES_PATTERN.search(buffer):
+            return match.group(0).decode().lower()
+    return None
+
+
 class FilingMetadata(BaseModel):
     """Combines RSS feed metadata with taxonomy referenced in filing."""
 
@@ -206,12 +505,12 @@ class FilingMetadata(BaseModel):
         cls, rss_metadata: FeedEntry, filename: str, filing_data: bytes
     ) -> FilingMetadata:
         """Construct metadata from RSS feed and filing data to extract taxonomy URL."""
-        if not (match := TAXONOMY_URL_PATTERN.search(filing_data.decode().lower())):
+        # BytesIO shares the buffer of the filing rather than copying it
+        if not (taxonomy_url := find_taxonomy_url(io.BytesIO(filing_data))):
             raise RuntimeError(
                 f"Couldn't find taxonomy for filing {rss_metadata.download_url}"
             )
 
-        taxonomy_url = match.group(0)
         return cls(
             filename=filename,
             rss_metadata=rss_metadata,
@@ -220,11 +519,165 @@ class FilingMetadata(BaseModel):
         )
 
 
+@functools.cache
+def _model_manager() -> ModelManager.ModelManager:
+    """Arelle model manager, created once in each worker process that loads taxonomies."""
+    cntlr = Cntlr.Cntlr()
+    cntlr.startLogging(logFileName="logToPrint")
+    return ModelManager.initialize(cntlr)
+
+
+def _taxonomy_urls(taxonomy_entry_point: str) -> list[str]:
+    """Use Arelle to parse a taxonomy and list the URLs of all files it's made of.
+
+    Parsing a taxonomy is CPU-bound, so this runs in a worker process.
+    """
+    taxonomy = ModelXbrl.load(_model_manager(), taxonomy_entry_point)
+    try:
+        return list(taxonomy.urlDocs)
+    finally:
+        taxonomy.close()
+
+
+def _taxonomy_cache_path(url: str) -> Path:
+    """Path a taxonomy document is cached at, mirroring its URL."""
+    url_parsed = urlparse(url)
+    return (
+        _cache_dir()
+        / "ferc_taxonomy"
+        / url_parsed.netloc
+        / Path(url_parsed.path).relative_to("/")
+    )
+
+
+def _read_cached(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _write_cached(path: Path, data: bytes):
+    """Write a cached file, replacing the previous version atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+
+async def _get_taxonomy_urls(taxonomy_entry_point: str) -> list[str]:
+    """List the URLs of all files a taxonomy is made of, from the cache if possible.
+
+    Taxonomies never change once they're published, so the list is cached
+    alongside the taxonomy's entry point, and Arelle only parses each taxonomy once.
+    """
+    cache_path = _taxonomy_cache_path(taxonomy_entry_point).with_name(
+        f"{Path(urlparse(taxonomy_entry_point).path).name}.urls.json"
+    )
+    if (cached := await asyncio.to_thread(_read_cached, cache_path)) is not None:
+        return json.loads(cached)
+
+    # Use Arelle to parse taxonomy
+    taxonomy_urls = await retry_async(
+        get_cpu_pool().run,
+        args=[_taxonomy_urls, taxonomy_entry_point],
+        retry_on=(FileNotFoundError, FileExistsError),
+    )
+    await asyncio.to_thread(
+        _write_cached, cache_path, json.dumps(taxonomy_urls).encode()
+    )
+    return taxonomy_urls
+
+
+async def _fetch_taxonomy_document(url: str, session: aiohttp.ClientSession) -> bytes:
+    """Download a taxonomy document, or read it from the cache.
+
+    Documents are published under a versioned path and never change, so cached
+    copies are used without checking with FERC.
+    """
+    cache_path = _taxonomy_cache_path(url)
+    if (cached := await asyncio.to_thread(_read_cached, cache_path)) is not None:
+        return cached
+    response = await retry_async(
+        session.get, args=[url], kwargs={"raise_for_status": True}
+    )
+    response_bytes = await retry_async(response.content.read)
+    await asyncio.to_thread(_write_cached, cache_path, response_bytes)
+    return response_bytes
+
+
+_taxonomy_documents: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Task[bytes]]
+] = weakref.WeakKeyDictionary()
+
+
+async def _get_taxonomy_document(url: str, session: aiohttp.ClientSession) -> bytes:
+    """Get a taxonomy document, shared by every taxonomy in this event loop.
+
+    Many documents are shared by several versions of a taxonomy, and by the
+    taxonomies of different forms, so each one is only fetched once per run. If
+    fetching fails, the next taxonomy to need the document tries again.
+    """
+    loop = asyncio.get_running_loop()
+    documents = _taxonomy_documents.setdefault(loop, {})
+    task = documents.get(url)
+    if task is None or (
+        task.done() and (task.cancelled() or task.exception() is not None)
+    ):
+        task = loop.create_task(_fetch_taxonomy_document(url, session))
+        documents[url] = task
+    # Don't cancel fetching for every taxonomy if one of them is cancelled
+    return await asyncio.shield(task)
+
+
+async def _archive_taxonomy(
+    taxonomy_entry_point: str, session: aiohttp.ClientSession
+) -> bytes:
+    """Download all files that make up a taxonomy and return them as a zipfile.
+
+    Files are fetched concurrently, at most ``TAXONOMY_DOWNLOAD_CONCURRENCY`` at a
+    time, and written to the zipfile in a stable order.
+
+    Args:
+        taxonomy_entry_point: URL of the taxonomy's entry point.
+        session: Async http client session.
+    """
+    logger.info(f"Archiving {taxonomy_entry_point}.")
+    taxonomy_urls = await _get_taxonomy_urls(taxonomy_entry_point)
+
+    # There are some generic XML/XBRL files in the taxonomy that should be skipped
+    taxonomy_urls = [
+        url for url in taxonomy_urls if urlparse(url).netloc.endswith("ferc.gov")
+    ]
+    semaphore = asyncio.Semaphore(TAXONOMY_DOWNLOAD_CONCURRENCY)
+
+    async def _limited_get(url: str) -> bytes:
+        async with semaphore:
+            return await _get_taxonomy_document(url, session)
+
+    documents = await asyncio.gather(*[_limited_get(url) for url in taxonomy_urls])
+
+    # Save each file to appropriate location in archive
+    taxonomy_buffer = io.BytesIO()
+    with zipfile.ZipFile(
+        taxonomy_buffer, "w", compression=ZIP_DEFLATED
+    ) as taxonomy_archive:
+        for url, response_bytes in zip(taxonomy_urls, documents, strict=True):
+            path = Path(urlparse(url).path).relative_to("/")
+            add_to_archive_stable_hash(
+                archive=taxonomy_archive,
+                filename=str(path),
+                data=response_bytes,
+            )
+    return taxonomy_buffer.getvalue()
+
+
 async def archive_taxonomies(
     taxonomies_referenced: set[str],
     form: FercForm,
     output_dir: Path,
     session: aiohttp.ClientSession,
+    archived_taxonomies: dict[str, asyncio.Task[bytes]] | None = None,
 ):
     """Download taxonomy and archive all files that comprise the taxonomy.
 
@@ -242,54 +695,25 @@ async def archive_taxonomies(
         form: Ferc form number.
         output_dir: Directory to save archived filings in.
         session: Async http client session.
+        archived_taxonomies: Tasks already archiving some of the taxonomies, keyed by
+            entry point. Taxonomies not in here are archived one at a time.
     """
+    archived_taxonomies = archived_taxonomies or {}
     taxonomy_versions = []
     archive_path = output_dir / f"ferc{form.as_int()}-xbrl-taxonomies.zip"
     with zipfile.ZipFile(archive_path, "w", compression=ZIP_DEFLATED) as archive:
         for taxonomy_entry_point in sorted(taxonomies_referenced):
-            logger.info(f"Archiving {taxonomy_entry_point}.")
-
-            # Use Arelle to parse taxonomy
-            cntlr = Cntlr.Cntlr()
-            cntlr.startLogging(logFileName="logToPrint")
-            model_manager = ModelManager.initialize(cntlr)
-            taxonomy = await retry_async(
-                asyncio.to_thread,
-                args=[ModelXbrl.load, model_manager, taxonomy_entry_point],
-                retry_on=(FileNotFoundError, FileExistsError),
-            )
-
-            # Loop through all files and save to appropriate location in archive
-            archive_files = set()
-            taxonomy_buffer = io.BytesIO()
-            with zipfile.ZipFile(
-                taxonomy_buffer, "w", compression=ZIP_DEFLATED
-            ) as taxonomy_archive:
-                for url in taxonomy.urlDocs:
-                    url_parsed = urlparse(url)
-
-                    # There are some generic XML/XBRL files in the taxonomy that should be skipped
-                    if not url_parsed.netloc.endswith("ferc.gov"):
-                        continue
-
-                    # Download file
-                    response = await retry_async(session.get, args=[url])
-                    response_bytes = await retry_async(response.content.read)
-                    path = Path(url_parsed.path).relative_to("/")
-                    archive_files.add(path)
-
-                    add_to_archive_stable_hash(
-                        archive=taxonomy_archive,
-                        filename=str(path),
-                        data=response_bytes,
-                    )
+            if (task := archived_taxonomies.get(taxonomy_entry_point)) is not None:
+                taxonomy_data = await task
+            else:
+                taxonomy_data = await _archive_taxonomy(taxonomy_entry_point, session)
 
             taxonomy_zip_name = _taxonomy_zip_name_from_url(taxonomy_entry_point)
             taxonomy_versions.append(taxonomy_zip_name)
             add_to_archive_stable_hash(
                 archive=archive,
                 filename=taxonomy_zip_name,
-                data=taxonomy_buffer.getvalue(),
+                data=taxonomy_data,
             )
 
     return ResourceInfo(
@@ -316,43 +740,128 @@ async def _download_filing(
     return await retry_async(response.content.read)
 
 
+def _filing_filename(filing: FeedEntry) -> str:
+    """Name of a filing within the archive for its year."""
+    return f"{filing.title}_form{filing.ferc_formname.as_int()}_{filing.ferc_period}_{round(filing.published_parsed.timestamp())}.xbrl".replace(
+        " ", "_"
+    )
+
+
+def _reusable_filings(previous_archive: zipfile.ZipFile) -> dict[str, str]:
+    """Find the filings in a previous archive of a year, from its rssfeed manifest.
+
+    Returns:
+        Download URLs of filings in the archive, keyed by their filenames.
+    """
+    manifest = json.loads(previous_archive.read("rssfeed"))
+    members = set(previous_archive.namelist())
+    return {
+        filing["filename"]: str(filing["rss_metadata"]["download_url"])
+        for filing_list in manifest.values()
+        for filing in filing_list
+        if filing["filename"] in members
+    }
+
+
 async def _download_filings(
     archive: zipfile.ZipFile,
     year: Year,
     filings: set[FeedEntry],
     form: FercForm,
     session: aiohttp.ClientSession,
+    download_slots: asyncio.Semaphore | None = None,
+    previous_archive: zipfile.ZipFile | None = None,
+    download_window: asyncio.Semaphore | None = None,
 ):
     """Download all filings for a single year/form.
 
+    Filings are downloaded concurrently, at most ``FILING_DOWNLOAD_CONCURRENCY`` at
+    a time, but written to the archive sorted by download URL, so the archive is the
+    same no matter which downloads finish first. Filings downloaded ahead of one
+    that's still in progress wait in memory, up to ``FILING_DOWNLOAD_WINDOW`` of them.
+
+    Each filing takes a slot in the window before it starts downloading, and gives
+    it back once it's been written, or if it fails. Filings of a year take slots in
+    the order they're written, so years sharing a window can't deadlock waiting for
+    each other's slots.
+
+    If a previous archive of the year is passed, filings in it with the same
+    download URL and filename are copied from it instead of being downloaded. The
+    filename includes the time the filing was published, so a filing that's been
+    updated is downloaded again.
+
     Args:
         archive: ZipFile to write filings to.
         year: Year to archive.
         filings: Set of filings indexed from RSS feed.
         form: Ferc form.
         session: Async http client session.
+        download_slots: Limits concurrent downloads when archiving several years at
+            once. If None, limit downloads for this year alone.
+        previous_archive: Previous archive of the same year to reuse filings from.
+        download_window: Limits downloaded filings held in memory when archiving
+            several years at once. If None, limit them for this year alone.
     """
-    metadata = defaultdict(list)
-    for filing in tqdm(
-        sorted(filings, key=lambda f: f.download_url),
-        desc=f"FERC {form.value} {year} XBRL",
-    ):
-        # Download filing
-        response_bytes = await _download_filing(filing, session)
-
-        # Write to zipfile
-        filename = f"{filing.title}_form{filing.ferc_formname.as_int()}_{filing.ferc_period}_{round(filing.published_parsed.timestamp())}.xbrl".replace(
-            " ", "_"
-        )
-        filing_name = f"{filing.title}{filing.ferc_period}"
-        filing_metadata = FilingMetadata.from_rss_metadata(
-            filing, filename, response_bytes
+    sorted_filings = sorted(filings, key=lambda f: f.download_url)
+    reusable = _reusable_filings(previous_archive) if previous_archive else {}
+    if download_slots is None:
+        download_slots = asyncio.Semaphore(FILING_DOWNLOAD_CONCURRENCY)
+    window = download_window or asyncio.Semaphore(FILING_DOWNLOAD_WINDOW)
+    progress = tqdm(total=len(sorted_filings), desc=f"FERC {form.value} {year} XBRL")
+
+    async def _download(filing: FeedEntry) -> bytes:
+        # Semaphores are first come first served, so filings are started in order
+        await window.acquire()
+        try:
+            async with download_slots:
+                response_bytes = await _download_filing(filing, session)
+        except BaseException:
+            window.release()
+            raise
+        progress.update()
+        return response_bytes
+
+    downloads = {
+        filing.download_url: asyncio.create_task(_download(filing))
+        for filing in sorted_filings
+        if reusable.get(_filing_filename(filing)) != str(filing.download_url)
+    }
+    if previous_archive is not None:
+        logger.info(
+            f"Reusing {len(sorted_filings) - len(downloads)} of {len(sorted_filings)} "
+            f"filings for FERC {form.value} {year} from the previous archive."
         )
-        metadata[filing_name].append(filing_metadata.model_dump())
+    metadata = defaultdict(list)
+    try:
+        for filing in sorted_filings:
+            filename = _filing_filename(filing)
+            if (download := downloads.pop(filing.download_url, None)) is not None:
+                response_bytes = await download
+                window.release()
+            else:
+                response_bytes = previous_archive.read(filename)
+                progress.update()
+
+            # Write to zipfile
+            filing_name = f"{filing.title}{filing.ferc_period}"
+            filing_metadata = FilingMetadata.from_rss_metadata(
+                filing, filename, response_bytes
+            )
+            metadata[filing_name].append(filing_metadata.model_dump())
 
-        add_to_archive_stable_hash(
-            archive=archive, filename=filename, data=response_bytes
-        )
+            add_to_archive_stable_hash(
+                archive=archive, filename=filename, data=response_bytes
+            )
+    finally:
+        # Stop any downloads still running if writing a filing failed, and give
+        # back the slots of filings that were downloaded but never written
+        for download in downloads.values():
+            download.cancel()
+        await asyncio.gather(*downloads.values(), return_exceptions=True)
+        for download in downloads.values():
+            if not download.cancelled() and download.exception() is None:
+                window.release()
+        progress.close()
     return {
         filename: sorted(
             metadata[filename],
@@ -368,6 +877,9 @@ async def archive_year(
     form: FercForm,
     output_dir: Path,
     session: aiohttp.ClientSession,
+    download_slots: asyncio.Semaphore | None = None,
+    previous_archive: Path | None = None,
+    download_window: asyncio.Semaphore | None = None,
 ) -> tuple[Path, set[str]]:
     """Archive a single year of data for a desired form.
 
@@ -377,14 +889,42 @@ async def archive_year(
         form: Ferc form.
         output_dir: Directory to save archived filings in.
         session: Async http client session.
+        download_slots: Limits concurrent filing downloads across years.
+        previous_archive: Path to a previous archive of this year, to copy
+            unchanged filings from instead of downloading them again.
+        download_window: Limits downloaded filings held in memory across years.
     """
     # Get form number as integer
     form_number = form.as_int()
 
     archive_path = output_dir / f"ferc{form_number}-xbrl-{year}.zip"
 
-    with zipfile.ZipFile(archive_path, "w", compression=ZIP_DEFLATED) as archive:
-        metadata = await _download_filings(archive, year, filings, form, session)
+    with contextlib.ExitStack() as stack:
+        previous = None
+        if previous_archive is not None:
+            try:
+                previous = stack.enter_context(zipfile.ZipFile(previous_archive))
+                # Check the manifest can be read before relying on it
+                _reusable_filings(previous)
+            except Exception as e:  # noqa: BLE001
+                logger.warning(
+                    f"Can't reuse filings from {previous_archive.name}, "
+                    f"downloading all of them: {e}"
+                )
+                previous = None
+        archive = stack.enter_context(
+            zipfile.ZipFile(archive_path, "w", compression=ZIP_DEFLATED)
+        )
+        metadata = await _download_filings(
+            archive,
+            year,
+            filings,
+            form,
+            session,
+            download_slots,
+            previous,
+            download_window,
+        )
 
         # Save snapshot of RSS feed
         logger.info("Writing rss feed metadata to archive.")
@@ -423,30 +963,131 @@ async def archive_year(
     )
 
 
+def _cache_archive(archive_path: Path):
+    """Keep a copy of the latest archive of a year to build the next one from."""
+    cache_dir = _xbrl_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_dir / f"{archive_path.name}.tmp"
+    shutil.copyfile(archive_path, tmp_path)
+    tmp_path.replace(cache_dir / archive_path.name)
+
+
+async def _run_all(
+    coroutines: Iterable[Coroutine[Any, Any, ResourceInfo]],
+) -> list[ResourceInfo]:
+    """Run coroutines concurrently, cancelling the rest if any of them fails.
+
+    If only one fails, its exception is raised as is rather than in an
+    ``ExceptionGroup``, so callers report the same error as they would for a
+    single coroutine.
+    """
+    failure = None
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [task_group.create_task(coroutine) for coroutine in coroutines]
+    except ExceptionGroup as group:
+        if len(group.exceptions) > 1:
+            raise
+        failure = group.exceptions[0]
+    if failure is not None:
+        raise failure
+    return [task.result() for task in tasks]
+
+
 async def archive_xbrl_for_form(
     form: FercForm,
     output_dir: Path,
     valid_year: Callable[[int], bool],
     session: aiohttp.ClientSession,
+    previous_file: Callable[[str, Path], Awaitable[Path | None]] | None = None,
 ) -> list[ResourceInfo]:
-    """Archive all XBRL filings and taxonomies for specified FERC form."""
-    indexed_filings = IndexedFilings.index_available_entries(form)
-    filing_resources = []
-    for year, filings in indexed_filings.filings_per_year.items():
-        if not valid_year(year):
-            continue
+    """Archive all XBRL filings and taxonomies for specified FERC form.
+
+    Years are archived concurrently, sharing a limit of
+    ``FILING_DOWNLOAD_CONCURRENCY`` filing downloads at once, and of
+    ``FILING_DOWNLOAD_WINDOW`` downloaded filings in memory. As soon as a year is
+    archived, any taxonomies its filings reference that aren't already being
+    archived are started in the background, instead of waiting for every year.
 
-        filing_resources.append(
-            await archive_year(year, filings, form, output_dir, session)
+    If ``previous_file`` is passed, each year is archived incrementally: filings
+    that haven't changed since the previous archive of the year are copied from it,
+    and only new and updated filings are downloaded from FERC. The previous archive
+    is taken from the local cache of the last incremental run if there is one, or
+    else downloaded from the previous version of the deposition. Archives are
+    identical whether or not they're built incrementally.
+
+    Args:
+        form: Ferc form.
+        output_dir: Directory to save archives in.
+        valid_year: Returns whether a year should be archived.
+        session: Async http client session.
+        previous_file: Coroutine function downloading a file from the previous
+            version of the deposition to a local path, returning None if it isn't
+            there. See ``AbstractDatasetArchiver.get_previous_file``.
+    """
+    indexed_filings = await IndexedFilings.index_available_entries(form, session)
+    download_slots = asyncio.Semaphore(FILING_DOWNLOAD_CONCURRENCY)
+    download_window = asyncio.Semaphore(FILING_DOWNLOAD_WINDOW)
+    taxonomy_tasks: dict[str, asyncio.Task[bytes]] = {}
+
+    async def _previous_archive(name: str) -> Path | None:
+        if previous_file is None:
+            return None
+        if (cached := _xbrl_cache_dir() / name).exists():
+            return cached
+        return await previous_file(name, output_dir / f"previous-{name}")
+
+    async def _archive_year(year: Year, filings: set[FeedEntry]) -> ResourceInfo:
+        name = f"ferc{form.as_int()}-xbrl-{year}.zip"
+        previous_archive = await _previous_archive(name)
+        try:
+            resource = await archive_year(
+                year,
+                filings,
+                form,
+                output_dir,
+                session,
+                download_slots,
+                previous_archive,
+                download_window,
+            )
+        finally:
+            if previous_archive is not None and previous_archive.is_relative_to(
+                output_dir
+            ):
+                previous_archive.unlink(missing_ok=True)
+        if previous_file is not None:
+            await asyncio.to_thread(_cache_archive, resource.local_path)
+        for taxonomy in sorted(resource.partitions["taxonomies_referenced"]):
+            if taxonomy not in taxonomy_tasks:
+                taxonomy_tasks[taxonomy] = asyncio.create_task(
+                    _archive_taxonomy(taxonomy, session)
+                )
+        return resource
+
+    try:
+        filing_resources = await _run_all(
+            _archive_year(year, filings)
+            for year, filings in indexed_filings.filings_per_year.items()
+            if valid_year(year)
         )
 
-    taxonomies_referenced = {
-        taxonomy
-        for resource in filing_resources
-        for taxonomy in resource.partitions["taxonomies_referenced"]
-    }
-    taxonomy_resource = await archive_taxonomies(
-        taxonomies_referenced, form, output_dir, session
-    )
+        taxonomies_referenced = {
+            taxonomy
+            for resource in filing_resources
+            for taxonomy in resource.partitions["taxonomies_referenced"]
+        }
+        taxonomy_resource = await archive_taxonomies(
+            taxonomies_referenced,
+            form,
+            output_dir,
+            session,
+            archived_taxonomies=taxonomy_tasks,
+        )
+    finally:
+        # Stop archiving taxonomies in the background if anything failed
+        for task in taxonomy_tasks.values():
+            task.cancel()
+        await asyncio.gather(*taxonomy_tasks.values(), return_exceptions=True)
 
     return [*filing_resources, taxonomy_resource]
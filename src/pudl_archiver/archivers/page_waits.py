@@ -0,0 +1,166 @@
+"""Wait for Playwright pages to be ready, based on what the page is doing.
+
+Scrapers used to sleep for a fixed time after navigating or clicking, hoping the
+page would be done rendering. Pages that are faster than that waste the rest of the
+sleep, and pages that are slower fail intermittently. These helpers wait for a
+condition instead, and return as soon as it's met:
+
+* ``wait_for_stable_count`` waits until a locator matches some elements, and the
+  number it matches has stopped changing, for lists that are rendered in batches.
+* ``wait_for_network_idle`` waits until the page stops making requests.
+* ``wait_for_response`` runs an action, like clicking a tab, and waits for the
+  response to a request it triggers.
+
+Each wait records how long it actually took in a ``PageWaitMetrics``, so slow pages
+can be spotted in the logs. ``AbstractDatasetArchiver`` has methods wrapping each of
+these, which record waits in the archiver's metrics.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Awaitable, Callable
+
+from playwright.async_api import Locator, Page, Response
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from pydantic import BaseModel
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+#: Default maximum time to wait for a page, in milliseconds
+WAIT_TIMEOUT_MS = 2 * 60 * 1000
+
+#: Default time to wait for a page to go idle before reading links from it, in
+#: milliseconds. Pages that poll in the background never go idle, so this is short.
+LINKS_IDLE_TIMEOUT_MS = 5 * 1000
+
+#: How often to check the number of elements matched by a locator, in milliseconds
+POLL_INTERVAL_MS = 100
+
+
+class PageWaitMetrics(BaseModel):
+    """Number and duration of waits for pages, by kind of wait."""
+
+    waits: dict[str, int] = {}
+    total_s: dict[str, float] = {}
+    max_s: dict[str, float] = {}
+
+    def record(self, kind: str, seconds: float):
+        """Record how long a wait took."""
+        self.waits[kind] = self.waits.get(kind, 0) + 1
+        self.total_s[kind] = self.total_s.get(kind, 0.0) + seconds
+        self.max_s[kind] = max(self.max_s.get(kind, 0.0), seconds)
+
+    def summarize(self) -> str:
+        """Describe waits in a human readable way."""
+        return "Waited for pages: " + ", ".join(
+            f"{self.waits[kind]} {kind} ({self.total_s[kind]:.1f}s total, "
+            f"{self.max_s[kind]:.1f}s max)"
+            for kind in sorted(self.waits)
+        )
+
+
+def _record(metrics: PageWaitMetrics | None, kind: str, start: float):
+    elapsed = time.monotonic() - start
+    logger.debug(f"Waited {elapsed:.2f}s for {kind}")
+    if metrics is not None:
+        metrics.record(kind, elapsed)
+
+
+async def wait_for_stable_count(
+    locator: Locator,
+    min_count: int = 1,
+    stable_for_ms: int = 500,
+    timeout_ms: int = WAIT_TIMEOUT_MS,
+    metrics: PageWaitMetrics | None = None,
+) -> int:
+    """Wait until a locator matches enough elements, and the number stops changing.
+
+    Args:
+        locator: Locator for the elements to wait for.
+        min_count: Minimum number of elements to wait for.
+        stable_for_ms: How long the number of elements must stay the same.
+        timeout_ms: Maximum time to wait.
+        metrics: Records how long the wait took.
+
+    Returns:
+        Number of elements matched.
+
+    Raises:
+        TimeoutError: if the number of elements doesn't stabilize in time.
+    """
+    start = changed = time.monotonic()
+    count = await locator.count()
+    while True:
+        now = time.monotonic()
+        if count >= min_count and (now - changed) * 1000 >= stable_for_ms:
+            _record(metrics, "stable count", start)
+            return count
+        if (now - start) * 1000 >= timeout_ms:
+            raise TimeoutError(
+                f"{locator} matched {count} elements, not a stable {min_count} or "
+                f"more, after {timeout_ms / 1000:.0f}s"
+            )
+        await asyncio.sleep(POLL_INTERVAL_MS / 1000)
+        if (new_count := await locator.count()) != count:
+            count = new_count
+            changed = time.monotonic()
+
+
+async def wait_for_network_idle(
+    page: Page,
+    timeout_ms: int = WAIT_TIMEOUT_MS,
+    metrics: PageWaitMetrics | None = None,
+) -> bool:
+    """Wait until a page hasn't made any requests for half a second.
+
+    Some pages poll or stream in the background and never go idle, so running out
+    of time isn't an error.
+
+    Args:
+        page: Page to wait for.
+        timeout_ms: Maximum time to wait.
+        metrics: Records how long the wait took.
+
+    Returns:
+        Whether the page went idle in time.
+    """
+    start = time.monotonic()
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+    except PlaywrightTimeoutError:
+        logger.warning(
+            f"{page.url} was still loading after {timeout_ms / 1000:.0f}s, continuing."
+        )
+        return False
+    finally:
+        _record(metrics, "network idle", start)
+    return True
+
+
+async def wait_for_response(
+    page: Page,
+    url_pattern: str | re.Pattern,
+    action: Callable[[], Awaitable],
+    timeout_ms: int = WAIT_TIMEOUT_MS,
+    metrics: PageWaitMetrics | None = None,
+) -> Response:
+    """Run an action and wait for the response to a request it triggers.
+
+    Args:
+        page: Page the action makes requests from.
+        url_pattern: Glob pattern or regex matching the URL of the request.
+        action: Coroutine function triggering the request, like clicking a link.
+        timeout_ms: Maximum time to wait for the response.
+        metrics: Records how long the wait took.
+
+    Returns:
+        The response, once it's been received.
+    """
+    start = time.monotonic()
+    async with page.expect_response(url_pattern, timeout=timeout_ms) as response_info:
+        await action()
+    response = await response_info.value
+    _record(metrics, "response", start)
+    return response
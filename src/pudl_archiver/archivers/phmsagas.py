@@ -5,8 +5,6 @@ import typing
 from pathlib import Path
 from zipfile import ZipFile
 
-from playwright.async_api import async_playwright
-
 from pudl_archiver.archivers.classes import (
     AbstractDatasetArchiver,
     ArchiveAwaitable,
@@ -30,23 +28,14 @@ class PhmsaGasArchiver(AbstractDatasetArchiver):
 
     name = "phmsagas"
 
-    async def after_download(self) -> None:
-        """Clean up playwright once downloads are complete."""
-        await self.browser.close()
-        await self.playwright.stop()
-
     async def get_resources(self) -> ArchiveAwaitable:
         """Download PHMSA gas resources."""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.webkit.launch()
-
         link_pattern = re.compile(r"annual[-|_](\S+).zip")
 
         # Get main table links using playwright.
         links = await self.get_hyperlinks_via_playwright(
             url=BASE_URL,
             filter_pattern=link_pattern,
-            playwright_browser=self.browser,
         )
 
         forms = [
@@ -90,7 +79,7 @@ class PhmsaGasArchiver(AbstractDatasetArchiver):
             self.logger.warning(f"New form type found: {form}.")
 
         download_path = self.download_directory / f"{self.name}_{filename}.zip"
-        await self.download_zipfile_via_playwright(self.browser, url, download_path)
+        await self.download_zipfile_via_playwright(url, download_path)
 
         # From start and end year, get partitions
         start_year = int(filename.split("_")[-2])
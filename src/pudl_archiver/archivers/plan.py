@@ -0,0 +1,282 @@
+"""Predict which resources will change before downloading them.
+
+Planning runs each resource's download coroutine from ``get_resources`` with the
+download helpers on ``AbstractDatasetArchiver`` switched into plan mode. Instead of
+downloading, they send a ``HEAD`` request for each URL and record its size, ETag and
+Last-Modified headers. These are then compared to the resources in the published
+``datapackage.json``:
+
+* An ETag that looks like an md5 hash is compared to the resource's hash. This only
+  works for files archived exactly as they were downloaded, but it's conclusive, and
+  it's the only way a resource is predicted to be ``unchanged``.
+* A Last-Modified date later than the creation of the published datapackage means
+  the remote file has changed since it was archived.
+* Earlier Last-Modified dates, or a size matching the resource's size, suggest the
+  resource hasn't changed. Servers don't always update Last-Modified, and an edited
+  file can keep its size, so these resources are predicted as ``unknown`` and the
+  weaker evidence is only given as the reason.
+
+Resources whose coroutines do more than call the download helpers, like parsing a
+downloaded file, fail part way through in plan mode. Any resource that can't be
+planned completely is predicted as ``unknown``, and still downloaded when only
+archiving changed resources.
+"""
+
+import asyncio
+import contextvars
+import datetime
+import email.utils
+import json
+import logging
+import re
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from pydantic import BaseModel
+
+from pudl_archiver.frictionless import DataPackage, Partitions, Resource
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+MD5_ETAG = re.compile(r'^(?:W/)?"?([0-9a-f]{32})"?$')
+
+Prediction = Literal["new", "changed", "unchanged", "unknown", "deleted"]
+
+
+class RemoteSource(BaseModel):
+    """Metadata about a remote file from the response to a ``HEAD`` request."""
+
+    url: str
+    size: int | None = None
+    etag: str | None = None
+    last_modified: datetime.datetime | None = None
+
+    @classmethod
+    def from_headers(cls, url: str, headers) -> RemoteSource:
+        """Collect file metadata from response headers."""
+        last_modified = None
+        if value := headers.get("Last-Modified"):
+            try:
+                last_modified = email.utils.parsedate_to_datetime(value)
+            except ValueError:
+                logger.warning(f"Couldn't parse Last-Modified {value} for {url}")
+        size = headers.get("Content-Length")
+        return cls(
+            url=url,
+            size=int(size) if size is not None else None,
+            etag=headers.get("ETag"),
+            last_modified=last_modified,
+        )
+
+    @property
+    def md5_hash(self) -> str | None:
+        """md5 hash of the file, if the ETag looks like one."""
+        if self.etag is not None and (match := MD5_ETAG.match(self.etag)):
+            return match.group(1)
+        return None
+
+
+class PlannedResource(BaseModel):
+    """Remote files that a resource would be downloaded from."""
+
+    partitions: Partitions
+    sources: list[RemoteSource]
+    #: False if the resource's download coroutine failed in plan mode, so there may
+    #: be more sources we didn't find.
+    complete: bool
+
+
+class ResourcePrediction(BaseModel):
+    """Predicted change to a single resource."""
+
+    name: str | None
+    partitions: Partitions
+    prediction: Prediction
+    reason: str
+    sources: list[RemoteSource] = []
+
+
+class ChangePlan(BaseModel):
+    """Predicted changes to a dataset compared to its published version."""
+
+    dataset: str
+    predictions: list[ResourcePrediction]
+
+    @property
+    def unchanged_partitions(self) -> dict[str, Partitions]:
+        """Partitions of resources predicted to be unchanged, by filename."""
+        return {
+            prediction.name: prediction.partitions
+            for prediction in self.predictions
+            if prediction.prediction == "unchanged"
+        }
+
+    def summarize(self) -> str:
+        """Describe the predicted changes in a human readable way."""
+        counts = {}
+        for prediction in self.predictions:
+            counts[prediction.prediction] = counts.get(prediction.prediction, 0) + 1
+        lines = [
+            f"Predicted changes for {self.dataset}: "
+            + ", ".join(f"{count} {kind}" for kind, count in sorted(counts.items()))
+        ]
+        lines += [
+            f"  {prediction.prediction:>9} {prediction.name or prediction.partitions}: "
+            f"{prediction.reason}"
+            for prediction in self.predictions
+        ]
+        return "\n".join(lines)
+
+
+_planned_sources: contextvars.ContextVar[list[RemoteSource] | None] = (
+    contextvars.ContextVar("planned_sources", default=None)
+)
+
+
+def planning() -> bool:
+    """Return True if download helpers should record sources instead of downloading."""
+    return _planned_sources.get() is not None
+
+
+def record_source(source: RemoteSource):
+    """Record a remote file the resource being planned would be downloaded from."""
+    _planned_sources.get().append(source)
+
+
+async def plan_resource(resource, partitions: Partitions) -> PlannedResource:
+    """Run a resource's download coroutine in plan mode and collect its sources.
+
+    Args:
+        resource: Awaitable from ``get_resources`` that would download the resource,
+            or async iterator for a streamed resource.
+        partitions: Partitions of the resource.
+    """
+    sources = []
+    token = _planned_sources.set(sources)
+    complete = True
+    try:
+        if isinstance(resource, AsyncIterator):
+            async for _ in resource:
+                pass
+        else:
+            await resource
+    except Exception as e:  # noqa: BLE001
+        logger.info(f"Couldn't plan all downloads for {partitions}: {e!r}")
+        complete = False
+    finally:
+        _planned_sources.reset(token)
+    return PlannedResource(partitions=partitions, sources=sources, complete=complete)
+
+
+def _normalize_partitions(partitions: Partitions) -> str:
+    """Make partitions comparable to those read back from a datapackage."""
+    return json.dumps(partitions, sort_keys=True, default=str)
+
+
+def _predict_resource(
+    planned: PlannedResource, resource: Resource, published: datetime.datetime
+) -> tuple[Prediction, str]:
+    """Predict whether a previously archived resource will change."""
+    if not planned.complete or not planned.sources:
+        return "unknown", "couldn't find every file the resource is downloaded from"
+    if len(planned.sources) == 1:
+        source = planned.sources[0]
+        if source.md5_hash is not None:
+            if source.md5_hash == resource.hash_:
+                return "unchanged", "ETag matches archived md5 hash"
+            return "changed", "ETag doesn't match archived md5 hash"
+    if all(source.last_modified is not None for source in planned.sources):
+        modified = [
+            source.url for source in planned.sources if source.last_modified > published
+        ]
+        if modified:
+            return "changed", f"modified since last archived: {', '.join(modified)}"
+        return "unknown", "Last-Modified suggests unchanged since last archived"
+    if len(planned.sources) == 1 and planned.sources[0].size == resource.bytes_:
+        return "unknown", "size matches archived file, but contents may differ"
+    return "unknown", "not enough metadata to compare to archived file"
+
+
+def predict_changes(
+    dataset: str,
+    planned_resources: list[PlannedResource] | None,
+    datapackage: DataPackage | None,
+) -> ChangePlan:
+    """Compare planned resources to the resources in a published datapackage.
+
+    Args:
+        dataset: Name of the dataset.
+        planned_resources: Sources found for each resource in plan mode, or None if
+            the archiver couldn't plan its resources. Then every published resource
+            is predicted to be ``unknown``, so none of them are skipped.
+        datapackage: Published datapackage, or None if the dataset hasn't been
+            archived before.
+    """
+    if planned_resources is None:
+        return ChangePlan(
+            dataset=dataset,
+            predictions=[
+                ResourcePrediction(
+                    name=resource.name,
+                    partitions=resource.parts,
+                    prediction="unknown",
+                    reason="archiver doesn't return partitions",
+                )
+                for resource in (datapackage.resources if datapackage else [])
+            ],
+        )
+
+    published_resources = {}
+    published = None
+    if datapackage is not None:
+        published_resources = {
+            _normalize_partitions(resource.parts): resource
+            for resource in datapackage.resources
+        }
+        published = datetime.datetime.fromisoformat(datapackage.created)
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=datetime.UTC)
+
+    predictions = []
+    for planned in planned_resources:
+        resource = published_resources.pop(
+            _normalize_partitions(planned.partitions), None
+        )
+        if resource is None:
+            prediction, reason = "new", "not in published datapackage"
+        else:
+            prediction, reason = _predict_resource(planned, resource, published)
+        predictions.append(
+            ResourcePrediction(
+                name=resource.name if resource is not None else None,
+                partitions=planned.partitions,
+                prediction=prediction,
+                reason=reason,
+                sources=planned.sources,
+            )
+        )
+    predictions += [
+        ResourcePrediction(
+            name=resource.name,
+            partitions=resource.parts,
+            prediction="deleted",
+            reason="no longer found by archiver",
+        )
+        for resource in published_resources.values()
+    ]
+    return ChangePlan(dataset=dataset, predictions=predictions)
+
+
+async def gather_planned_resources(
+    resources: list, partitions: list[Partitions], concurrency_limit: int | None
+) -> list[PlannedResource]:
+    """Plan resources concurrently, respecting the archiver's concurrency limit."""
+    semaphore = asyncio.Semaphore(concurrency_limit or len(resources) or 1)
+
+    async def _plan(resource, parts):
+        async with semaphore:
+            return await plan_resource(resource, parts)
+
+    return await asyncio.gather(
+        *[_plan(resource, parts) for resource, parts in zip(resources, partitions)]
+    )
@@ -1,5 +1,7 @@
 """Download SEC10k extracted tables for arhival."""
 
+from pathlib import Path
+
 import deltalake
 
 from pudl_archiver.archivers.classes import (
@@ -17,6 +19,16 @@ TABLE_NAME_MAP = {
 }
 
 
+def save_delta_table(table_url: str, path: Path):
+    """Read the current version of a Delta table and write it to a parquet file.
+
+    Run in a worker process, since converting large tables blocks other work.
+    """
+    dt = deltalake.DeltaTable(table_url)
+    df = dt.to_pandas()
+    df.to_parquet(path)
+
+
 class Sec10kArchiver(AbstractDatasetArchiver):
     """Sec10k raw extracted archiver."""
 
@@ -31,9 +43,7 @@ class Sec10kArchiver(AbstractDatasetArchiver):
         """Read configured version of table from deltalake on GCS and save parquet."""
         table_url = f"gs://model-outputs.catalyst.coop/sec10k/{delta_name}"
         download_path = self.download_directory / f"{raw_name}.parquet"
-        dt = deltalake.DeltaTable(table_url)
-        df = dt.to_pandas()
-        df.to_parquet(download_path)
+        await self.run_cpu(save_delta_table, table_url, download_path)
 
         return ResourceInfo(
             local_path=download_path,
@@ -110,6 +110,17 @@ def validate_zip_layout(
     )
 
 
+def validate_downloaded_file(
+    path: Path, layout: ZipLayout | None, required_for_run_success: bool
+) -> list[FileUniversalValidation]:
+    """Run all file validations on a downloaded resource."""
+    return [
+        validate_filetype(path, required_for_run_success),
+        validate_file_not_empty(path, required_for_run_success),
+        validate_zip_layout(path, layout, required_for_run_success),
+    ]
+
+
 class PartitionDiff(BaseModel):
     """Model summarizing changes in partitions."""
 
@@ -126,6 +137,8 @@ class FileDiff(BaseModel):
     diff_type: Literal["CREATE", "UPDATE", "DELETE"]
     size_diff: int
     partition_changes: list[PartitionDiff] = []
+    #: changes to the members of a zipfile, found from its central directory
+    member_changes: list[FileDiff] = []
 
 
 class RunSummary(BaseModel):
@@ -168,8 +181,21 @@ class RunSummary(BaseModel):
         failed_partitions: dict[str, Partitions],
         successful_partitions: dict[str, Partitions],
         run_settings: RunSettings,
+        member_changes: dict[str, list[FileDiff]] | None = None,
     ) -> RunSummary:
-        """Create a summary of archive changes from two DataPackage descriptors."""
+        """Create a summary of archive changes from two DataPackage descriptors.
+
+        Args:
+            name: Name of the dataset.
+            baseline_datapackage: Datapackage from the previous version, if any.
+            new_datapackage: Datapackage for the new version.
+            validation_tests: Results of validation tests run on the new version.
+            record_url: Link to the new version of the deposition.
+            failed_partitions: Partitions that failed to download, by filename.
+            successful_partitions: Partitions in the new version, by filename.
+            run_settings: Settings used for the run.
+            member_changes: Changes to the members of updated zipfiles, by filename.
+        """
         baseline_resources = {}
         datapackage_changed = True
         if baseline_datapackage is not None:
@@ -184,7 +210,9 @@ class RunSummary(BaseModel):
             resource.name: resource for resource in new_datapackage.resources
         }
 
-        file_changes = _process_resource_diffs(baseline_resources, new_resources)
+        file_changes = _process_resource_diffs(
+            baseline_resources, new_resources, member_changes or {}
+        )
         file_changes = sorted(file_changes, key=lambda d: d.name)  # Sort by filename
 
         previous_version = ""
@@ -308,7 +336,9 @@ def _process_partition_diffs(
 
 
 def _process_resource_diffs(
-    baseline_resources: dict[str, Resource], new_resources: dict[str, Resource]
+    baseline_resources: dict[str, Resource],
+    new_resources: dict[str, Resource],
+    member_changes: dict[str, list[FileDiff]] | None = None,
 ) -> list[FileDiff]:
     """Check how resources have changed."""
     # Get sets of resources from previous version and new version
@@ -358,6 +388,7 @@ def _process_resource_diffs(
                     diff_type="UPDATE",
                     size_diff=new_resource.bytes_ - baseline_resource.bytes_,
                     partition_changes=partition_diffs,
+                    member_changes=(member_changes or {}).get(resource, []),
                 )
             )
 
@@ -0,0 +1,203 @@
+"""Manage the local directory that resources are downloaded to before depositing.
+
+Each archiver downloads into a ``DownloadWorkspace``. Once a resource has been added
+to the draft deposition, its local file is no longer needed, and the orchestrator
+releases it so it's deleted right away instead of when the archiver is cleaned up.
+Long runs of large datasets would otherwise keep every resource on disk until the
+end of the run.
+
+A workspace can also have a high-water mark. Download helpers call
+``wait_for_space`` before starting each download, and pause while the resources
+downloaded into the workspace, and not yet released, take up more than the
+high-water mark. The size of each resource is added to a running total once it has
+been downloaded, and subtracted when it's released, so checking for space never has
+to walk the workspace. Partial downloads and intermediate files that an archiver
+deletes itself aren't counted. Space is only freed when the orchestrator releases a
+resource, after adding it to the draft, so downloads only wait while another
+resource is still being downloaded or added to the draft. If nothing else is in
+flight, like when a single resource is larger than the high-water mark, the
+download goes ahead with a warning instead of waiting forever.
+"""
+
+import asyncio
+import contextvars
+import logging
+import shutil
+import tempfile
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+_in_resource_download: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "in_resource_download", default=False
+)
+
+
+class WorkspaceMetrics(BaseModel):
+    """Disk usage of a download workspace over a run."""
+
+    peak_bytes: int = 0
+    bytes_released: int = 0
+    files_released: int = 0
+    #: number of downloads that waited for space below the high-water mark
+    pauses: int = 0
+    pause_s: float = 0.0
+
+
+class DownloadWorkspace:
+    """Temporary directory for downloads that tracks and limits its size on disk."""
+
+    def __init__(self, high_water_bytes: int | None = None):
+        """Create a new temporary workspace.
+
+        Args:
+            high_water_bytes: Pause downloads while the workspace holds more than this
+                many bytes. If None, downloads never pause.
+        """
+        self.high_water_bytes = high_water_bytes
+        self.metrics = WorkspaceMetrics()
+        self._directory_manager = tempfile.TemporaryDirectory()
+        self.root = Path(self._directory_manager.name)
+        self.directory = self.root
+        self._chunk = 0
+        # Sizes of downloaded resources that haven't been released, and their total
+        self._sizes: dict[Path, int] = {}
+        self._bytes = 0
+        # Number of resources being downloaded or deposited, that aren't waiting
+        # for space. Each of these may free up space when it's done.
+        self._running = 0
+        # Set and replaced whenever space may have been freed
+        self._changed = asyncio.Event()
+
+    def bytes_on_disk(self) -> int:
+        """Total size of downloaded resources in the workspace that aren't released."""
+        return self._bytes
+
+    async def add(self, path: Path):
+        """Count a downloaded resource towards the size of the workspace.
+
+        Adding the same file again replaces its previous size. Files outside the
+        workspace aren't counted, since releasing them doesn't free any space.
+        """
+        if not path.is_relative_to(self.root):
+            return
+        try:
+            size = (await asyncio.to_thread(path.stat)).st_size
+        except FileNotFoundError:
+            return
+        self._bytes += size - self._sizes.get(path, 0)
+        self._sizes[path] = size
+        self.metrics.peak_bytes = max(self.metrics.peak_bytes, self._bytes)
+
+    def new_directory(self) -> Path:
+        """Replace the current download directory with a new, empty one.
+
+        Anything left in the previous directory, like intermediate files and
+        resources that were never released, is deleted. The root directory of the
+        workspace is never deleted before ``cleanup``.
+        """
+        if self.directory != self.root:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            for path in [p for p in self._sizes if p.is_relative_to(self.directory)]:
+                self._bytes -= self._sizes.pop(path)
+        self._chunk += 1
+        self.directory = self.root / f"chunk-{self._chunk}"
+        self.directory.mkdir()
+        self._notify_space_freed()
+        return self.directory
+
+    async def release(self, path: Path):
+        """Delete a resource file once it's been deposited.
+
+        Files outside the workspace, like test fixtures or files an archiver
+        manages itself, are left alone.
+        """
+        if not path.is_relative_to(self.root):
+            return
+        try:
+            size = (await asyncio.to_thread(path.stat)).st_size
+            await asyncio.to_thread(path.unlink)
+        except FileNotFoundError:
+            return
+        self._bytes -= self._sizes.pop(path, 0)
+        self.metrics.bytes_released += size
+        self.metrics.files_released += 1
+        self._notify_space_freed()
+
+    @asynccontextmanager
+    async def downloading(self) -> AsyncIterator[None]:
+        """Mark the current task as downloading a resource while in the context."""
+        self._running += 1
+        token = _in_resource_download.set(True)
+        try:
+            yield
+        finally:
+            _in_resource_download.reset(token)
+            self._running -= 1
+            self._notify_space_freed()
+
+    @contextmanager
+    def depositing(self) -> Iterator[None]:
+        """Count a downloaded resource as in progress until it's been released.
+
+        The orchestrator adds the resource to the draft and releases it before
+        asking for the next one, which is when this context exits.
+        """
+        self._running += 1
+        try:
+            yield
+        finally:
+            self._running -= 1
+            self._notify_space_freed()
+
+    async def wait_for_space(self):
+        """Pause while the workspace is over its high-water mark.
+
+        Waits as long as some other resource is still being downloaded, or added to
+        the draft and released, so there's a chance of space being freed. Otherwise
+        the download goes ahead, even if the workspace stays over the mark.
+        """
+        if self.high_water_bytes is None:
+            return
+        own = 1 if _in_resource_download.get() else 0
+        start = None
+        while (used := self.bytes_on_disk()) >= self.high_water_bytes:
+            # Nothing else can run between measuring and waiting, so no
+            # notifications are missed
+            if self._running - own <= 0:
+                logger.warning(
+                    f"Download workspace holds {used} bytes, over its high-water mark "
+                    f"of {self.high_water_bytes}, but nothing else is in progress. "
+                    "Continuing anyway."
+                )
+                break
+            if start is None:
+                start = time.monotonic()
+                self.metrics.pauses += 1
+                logger.info(
+                    f"Download workspace holds {used} bytes, over its high-water mark "
+                    f"of {self.high_water_bytes}. Pausing download."
+                )
+            # Other paused downloads may have been waiting on this one
+            self._running -= own
+            self._notify_space_freed()
+            try:
+                await self._changed.wait()
+            finally:
+                self._running += own
+        if start is not None:
+            self.metrics.pause_s += time.monotonic() - start
+
+    def cleanup(self):
+        """Delete the workspace and everything in it."""
+        self._directory_manager.cleanup()
+
+    def _notify_space_freed(self):
+        """Wake up every download currently waiting for space."""
+        self._changed.set()
+        self._changed = asyncio.Event()
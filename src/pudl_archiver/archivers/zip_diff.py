@@ -0,0 +1,191 @@
+"""Compare the members of two zipfiles using only their central directories.
+
+A zipfile ends with a central directory listing the name, CRC32 and size of every
+member, so the changes between two versions of a zipfile can be found without
+decompressing anything. For the previously published version, only the tail of the
+file containing the central directory is read from the depositor, using range
+requests, so large archives don't need to be downloaded again.
+
+The central directory is parsed by ``zipfile`` itself, reading from a file object
+that only contains the tail of the file fetched so far. If ``zipfile`` reads before
+the start of the tail, the tail is extended back to that point and parsing starts
+again.
+"""
+
+import asyncio
+import io
+import logging
+import zipfile
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from pudl_archiver.archivers.validate import FileDiff
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+#: Bytes read from the end of a remote zipfile on the first attempt, which covers
+#: the central directories of most archives.
+TAIL_SIZE = 2**20
+
+#: ``zipfile`` searches this many bytes from the end of a file for the end of
+#: central directory record, which may be followed by a comment up to 64 KiB.
+MIN_TAIL_SIZE = 2**16 + 128
+
+#: Maximum number of times to extend the tail while looking for the central directory
+MAX_RANGE_REQUESTS = 4
+
+ReadRange = Callable[[int, int], Awaitable[bytes]]
+
+
+class ZipMember(BaseModel):
+    """Metadata about a zipfile member from the central directory."""
+
+    name: str
+    crc: int
+    file_size: int
+    compress_size: int
+
+    @classmethod
+    def from_zipinfo(cls, info: zipfile.ZipInfo) -> ZipMember:
+        """Get metadata from a ``ZipInfo``."""
+        return cls(
+            name=info.filename,
+            crc=info.CRC,
+            file_size=info.file_size,
+            compress_size=info.compress_size,
+        )
+
+
+class _MissingRangeError(Exception):
+    """Raised when reading bytes before the start of the fetched tail."""
+
+    def __init__(self, start: int):
+        super().__init__(f"Bytes from {start} haven't been fetched.")
+        self.start = start
+
+
+class _FileTail(io.RawIOBase):
+    """Seekable file containing only the tail of a remote file."""
+
+    def __init__(self, size: int, tail: bytes):
+        self.size = size
+        self.tail = tail
+        self.tail_start = size - len(tail)
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}
+        self.position = base[whence] + offset
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        if self.position < self.tail_start:
+            raise _MissingRangeError(self.position)
+        offset = self.position - self.tail_start
+        data = self.tail[offset : offset + len(buffer)]
+        buffer[: len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+def local_zip_members(path: Path) -> dict[str, ZipMember]:
+    """Read the central directory of a local zipfile."""
+    with zipfile.ZipFile(path) as archive:
+        return {
+            info.filename: ZipMember.from_zipinfo(info) for info in archive.infolist()
+        }
+
+
+async def remote_zip_members(
+    read_range: ReadRange, size: int, tail_size: int = TAIL_SIZE
+) -> dict[str, ZipMember]:
+    """Read the central directory of a remote zipfile with range requests.
+
+    Args:
+        read_range: Coroutine function returning the bytes between two offsets of the
+            remote file.
+        size: Size of the remote file in bytes.
+        tail_size: Bytes to read from the end of the file on the first request.
+    """
+    tail_start = max(size - max(tail_size, MIN_TAIL_SIZE), 0)
+    tail = await read_range(tail_start, size)
+    for _ in range(MAX_RANGE_REQUESTS):
+        try:
+            with zipfile.ZipFile(_FileTail(size, tail)) as archive:
+                return {
+                    info.filename: ZipMember.from_zipinfo(info)
+                    for info in archive.infolist()
+                }
+        except _MissingRangeError as e:
+            tail = await read_range(e.start, tail_start) + tail
+            tail_start = e.start
+    raise RuntimeError(
+        f"Couldn't find central directory after {MAX_RANGE_REQUESTS} range requests."
+    )
+
+
+def diff_zip_members(
+    baseline: dict[str, ZipMember], new: dict[str, ZipMember]
+) -> list[FileDiff]:
+    """Find members created, deleted or changed between two versions of a zipfile.
+
+    Members are changed if their CRC32 or uncompressed size differ. Size diffs are
+    in uncompressed bytes.
+    """
+    member_diffs = []
+    for name in sorted(baseline.keys() | new.keys()):
+        old_member, new_member = baseline.get(name), new.get(name)
+        if old_member is None:
+            member_diffs.append(
+                FileDiff(name=name, diff_type="CREATE", size_diff=new_member.file_size)
+            )
+        elif new_member is None:
+            member_diffs.append(
+                FileDiff(name=name, diff_type="DELETE", size_diff=-old_member.file_size)
+            )
+        elif (old_member.crc, old_member.file_size) != (
+            new_member.crc,
+            new_member.file_size,
+        ):
+            member_diffs.append(
+                FileDiff(
+                    name=name,
+                    diff_type="UPDATE",
+                    size_diff=new_member.file_size - old_member.file_size,
+                )
+            )
+    return member_diffs
+
+
+async def diff_zipfile(
+    local_path: Path,
+    read_range: ReadRange,
+    remote_size: int,
+    tail_size: int = TAIL_SIZE,
+) -> list[FileDiff]:
+    """Compare a local zipfile to a previously published version of it.
+
+    Args:
+        local_path: Path to the new version of the zipfile.
+        read_range: Coroutine function returning the bytes between two offsets of the
+            published version.
+        remote_size: Size of the published version in bytes.
+        tail_size: Bytes to read from the end of the published version on the first
+            request.
+    """
+    new, baseline = await asyncio.gather(
+        asyncio.to_thread(local_zip_members, local_path),
+        remote_zip_members(read_range, remote_size, tail_size),
+    )
+    return diff_zip_members(baseline, new)
@@ -7,8 +7,10 @@ import click
 import coloredlogs
 from dotenv import load_dotenv
 
-from pudl_archiver import ARCHIVERS, archive_dataset
+from pudl_archiver import ARCHIVERS, archive_dataset, archive_datasets, plan_dataset
 from pudl_archiver.archivers.validate import RunSummary
+from pudl_archiver.depositors.fsspec import FsspecAPIClient
+from pudl_archiver.journal import RunJournal
 from pudl_archiver.utils import RunSettings
 
 logger = logging.getLogger("catalystcoop.pudl_archiver")
@@ -67,15 +69,56 @@ only_years_option = click.option(
     "eiaaeo, eiamecs, eiawater, eiasteo, epacamd_eia, epacems, epaegrid, ferc1, ferc2, "
     "ferc6, ferc60, ferc714, mshamines, nrelatb, phmsagas, usgsuswtdb",
 )
+only_changed_option = click.option(
+    "--only-changed",
+    is_flag=True,
+    help="Skip downloading resources that are predicted to be unchanged since the "
+    "last published version. See the plan command.",
+)
+max_disk_gb_option = click.option(
+    "--max-disk-gb",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Pause downloads while downloaded resources that haven't been deposited "
+    "yet take up more than this many GB of local disk. A resource larger than this "
+    "is still downloaded once nothing else is in progress. Partial downloads, "
+    "previous versions of files fetched with --incremental, and the FERC caches in "
+    "PUDL_ARCHIVER_CACHE_DIR (~/.cache/pudl_archiver by default) aren't counted.",
+)
+incremental_option = click.option(
+    "--incremental",
+    is_flag=True,
+    help="Reuse unchanged files from the last published version instead of "
+    "downloading them again, for archivers that support it (currently FERC XBRL).",
+)
+journal_option = click.option(
+    "--journal/--no-journal",
+    default=True,
+    show_default=True,
+    help="Record each resource in {dataset}_run_journal.jsonl as it's deposited, so "
+    "an interrupted run can be continued with the resume command. The journal is "
+    "deleted once the run succeeds.",
+)
 dataset_argument = click.argument("dataset", type=str)
 
 
+def _max_disk_bytes(max_disk_gb: float | None) -> int | None:
+    return int(max_disk_gb * 1e9) if max_disk_gb is not None else None
+
+
+def _journal_file(dataset: str, journal: bool) -> str | None:
+    return f"{dataset}_run_journal.jsonl" if journal else None
+
+
 @archive.command
 @initialize_option
 @auto_publish_option
 @clobber_unchanged_option
 @refresh_metadata_option
 @only_years_option
+@only_changed_option
+@max_disk_gb_option
+@incremental_option
+@journal_option
 @dataset_argument
 @click.option("--sandbox", is_flag=True, help="Use Zenodo sandbox server")
 def zenodo(
@@ -85,6 +128,10 @@ def zenodo(
     clobber_unchanged: bool,
     refresh_metadata: bool,
     only_years: tuple[int],
+    only_changed: bool,
+    max_disk_gb: float | None,
+    incremental: bool,
+    journal: bool,
     dataset: str,
 ):
     """Archive DATASET to zenodo."""
@@ -98,7 +145,11 @@ def zenodo(
                 auto_publish=auto_publish,
                 clobber_unchanged=clobber_unchanged,
                 summary_file=f"{dataset}_run_summary.json",
+                journal_file=_journal_file(dataset, journal),
                 only_years=only_years,
+                only_changed=only_changed,
+                max_disk_bytes=_max_disk_bytes(max_disk_gb),
+                incremental=incremental,
                 depositor="zenodo",
                 depositor_args={"sandbox": sandbox},
             ),
@@ -112,6 +163,10 @@ def zenodo(
 @clobber_unchanged_option
 @refresh_metadata_option
 @only_years_option
+@only_changed_option
+@max_disk_gb_option
+@incremental_option
+@journal_option
 @dataset_argument
 @click.argument(
     "deposition-path",
@@ -123,6 +178,10 @@ def fsspec(
     clobber_unchanged: bool,
     refresh_metadata: bool,
     only_years: tuple[int],
+    only_changed: bool,
+    max_disk_gb: float | None,
+    incremental: bool,
+    journal: bool,
     dataset: str,
     deposition_path: str,
 ):
@@ -142,7 +201,11 @@ def fsspec(
                 auto_publish=auto_publish,
                 clobber_unchanged=clobber_unchanged,
                 summary_file=f"{dataset}_run_summary.json",
+                journal_file=_journal_file(dataset, journal),
                 only_years=only_years,
+                only_changed=only_changed,
+                max_disk_bytes=_max_disk_bytes(max_disk_gb),
+                incremental=incremental,
                 depositor="fsspec",
                 depositor_args={"deposition_path": deposition_path},
             ),
@@ -150,6 +213,161 @@ def fsspec(
     )
 
 
+@archive.command
+@initialize_option
+@auto_publish_option
+@clobber_unchanged_option
+@refresh_metadata_option
+@only_years_option
+@only_changed_option
+@max_disk_gb_option
+@incremental_option
+@journal_option
+@click.argument("datasets", nargs=-1, type=str)
+@click.option(
+    "--all",
+    "all_datasets",
+    is_flag=True,
+    help="Archive every dataset with an archiver.",
+)
+@click.option(
+    "--depositor",
+    type=click.Choice(["zenodo", "fsspec"]),
+    default="zenodo",
+    show_default=True,
+    help="Backend to deposit archives with.",
+)
+@click.option("--sandbox", is_flag=True, help="Use Zenodo sandbox server")
+@click.option(
+    "--deposition-path",
+    type=str,
+    help="Root path for the fsspec depositor. Each dataset is archived to "
+    "DEPOSITION_PATH/<dataset>.",
+)
+@click.option(
+    "--max-concurrent-datasets",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Maximum number of datasets to archive at once. Uploads to Zenodo share one "
+    "limit on concurrent writes however many datasets are running.",
+)
+def batch(
+    initialize: bool,
+    auto_publish: bool,
+    clobber_unchanged: bool,
+    refresh_metadata: bool,
+    only_years: tuple[int],
+    only_changed: bool,
+    max_disk_gb: float | None,
+    incremental: bool,
+    journal: bool,
+    datasets: tuple[str],
+    all_datasets: bool,
+    depositor: str,
+    sandbox: bool,
+    deposition_path: str | None,
+    max_concurrent_datasets: int,
+):
+    """Archive several DATASETS concurrently in one process.
+
+    All datasets share one HTTP session and its per-host connection limits, and
+    Zenodo requests share one rate limiter, so uploads queue behind the same cap on
+    concurrent writes. Each dataset writes its own run summary file, and the time
+    taken by each dataset and the whole batch is logged when they finish. The
+    ``--max-disk-gb`` limit applies to each dataset separately.
+    """
+    if all_datasets == bool(datasets):
+        raise click.UsageError("Pass either a list of DATASETS or --all.")
+    if all_datasets:
+        datasets = sorted(ARCHIVERS.keys())
+    if unknown := [dataset for dataset in datasets if dataset not in ARCHIVERS]:
+        raise click.BadParameter(
+            f"No archiver for {', '.join(unknown)}", param_hint="DATASETS"
+        )
+    if depositor == "fsspec" and deposition_path is None:
+        raise click.UsageError("--deposition-path is required with fsspec.")
+
+    def _depositor_args(dataset: str) -> dict:
+        if depositor == "fsspec":
+            return {"deposition_path": f"{deposition_path.rstrip('/')}/{dataset}"}
+        return {"sandbox": sandbox}
+
+    asyncio.run(
+        archive_datasets(
+            run_settings={
+                dataset: RunSettings(
+                    initialize=initialize,
+                    retry_run=None,
+                    refresh_metadata=refresh_metadata,
+                    auto_publish=auto_publish,
+                    clobber_unchanged=clobber_unchanged,
+                    summary_file=f"{dataset}_run_summary.json",
+                    journal_file=_journal_file(dataset, journal),
+                    only_years=only_years,
+                    only_changed=only_changed,
+                    max_disk_bytes=_max_disk_bytes(max_disk_gb),
+                    incremental=incremental,
+                    depositor=depositor,
+                    depositor_args=_depositor_args(dataset),
+                )
+                for dataset in datasets
+            },
+            max_concurrent_datasets=max_concurrent_datasets,
+        )
+    )
+
+
+@archive.command
+@only_years_option
+@dataset_argument
+@click.option(
+    "--depositor",
+    type=click.Choice(["zenodo", "fsspec"]),
+    default="zenodo",
+    show_default=True,
+    help="Backend the dataset is deposited with.",
+)
+@click.option("--sandbox", is_flag=True, help="Use Zenodo sandbox server")
+@click.option(
+    "--deposition-path",
+    type=str,
+    help="Path to the deposition, required with the fsspec depositor.",
+)
+def plan(
+    only_years: tuple[int],
+    dataset: str,
+    depositor: str,
+    sandbox: bool,
+    deposition_path: str | None,
+):
+    """Predict which resources of DATASET will change, without downloading them.
+
+    Sends a HEAD request for each file the archiver would download, and compares the
+    size, ETag and Last-Modified headers to the resources in the most recently
+    published datapackage. The predicted changes are logged and written to
+    ``{dataset}_plan.json``.
+    """
+    if depositor == "fsspec" and deposition_path is None:
+        raise click.UsageError("--deposition-path is required with fsspec.")
+    depositor_args = (
+        {"deposition_path": deposition_path}
+        if depositor == "fsspec"
+        else {"sandbox": sandbox}
+    )
+    asyncio.run(
+        plan_dataset(
+            dataset=dataset,
+            run_settings=RunSettings(
+                only_years=only_years,
+                depositor=depositor,
+                depositor_args=depositor_args,
+            ),
+            plan_file=f"{dataset}_plan.json",
+        )
+    )
+
+
 @pudl_archiver.command
 @click.argument(
     "summary-file",
@@ -231,6 +449,60 @@ def retry_run(summary_file: str, auto_publish: bool):
     )
 
 
+@pudl_archiver.command
+@auto_publish_option
+@click.argument(
+    "journal-file",
+    type=str,
+)
+def resume(journal_file: str, auto_publish: bool):
+    """Resume a run that was interrupted before it could write a run summary.
+
+    JOURNAL_FILE points to the ``{dataset}_run_journal.jsonl`` file written by the
+    interrupted run. Resources recorded in the journal that are still in the draft
+    deposition are skipped, and new resources are appended to the same journal. All
+    run settings are inherited from the interrupted run except for ``auto-publish``,
+    which defaults to False to avoid accidental publication.
+    """
+    journal = RunJournal.load(journal_file)
+    asyncio.run(
+        archive_dataset(
+            dataset=journal.dataset,
+            run_settings=journal.start.run_settings.model_copy(
+                update={"auto_publish": auto_publish}
+            ),
+            journal=journal,
+        )
+    )
+
+
+@pudl_archiver.command
+@click.argument(
+    "deposition-path",
+    type=str,
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="List unreferenced blobs without deleting them.",
+)
+def prune_fsspec_blobs(deposition_path: str, dry_run: bool):
+    """Delete blobs in DEPOSITION_PATH that aren't used by any published version.
+
+    Blobs are never deleted when publishing, so every previous version of an fsspec
+    deposition stays available. After removing old version manifests from the
+    ``versions/`` directory, use this command to delete the blobs only they used.
+    """
+    api_client = asyncio.run(
+        FsspecAPIClient.initialize_client(session=None, deposition_path=deposition_path)
+    )
+    unreferenced_blobs = api_client.prune_blobs(dry_run=dry_run)
+    action = "Found" if dry_run else "Deleted"
+    logger.info(f"{action} {len(unreferenced_blobs)} unreferenced blobs.")
+    for blob in unreferenced_blobs:
+        logger.info(blob)
+
+
 def main():
     """Kick off async script."""
     pudl_archiver()
@@ -22,23 +22,56 @@ from .depositor import (
 from .zenodo import depositor
 
 
-async def get_deposition(
+async def get_published_datapackage(
     dataset: str,
     session: aiohttp.ClientSession,
     run_settings: RunSettings,
-) -> tuple[DraftDeposition, DataPackage | None]:
-    """Create draft deposition from scratch or previous version."""
+) -> DataPackage | None:
+    """Get the datapackage from the most recent published version, if there is one."""
+    if run_settings.initialize:
+        return None
     deposition_backend = DEPOSITION_BACKENDS[run_settings.depositor]
     api_client = await deposition_backend.api_client.initialize_client(
         session=session,
         **run_settings.depositor_args,
     )
-    if run_settings.initialize:
-        return await deposition_backend.draft_interface.new_draft(
+    published_deposition = (
+        await deposition_backend.published_interface.get_most_recent_version(
             dataset_id=dataset,
             settings=run_settings,
             api_client=api_client,
-        ), None
+        )
+    )
+    datapackage_bytes = await published_deposition.get_file("datapackage.json")
+    return DataPackage.model_validate_json(datapackage_bytes)
+
+
+async def get_deposition(
+    dataset: str,
+    session: aiohttp.ClientSession,
+    run_settings: RunSettings,
+) -> tuple[DraftDeposition, DataPackage | None, PublishedDeposition | None]:
+    """Create draft deposition from scratch or previous version.
+
+    Returns:
+        The draft deposition, and the datapackage and published deposition of the
+        previous version if there is one.
+    """
+    deposition_backend = DEPOSITION_BACKENDS[run_settings.depositor]
+    api_client = await deposition_backend.api_client.initialize_client(
+        session=session,
+        **run_settings.depositor_args,
+    )
+    if run_settings.initialize:
+        return (
+            await deposition_backend.draft_interface.new_draft(
+                dataset_id=dataset,
+                settings=run_settings,
+                api_client=api_client,
+            ),
+            None,
+            None,
+        )
 
     published_deposition = (
         await deposition_backend.published_interface.get_most_recent_version(
@@ -51,4 +84,8 @@ async def get_deposition(
     original_datapackage_bytes = await published_deposition.get_file("datapackage.json")
     original_datapackage = DataPackage.model_validate_json(original_datapackage_bytes)
 
-    return await published_deposition.open_draft(), original_datapackage
+    return (
+        await published_deposition.open_draft(),
+        original_datapackage,
+        published_deposition,
+    )
@@ -1,11 +1,14 @@
 """Implements generic interface for depositors."""
 
+import asyncio
 import io
 import logging
 import typing
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from enum import Enum, auto
+from hashlib import md5
 from pathlib import Path
 from typing import BinaryIO
 
@@ -14,10 +17,31 @@ from pydantic import BaseModel, ConfigDict
 
 from pudl_archiver.archivers.validate import RunSummary
 from pudl_archiver.frictionless import DataPackage, Partitions, ResourceInfo
-from pudl_archiver.utils import RunSettings, Url, compute_md5
+from pudl_archiver.journal import RunJournal
+from pudl_archiver.utils import RunSettings, Url, retry_async
 
 logger = logging.getLogger(f"catalystcoop.{__name__}")
 
+#: Default size of chunks yielded when streaming files from a deposition
+STREAM_CHUNK_SIZE = 2**20
+
+
+def resolve_byte_range(start: int, end: int | None, size: int) -> tuple[int, int]:
+    """Convert a byte range like a slice into absolute offsets within a file.
+
+    Args:
+        start: Offset of the first byte. Negative values count back from the end of
+            the file, so ``-100`` is the last 100 bytes.
+        end: Offset after the last byte, or None for the end of the file.
+        size: Size of the file in bytes.
+
+    Returns:
+        Start and end offsets, clamped to the file, with ``start <= end``.
+    """
+    start = max(size + start, 0) if start < 0 else min(start, size)
+    end = size if end is None else max(min(end, size), start)
+    return start, end
+
 
 @dataclass
 class _UploadSpec:
@@ -27,20 +51,71 @@ class _UploadSpec:
     dest: str
 
 
-class FileWrapper(io.BytesIO):
-    """Minimal wrapper around BytesIO to override close method to work around aiohttp."""
+class HashingReader(io.RawIOBase):
+    """Wrap a binary file to compute the md5 hash of its contents as it is read.
 
-    def __init__(self, content: bytes):
-        """Call base class __init__."""
-        super().__init__(content)
+    This lets us checksum a file while it is being uploaded, rather than reading it
+    a second time. Seeking back to the starting position, like when an HTTP request
+    is retried, restarts the hash. Like aiohttp, we don't want the wrapped file to be
+    closed by the uploader, so ``close`` is a no-op.
+    """
+
+    def __init__(self, raw: BinaryIO):
+        """Wrap an open binary file, starting from its current position."""
+        super().__init__()
+        self._raw = raw
+        self._start = raw.tell() if raw.seekable() else 0
+        self._position = self._start
+        self._hash = md5()  # noqa: S324
+
+    def readable(self) -> bool:
+        """Wrapped file is always readable."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return whether the wrapped file is seekable."""
+        return self._raw.seekable()
+
+    def fileno(self) -> int:
+        """Return file descriptor of wrapped file, so its size can be found."""
+        return self._raw.fileno()
+
+    def tell(self) -> int:
+        """Return current position in the wrapped file."""
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Seek in the wrapped file, restarting the hash at the starting position."""
+        self._position = self._raw.seek(offset, whence)
+        if self._position == self._start:
+            self._hash = md5()  # noqa: S324
+        else:
+            # Hash is only valid if bytes are read sequentially from the start
+            self._hash = None
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        """Read from the wrapped file, adding the bytes to the hash."""
+        data = self._raw.read(size)
+        self._position += len(data)
+        if self._hash is not None:
+            self._hash.update(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        """Read into a buffer, adding the bytes to the hash."""
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    @property
+    def md5(self) -> str | None:
+        """md5 hash of everything read from the starting position, if known."""
+        return self._hash.hexdigest() if self._hash is not None else None
 
     def close(self):
         """Don't close file, so aiohttp can't unexpectedly close files."""
 
-    def actually_close(self):
-        """Actually close the file for internal use."""
-        super().close()
-
 
 class DepositionAction(Enum):
     """Enumerate types of changes which can be applied to deposition files."""
@@ -112,7 +187,80 @@ class DepositionState(BaseModel):
     """
 
 
-class PublishedDeposition(BaseModel, ABC):
+class StreamingFileReader(ABC):
+    """Read files from a deposition without holding the whole file in memory.
+
+    Both published and draft depositions implement ``iter_file``, and get
+    ``get_file_to`` and ``read_range`` built on it.
+    """
+
+    @abstractmethod
+    def iter_file(
+        self,
+        filename: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a file, or a range of bytes from it, from the deposition.
+
+        Only the requested range is read from the depositor, so small parts of large
+        files can be inspected without downloading them.
+
+        Args:
+            filename: Name of file to read.
+            start: Offset of the first byte to read. Negative values count back from
+                the end of the file.
+            end: Offset after the last byte to read, or None to read to the end.
+            chunk_size: Maximum size of each chunk yielded.
+
+        Raises:
+            FileNotFoundError: if the file isn't in the deposition.
+        """
+        ...
+
+    async def read_range(
+        self, filename: str, start: int = 0, end: int | None = None
+    ) -> bytes:
+        """Read a range of bytes from a file in the deposition.
+
+        Args:
+            filename: Name of file to read.
+            start: Offset of the first byte to read. Negative values count back from
+                the end of the file.
+            end: Offset after the last byte to read, or None to read to the end.
+        """
+        return b"".join([chunk async for chunk in self.iter_file(filename, start, end)])
+
+    async def get_file_to(
+        self,
+        filename: str,
+        path: Path,
+        start: int = 0,
+        end: int | None = None,
+    ) -> Path:
+        """Stream a file, or a range of bytes from it, to a local path.
+
+        If the connection fails part way through, the download starts over.
+
+        Args:
+            filename: Name of file to read.
+            path: Local path to write to.
+            start: Offset of the first byte to read. Negative values count back from
+                the end of the file.
+            end: Offset after the last byte to read, or None to read to the end.
+        """
+
+        async def _download():
+            with path.open("wb") as f:
+                async for chunk in self.iter_file(filename, start, end):
+                    await asyncio.to_thread(f.write, chunk)
+
+        await retry_async(_download)
+        return path
+
+
+class PublishedDeposition(BaseModel, StreamingFileReader, ABC):
     """Abstract base class defining the interface for a published deposition.
 
     Published depositions should be read only, and provide the method `open_draft`
@@ -173,7 +321,7 @@ class PublishedDeposition(BaseModel, ABC):
         ...
 
 
-class DraftDeposition(BaseModel, ABC):
+class DraftDeposition(BaseModel, StreamingFileReader, ABC):
     """Abstract base class defining the interface for a draft deposition.
 
     Draft depositions contain both read/write functionality. All write methods
@@ -249,6 +397,9 @@ class DraftDeposition(BaseModel, ABC):
     ) -> DraftDeposition:
         """Create a file in a deposition.
 
+        If a file with the same name already exists in the deposition, it should be
+        replaced, so failed uploads can be retried without deleting them first.
+
         Args:
             target: the filename of the file you want to create.
             data: the actual data associated with the file.
@@ -302,10 +453,23 @@ class DraftDeposition(BaseModel, ABC):
         """Generate new datapackage and return it."""
         ...
 
-    async def add_resource(self, name: str, resource: ResourceInfo) -> DraftDeposition:
-        """Apply correct change to deposition based on downloaded resource."""
+    async def add_resource(
+        self, name: str, resource: ResourceInfo, journal: RunJournal | None = None
+    ) -> DraftDeposition:
+        """Apply correct change to deposition based on downloaded resource.
+
+        Args:
+            name: Filename of the resource in the deposition.
+            resource: Info about the downloaded resource.
+            journal: If passed, record the resource once it's in the deposition.
+        """
         change = self.generate_change(name, resource)
-        return await self._apply_change(change)
+        draft = await self._apply_change(change)
+        if journal is not None:
+            await journal.record_resource(
+                name, resource, draft.get_checksum(name), change.action_type.name
+            )
+        return draft
 
     async def publish_if_valid(
         self,
@@ -347,6 +511,11 @@ class DraftDeposition(BaseModel, ABC):
     ) -> DraftDeposition:
         """Actually upload and delete what we listed in self.uploads/deletes.
 
+        The local checksum is computed from the bytes as they are uploaded, and
+        compared to the checksum reported by the depositor for the uploaded file. If
+        they don't match, the bad upload is deleted and only that file is uploaded
+        again.
+
         Args:
             change: the change to make
             checksum_retry_count: how many times to try an upload again if the
@@ -360,18 +529,19 @@ class DraftDeposition(BaseModel, ABC):
             if change.resource is None:
                 raise RuntimeError("Must pass a resource to be uploaded.")
 
-            checksum = compute_md5(change.resource)
             for chance in range(checksum_retry_count):
-                draft = await self._upload_file(
+                if chance > 0:
+                    # drop the bad upload before retrying, since the Zenodo files
+                    # API won't create a file that already exists
+                    draft = await draft.delete_file(change.name)
+                draft, checksum = await draft._upload_file(
                     _UploadSpec(source=change.resource, dest=change.name)
                 )
-                if draft.get_checksum(change.name) == checksum:
+                if checksum is not None and draft.get_checksum(change.name) == checksum:
                     break
                 logger.warning(
                     f"Upload of {change.name} failed with nonmatching checksum (try {chance + 1} of {checksum_retry_count})"
                 )
-                # drop the bad upload before retrying
-                draft = await self.delete_file(change.name)
             else:  # if we run out of tries
                 raise RuntimeError(
                     f"Upload of {change.name} persistently failing; could not get checksums to match."
@@ -379,17 +549,21 @@ class DraftDeposition(BaseModel, ABC):
 
         return draft
 
-    async def _upload_file(self, upload: _UploadSpec):
+    async def _upload_file(
+        self, upload: _UploadSpec
+    ) -> tuple[DraftDeposition, str | None]:
+        """Upload a file, returning the new draft and the md5 hash of the bytes sent."""
         if isinstance(upload.source, io.IOBase):
-            wrapped_file = FileWrapper(upload.source.read())
+            if upload.source.seekable():
+                upload.source.seek(0)
+            reader = HashingReader(upload.source)
+            draft = await self.create_file(upload.dest, reader)
         else:
             with upload.source.open("rb") as f:
-                wrapped_file = FileWrapper(f.read())
+                reader = HashingReader(f)
+                draft = await self.create_file(upload.dest, reader)
 
-        draft = await self.create_file(upload.dest, wrapped_file)
-
-        wrapped_file.actually_close()
-        return draft
+        return draft, reader.md5
 
     async def attach_datapackage(
         self,
@@ -6,39 +6,65 @@ automatically create a new draft where we can make changes to an archive without
 overwritting the previous version. Only after intentionally publishing the draft do those
 changes actually overwrite the official version of the archive.
 
-To mimic this behavior, the fsspec Depositor will create two subdirectories within the
-configured ``deposition_path``. One of these directories is a workspace where we will store
-new files before publication. The other is the published directory, which represents
-the current version of the archive. At the start of a run, we will find all files that are
-in the published directory and open a new draft deposition that contains these files.
-This is again mimicking zenodo behavior where new drafts default to containing the contents
-of the previous draft. Next, we will start downloading files and adding them to the draft.
-If those files have the same name as an existing file in the draft, we will compare their
-checksums to see if the contents have changed. If the contents have changed, we will add
-the new version to the workspace directory, and mark the previous version for deletion.
-At the end of a run, if the ``publish`` method is called, we will move all of the new files
-from the workspace directory to the published directory and delete any files that were
-marked for deletion (either because the file was modified, or does not exist in the new
-version). If ``publish`` is never called, the state of the published directory will remain
-completely unmodified.
-
-One piece of Zenodo functionality that this Depositor does not implement is versioning. In
-Zenodo, when we publish a new deposition, the old version will still exist with a distinct
-DOI that we can use to point to that version. At this point, the fsspec Depositor will just
-overwrite data in the published directory, so the old version will disappear.
+To mimic this behavior, the fsspec Depositor stores a deposition in three subdirectories
+within the configured ``deposition_path``:
+
+* ``blobs/`` contains the contents of every published file, at
+  ``blobs/<md5 hash>/<filename>``. Blobs are never modified, so a file that doesn't
+  change between versions is only stored once, and keep their original filename so
+  the type of each file can still be told from its path.
+* ``versions/`` contains a small JSON manifest for each published version, which maps
+  the filenames in that version to the hash and size of their blob.
+* ``workspace/`` is where we store new files before publication.
+
+At the start of a run, we will load the manifest for the most recent version and open
+a new draft deposition that contains its files. This is again mimicking zenodo behavior
+where new drafts default to containing the contents of the previous draft. Next, we will
+start downloading files and adding them to the draft. If those files have the same name
+as an existing file in the draft, we will compare their checksums to see if the contents
+have changed. If the contents have changed, we will add the new version to the workspace
+directory. At the end of a run, if the ``publish`` method is called, we will move all of
+the new files from the workspace directory into ``blobs/`` (or just drop them if an
+identical blob already exists) and write a manifest for the new version. If ``publish``
+is never called, the published versions remain completely unmodified.
+
+Because publishing never modifies or deletes a blob, every previous version of the
+deposition remains available through its manifest. Blobs which are no longer referenced
+by any version can be deleted with the ``prune-fsspec-blobs`` command.
+
+Publishing runs moves concurrently. Before touching ``blobs/``, the operations needed to
+publish are written to a small manifest file in the ``deposition_path``. If a publish is
+interrupted, the next run will find this manifest and finish the publish before opening
+a new draft.
+
+Depositions created before versioning was implemented store a single version in a
+``published/`` directory. These are read as version 0.1.0, by hashing their files.
+Opening a deposition never writes to it, so read only commands like ``archive plan``
+work on read only stores. The first time a draft is opened or blobs are pruned, the
+manifest for version 0.1.0 is saved, so later runs don't have to hash the files again.
+The files are moved into the versioned layout the first time a new version is
+published.
 """
 
+import asyncio
 import base64
+import datetime
+import itertools
 import logging
 import traceback
+from collections.abc import AsyncIterator
 from enum import Enum
-from typing import BinaryIO
+from hashlib import md5
+from pathlib import PurePosixPath
+from typing import Any, BinaryIO
 
 import aiohttp
-from pydantic import ConfigDict, Field
+import semantic_version  # type: ignore  # noqa: PGH003
+from pydantic import BaseModel, ConfigDict, Field
 from upath import UPath
 
 from pudl_archiver.depositors.depositor import (
+    STREAM_CHUNK_SIZE,
     DepositionAction,
     DepositionChange,
     DepositionState,
@@ -46,6 +72,11 @@ from pudl_archiver.depositors.depositor import (
     DraftDeposition,
     PublishedDeposition,
     register_depositor,
+    resolve_byte_range,
+)
+from pudl_archiver.depositors.multipart import (
+    get_multipart_upload,
+    upload_multipart,
 )
 from pudl_archiver.frictionless import (
     MEDIA_TYPES,
@@ -59,34 +90,106 @@ from pudl_archiver.utils import RunSettings, compute_md5
 logger = logging.getLogger(f"catalystcoop.{__name__}")
 
 
-def _resource_from_upath(path: UPath, parts: Partitions, md5_hash: str) -> Resource:
+class FileMetadata(BaseModel):
+    """Checksum and size of a single file in an fsspec deposition."""
+
+    md5_hash: str
+    size: int
+
+
+def _resource_from_blob(
+    filename: str, blob_path: UPath, parts: Partitions, metadata: FileMetadata
+) -> Resource:
     """Create a resource from a single file with partitions.
 
     Args:
-        path: UPath pointing to resource on local or remote filesystem.
+        filename: Name of the file in the deposition.
+        blob_path: UPath pointing to the blob containing the file.
         parts: Working partitions of current resource.
-        md5_hash: String md5 hash of resource.
+        metadata: md5 hash and size of resource.
     """
-    mt = MEDIA_TYPES[path.suffix[1:]]
+    suffix = PurePosixPath(filename).suffix
+    mt = MEDIA_TYPES[suffix[1:]]
 
     return Resource(
-        name=path.name,
-        path=path.as_uri().replace("workspace", "published"),
-        remote_url=path.as_uri().replace("workspace", "published"),
-        title=path.name,
+        name=filename,
+        path=blob_path.as_uri(),
+        remote_url=blob_path.as_uri(),
+        title=filename,
         mediatype=mt,
         parts=parts,
-        bytes=path.stat().st_size,
-        hash=md5_hash,
-        format=path.suffix,
+        bytes=metadata.size,
+        hash=metadata.md5_hash,
+        format=suffix,
     )
 
 
+def _find_files(directory_path: UPath) -> list[str]:
+    """List every file under a directory, relative to it, like ``<hash>/file.zip``."""
+    if not directory_path.exists():
+        return []
+    return [
+        str(PurePosixPath(path).relative_to(directory_path.path))
+        for path in directory_path.fs.find(directory_path.path)
+    ]
+
+
+def _md5_from_info(info: dict[str, Any], protocol: str) -> str | None:
+    """Get md5 hash from file info returned by an fsspec filesystem if available.
+
+    Args:
+        info: Dictionary describing a file returned by ``fs.info`` or ``fs.ls``.
+        protocol: Protocol of the filesystem the info came from.
+    """
+    if protocol == "gs" and (md5_hash := info.get("md5Hash")):
+        return base64.urlsafe_b64decode(md5_hash).hex()
+    # S3 ETags are only an md5 hash for files that weren't uploaded in multiple parts
+    if protocol in ("s3", "s3a") and (etag := info.get("ETag", "").strip('"')):
+        return etag if "-" not in etag else None
+    return None
+
+
+#: Name of the file used to record an in progress publish
+PUBLISH_MANIFEST = "publish_manifest.json"
+
+#: Version assigned to depositions created before versioning was implemented
+LEGACY_VERSION = "0.1.0"
+
+#: fsspec protocols for the local filesystem, where moves are cheap renames
+LOCAL_PROTOCOLS = ("", "file", "local")
+
+
+class VersionManifest(BaseModel):
+    """Files included in a single published version of a deposition."""
+
+    version: str
+    created: str
+    files: dict[str, FileMetadata]
+
+
+class PublishManifest(BaseModel):
+    """Record of the operations needed to publish a draft deposition.
+
+    Paths are relative to the ``deposition_path``, like ``workspace/file.zip``.
+    """
+
+    files_to_delete: list[str]
+    #: maps the path of each file to move to its destination blob
+    files_to_move: dict[str, str]
+    #: version manifests to write once all files have been moved
+    versions: list[VersionManifest]
+
+
 class DepositionDirectory(Enum):
-    """Enum representing the state of a deposition, which can be either published or a draft."""
+    """Enum representing the directories that make up a deposition."""
 
+    #: directory containing a deposition created before versioning was implemented
     PUBLISHED = "published"
     WORKSPACE = "workspace"
+    BLOBS = "blobs"
+    VERSIONS = "versions"
+    #: temporary parts of files being uploaded by a multipart upload
+    PARTS = "parts"
 
 
 class Deposition(DepositionState):
@@ -95,14 +198,55 @@ class Deposition(DepositionState):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     deposition_path: UPath
-    #: static list of files from deposition prior to any modifications
-    deposition_files: dict[DepositionDirectory, list[str]]
-    version: str = "0.1"
+    #: files in the workspace and legacy published directories, listed when the
+    #: deposition is opened and updated in memory as files are written to it
+    deposition_files: dict[DepositionDirectory, set[str]]
+    #: manifest for the most recent published version, if there is one
+    published_version: VersionManifest | None = None
 
     def get_deposition_path(self, deposition_directory: DepositionDirectory) -> UPath:
-        """Return path to workspace or published version of deposition."""
+        """Return path to a directory in the deposition."""
         return self.deposition_path / deposition_directory.value
 
+    def get_blob_path(self, md5_hash: str, filename: str) -> UPath:
+        """Return path to the blob containing ``filename`` with hash ``md5_hash``."""
+        return self.get_deposition_path(DepositionDirectory.BLOBS) / md5_hash / filename
+
+    def get_published_path(self, filename: str) -> UPath:
+        """Return path to a file in the most recent published version."""
+        if self.is_legacy:
+            return self.get_deposition_path(DepositionDirectory.PUBLISHED) / filename
+        return self.get_blob_path(
+            self.published_version.files[filename].md5_hash, filename
+        )
+
+    @property
+    def is_legacy(self) -> bool:
+        """Whether the deposition predates versioning and is stored in ``published/``."""
+        return bool(self.deposition_files[DepositionDirectory.PUBLISHED]) and (
+            self.published_version is not None
+            and self.published_version.version == LEGACY_VERSION
+        )
+
+    def get_next_version(self) -> str:
+        """Return the version number that will be used for the next published version."""
+        if self.published_version is None:
+            return "1.0.0"
+        return str(
+            semantic_version.Version(self.published_version.version).next_major()
+        )
+
+    def list_directory(self, deposition_directory: DepositionDirectory) -> list[str]:
+        """List names of all files in a deposition directory."""
+        directory_path = self.get_deposition_path(deposition_directory)
+        if not directory_path.exists():
+            return []
+        return [
+            str(child.name)
+            for child in directory_path.iterdir()
+            if child.name != directory_path.name
+        ]
+
     def get_checksum(self, filepath: UPath) -> str | None:
         """Get checksum for a file in the current deposition.
 
@@ -114,84 +258,362 @@ class Deposition(DepositionState):
             # For Google Cloud fsspec backend we can use the `info` method to get
             # The md5 hash without having to read the entire file we just uploaded
             if filepath.protocol == "gs":
-                md5_hash = base64.urlsafe_b64decode(
-                    filepath.fs.info(filepath.as_uri(), detail=True)["md5Hash"]
-                ).hex()
+                md5_hash = _md5_from_info(
+                    filepath.fs.info(filepath.as_uri(), detail=True), "gs"
+                )
             # Not all filesystems return an md5 hash from `info` method, so default
             # to manual computation
             else:
                 md5_hash = compute_md5(filepath)
         return md5_hash
 
+    def get_file_metadata(
+        self, deposition_directory: DepositionDirectory
+    ) -> dict[str, FileMetadata]:
+        """Get checksums and sizes for all files in a deposition directory.
+
+        This uses a single detailed listing of the directory, rather than one
+        request per file. Files whose hash isn't reported by the filesystem are
+        read and hashed locally.
+
+        Args:
+            deposition_directory: Directory to get file metadata for.
+        """
+        directory_path = self.get_deposition_path(deposition_directory)
+        if not self.deposition_files[deposition_directory]:
+            return {}
+
+        file_metadata = {}
+        for info in directory_path.fs.ls(directory_path.path, detail=True):
+            if info["type"] != "file":
+                continue
+            filepath = directory_path / info["name"].rstrip("/").split("/")[-1]
+            if not (md5_hash := _md5_from_info(info, directory_path.protocol)):
+                md5_hash = compute_md5(filepath)
+            file_metadata[filepath.name] = FileMetadata(
+                md5_hash=md5_hash, size=info["size"]
+            )
+        return file_metadata
+
+    def add_file(
+        self, deposition_directory: DepositionDirectory, filename: str
+    ) -> Deposition:
+        """Record that ``filename`` has been written to a directory.
+
+        This updates the file listing in memory, so we don't have to list the
+        deposition directories again after each write, which is expensive on
+        remote filesystems. The listing is a set updated in place rather than
+        copied, so recording a file takes the same time however many files the
+        deposition already has. Files are only ever added to a listing, so copies
+        of the deposition sharing it stay correct.
+
+        Args:
+            deposition_directory: Directory the file was written to.
+            filename: Name of the new file.
+        """
+        self.deposition_files[deposition_directory].add(filename)
+        return self
+
+    def get_versions(self) -> list[VersionManifest]:
+        """Read the manifests for all published versions, sorted by version."""
+        versions_path = self.get_deposition_path(DepositionDirectory.VERSIONS)
+        manifests = [
+            VersionManifest.model_validate_json((versions_path / filename).read_text())
+            for filename in self.list_directory(DepositionDirectory.VERSIONS)
+        ]
+        return sorted(
+            manifests, key=lambda manifest: semantic_version.Version(manifest.version)
+        )
+
     @classmethod
     def from_upath(cls, deposition_path: UPath):
         """Construct deposition object from fsspec path to deposition."""
+        deposition = cls(
+            deposition_path=deposition_path.absolute(),
+            deposition_files={
+                DepositionDirectory.PUBLISHED: set(),
+                DepositionDirectory.WORKSPACE: set(),
+            },
+        )
+
+        # Find existing files in the workspace and legacy published directories
         deposition_files = {
-            DepositionDirectory.PUBLISHED: [],
-            DepositionDirectory.WORKSPACE: [],
+            deposition_directory: set(deposition.list_directory(deposition_directory))
+            for deposition_directory in deposition.deposition_files
         }
+        deposition = deposition.model_copy(
+            update={"deposition_files": deposition_files}
+        )
 
-        # Loop published/draft deposition and find existing files
-        for deposition_directory in DepositionDirectory:
-            if (deposition_path / deposition_directory.value).exists():
-                deposition_files[deposition_directory] = [
-                    str(child.name)
-                    for child in (
-                        deposition_path / deposition_directory.value
-                    ).iterdir()
-                    if child.name != (deposition_path / deposition_directory.value).name
-                ]
-        # Return constructed deposition
-        return cls(
-            deposition_path=deposition_path.absolute(),
-            deposition_files=deposition_files,
+        # Find most recent version of the deposition
+        published_version = None
+        versions_path = deposition.get_deposition_path(DepositionDirectory.VERSIONS)
+        if version_files := deposition.list_directory(DepositionDirectory.VERSIONS):
+            latest = max(
+                version_files,
+                key=lambda filename: semantic_version.Version(
+                    PurePosixPath(filename).stem
+                ),
+            )
+            published_version = VersionManifest.model_validate_json(
+                (versions_path / latest).read_text()
+            )
+        elif deposition_files[DepositionDirectory.PUBLISHED]:
+            # Hashing every file in a legacy deposition is slow, so the manifest is
+            # saved for later runs by ``save_legacy_manifest``
+            published_version = VersionManifest(
+                version=LEGACY_VERSION,
+                created="",
+                files=deposition.get_file_metadata(DepositionDirectory.PUBLISHED),
+            )
+        return deposition.model_copy(update={"published_version": published_version})
+
+    def save_legacy_manifest(self):
+        """Save the manifest of a legacy deposition, if it hasn't been saved yet.
+
+        ``from_upath`` never writes to the deposition, so this is called when
+        starting something that modifies it anyway, like opening a draft.
+        """
+        if not self.is_legacy:
+            return
+        manifest_path = (
+            self.get_deposition_path(DepositionDirectory.VERSIONS)
+            / f"{LEGACY_VERSION}.json"
         )
+        if manifest_path.exists():
+            return
+        logger.info(f"Saving manifest for legacy deposition {self.deposition_path}.")
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(self.published_version.model_dump_json(indent=2))
 
 
 class FsspecAPIClient(DepositorAPIClient):
     """Implement API for fsspec based depositors."""
 
     path: str
+    publish_concurrency: int = 16
+    multipart_part_size: int = 64 * 2**20
+    multipart_concurrency: int = 4
 
     @classmethod
     async def initialize_client(
         cls,
         session: aiohttp.ClientSession,
         deposition_path: str,
+        publish_concurrency: int = 16,
+        multipart_part_size: int = 64 * 2**20,
+        multipart_concurrency: int = 4,
     ) -> FsspecAPIClient:
-        """Return initialized fsspec api client."""
+        """Return initialized fsspec api client.
+
+        Args:
+            session: HTTP handler - not used by the fsspec depositor.
+            deposition_path: fsspec compatible path to deposition.
+            publish_concurrency: Maximum number of files to move or copy at once
+                while publishing.
+            multipart_part_size: Size in bytes of each part of a multipart upload.
+                Files larger than this are uploaded to S3 and GCS in parts. S3
+                requires parts of at least 5 MiB.
+            multipart_concurrency: Maximum number of parts of a single file to
+                upload at once.
+        """
         logger.warning(
             "The fsspec depositor backend is in an early/experimental state. "
-            "It currently does not support versioning so any existing archive will be overwritten "
-            "after publishing. Please use with caution."
+            "Please use with caution."
+        )
+        return cls(
+            path=deposition_path,
+            publish_concurrency=publish_concurrency,
+            multipart_part_size=multipart_part_size,
+            multipart_concurrency=multipart_concurrency,
         )
-        return cls(path=deposition_path)
 
     async def get_deposition(self, dataset_id: str):
         """Get latest version of deposition associated with dataset_id."""
-        return Deposition.from_upath(
-            deposition_path=UPath(self.path),
-        )
+        deposition_path = UPath(self.path)
+        await self.resume_publish(deposition_path)
+        return Deposition.from_upath(deposition_path=deposition_path)
 
     async def create_new_deposition(self, dataset_id: str):
         """Prepare new deposition associated with dataset_id."""
         deposition_path = UPath(self.path)
         deposition_path.mkdir(parents=True, exist_ok=True)
+        await self.resume_publish(deposition_path)
 
         return Deposition.from_upath(deposition_path=deposition_path)
 
-    def get_file(
-        self,
-        deposition: Deposition,
-        filename: str,
-        deposition_directory: DepositionDirectory,
-    ) -> bytes:
+    async def resume_publish(self, deposition_path: UPath):
+        """Finish a publish that was interrupted, if there is one.
+
+        Args:
+            deposition_path: Path to deposition that might have a publish manifest.
+        """
+        manifest_path = deposition_path / PUBLISH_MANIFEST
+        if not manifest_path.exists():
+            return
+        logger.warning(
+            f"Found incomplete publish of {deposition_path}, finishing it before "
+            "opening a new draft."
+        )
+        await self.publish(
+            deposition_path,
+            PublishManifest.model_validate_json(manifest_path.read_text()),
+        )
+
+    async def publish(self, deposition_path: UPath, manifest: PublishManifest):
+        """Apply the deletions, moves and version manifests in a publish manifest.
+
+        The publish manifest is written before any changes are made and removed once
+        all of them are done. Moving a file to a blob that already exists just deletes
+        the file, since blobs are named by their contents. The version manifests are
+        written last, so a version is never published with missing blobs. Every step
+        can safely be repeated, so an interrupted publish can be resumed from the
+        publish manifest.
+
+        Args:
+            deposition_path: Path to deposition.
+            manifest: Files to delete, files to move to blobs, and new versions.
+        """
+        manifest_path = deposition_path / PUBLISH_MANIFEST
+        manifest_path.write_text(manifest.model_dump_json())
+        fs = deposition_path.fs
+        blobs_path = deposition_path / DepositionDirectory.BLOBS.value
+        blobs_path.mkdir(parents=True, exist_ok=True)
+
+        # List each directory once, rather than checking whether each file exists
+        existing_files = {
+            f"{directory.value}/{filename}"
+            for directory in DepositionDirectory
+            for filename in _find_files(deposition_path / directory.value)
+        }
+
+        # Moves need to be done one file at a time, so run them concurrently. Only
+        # move one file to each blob, any others with the same contents are deleted.
+        moves = {}
+        files_to_delete = list(manifest.files_to_delete)
+        for src, dst in manifest.files_to_move.items():
+            if dst in existing_files or dst in moves.values():
+                files_to_delete.append(src)
+            else:
+                moves[src] = dst
+
+        # Locally a move is just a rename, but remote object stores implement move as
+        # a copy then delete, so copy server side and delete all sources in one batch
+        is_local = deposition_path.protocol in LOCAL_PROTOCOLS
+        move_func = fs.mv if is_local else fs.copy
+        semaphore = asyncio.Semaphore(self.publish_concurrency)
+
+        async def _move(src: str, dst: str):
+            async with semaphore:
+                # Object stores don't have directories, but local filesystems need
+                # the directory for the blob's hash to exist first
+                if is_local:
+                    (deposition_path / dst).parent.mkdir(parents=True, exist_ok=True)
+                await asyncio.to_thread(
+                    move_func,
+                    (deposition_path / src).path,
+                    (deposition_path / dst).path,
+                )
+
+        moves = {src: dst for src, dst in moves.items() if src in existing_files}
+        await asyncio.gather(*(_move(src, dst) for src, dst in moves.items()))
+        if move_func == fs.copy:
+            files_to_delete += list(moves)
+
+        # Delete everything in one batch, which remote filesystems can do in bulk
+        if files_to_delete := [
+            (deposition_path / path).path
+            for path in files_to_delete
+            if path in existing_files
+        ]:
+            await asyncio.to_thread(fs.rm, files_to_delete)
+
+        versions_path = deposition_path / DepositionDirectory.VERSIONS.value
+        versions_path.mkdir(parents=True, exist_ok=True)
+        for version in manifest.versions:
+            (versions_path / f"{version.version}.json").write_text(
+                version.model_dump_json(indent=2)
+            )
+
+        manifest_path.unlink()
+
+    def prune_blobs(self, dry_run: bool = False) -> list[str]:
+        """Delete blobs that aren't referenced by any published version.
+
+        Args:
+            dry_run: If True, only return the unreferenced blobs without deleting them.
+
+        Returns:
+            Paths of the unreferenced blobs, like ``<md5 hash>/<filename>``.
+        """
+        deposition_path = UPath(self.path)
+        if (deposition_path / PUBLISH_MANIFEST).exists():
+            raise RuntimeError(
+                f"Found incomplete publish of {deposition_path}. Finish publishing "
+                "by starting a new run before pruning blobs."
+            )
+        deposition = Deposition.from_upath(deposition_path)
+        if not dry_run:
+            deposition.save_legacy_manifest()
+        referenced_blobs = {
+            f"{metadata.md5_hash}/{filename}"
+            for version in deposition.get_versions()
+            for filename, metadata in version.files.items()
+        }
+        blobs_path = deposition.get_deposition_path(DepositionDirectory.BLOBS)
+        unreferenced_blobs = sorted(set(_find_files(blobs_path)) - referenced_blobs)
+        if unreferenced_blobs and not dry_run:
+            deposition_path.fs.rm(
+                [(blobs_path / blob).path for blob in unreferenced_blobs]
+            )
+            # Local filesystems keep the directories for each hash once they're empty
+            if deposition_path.protocol in LOCAL_PROTOCOLS:
+                for hash_path in {
+                    (blobs_path / blob).parent for blob in unreferenced_blobs
+                }:
+                    if not any(hash_path.iterdir()):
+                        hash_path.rmdir()
+        return unreferenced_blobs
+
+    def get_file(self, path: UPath) -> bytes:
         """Download file from deposition."""
-        with (deposition.get_deposition_path(deposition_directory) / filename).open(
-            "rb"
-        ) as f:
+        with path.open("rb") as f:
             return f.read()
 
+    async def iter_file(
+        self,
+        path: UPath,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a range of bytes from a file in the deposition.
+
+        Reads run in a thread, and only the requested range is read, so remote file
+        systems can serve it with range requests.
+
+        Args:
+            path: Path to the file.
+            start: Offset of the first byte to read. Negative values count back from
+                the end of the file.
+            end: Offset after the last byte to read, or None to read to the end.
+            chunk_size: Maximum size of each chunk yielded.
+        """
+        f = await asyncio.to_thread(path.open, "rb")
+        try:
+            size = await asyncio.to_thread(f.seek, 0, 2)
+            start, end = resolve_byte_range(start, end, size)
+            await asyncio.to_thread(f.seek, start)
+            position = start
+            while position < end:
+                chunk = await asyncio.to_thread(f.read, min(chunk_size, end - position))
+                if not chunk:
+                    break
+                position += len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
 
 class FsspecPublishedDeposition(PublishedDeposition):
     """Represents published version of fsspec deposition."""
@@ -205,7 +627,9 @@ class FsspecPublishedDeposition(PublishedDeposition):
 
     async def list_files(self):
         """List files."""
-        return self.deposition.deposition_files[DepositionDirectory.PUBLISHED]
+        if self.deposition.published_version is None:
+            return []
+        return list(self.deposition.published_version.files)
 
     def get_deposition_link(self) -> str:
         """Return link to deposition."""
@@ -213,14 +637,29 @@ class FsspecPublishedDeposition(PublishedDeposition):
 
     async def get_file(self, filename: str) -> bytes:
         """Download file from deposition."""
-        return self.api_client.get_file(
-            self.deposition,
-            filename,
-            deposition_directory=DepositionDirectory.PUBLISHED,
-        )
+        return self.api_client.get_file(self.deposition.get_published_path(filename))
+
+    async def iter_file(
+        self,
+        filename: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a file, or a range of bytes from it, from the deposition."""
+        if (
+            self.deposition.published_version is None
+            or filename not in self.deposition.published_version.files
+        ):
+            raise FileNotFoundError(f"{filename} has not been published.")
+        async for chunk in self.api_client.iter_file(
+            self.deposition.get_published_path(filename), start, end, chunk_size
+        ):
+            yield chunk
 
     async def open_draft(self) -> FsspecDraftDeposition:
         """Open a new draft to make edits."""
+        await asyncio.to_thread(self.deposition.save_legacy_manifest)
         return FsspecDraftDeposition(
             deposition=self.deposition,
             settings=self.settings,
@@ -236,14 +675,14 @@ class FsspecDraftDeposition(DraftDeposition):
     This field is a dictionary that maps filenames to a ``UPath`` that points to the actual
     file in the deposition. If we are creating a new version of an existing archive,
     we will populate this with the existing resources from the previous version. In
-    this case, the paths will all point to the files in the 'published' directory.
-    As we add new files, the paths will point to the 'draft' directory. If we update
-    an existing file, we will remove the 'published' path from ``resources_in_draft``
-    and replace it with a path pointing to the updated file in the 'draft' directory.
-    When this happens, we will also add the 'published' version of the file to the
-    ``files_to_delete`` field. This allows us to avoid actually deleting the files
-    until a run is complete and we call the ``publish`` method. If a run fails, all
-    of the original files will remain in the 'published' directory.
+    this case, the paths will all point to blobs in the 'blobs' directory. As we add
+    new files, the paths will point to the 'workspace' directory. If we update an
+    existing file, we will replace the path to its old blob in ``resources_in_draft``
+    with a path pointing to the updated file in the 'workspace' directory. Deleted files
+    are removed from ``resources_in_draft`` and recorded in ``files_to_delete``. Nothing
+    is moved into the 'blobs' directory until a run is complete and we call the
+    ``publish`` method, and blobs are never overwritten, so if a run fails all of the
+    previous versions remain intact.
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -254,25 +693,38 @@ class FsspecDraftDeposition(DraftDeposition):
     dataset_id: str
     resources_in_draft: dict[str, UPath] = Field(default_factory=dict)
     files_to_delete: dict[str, UPath] = Field(default_factory=dict)
+    #: checksums and sizes of files in the draft, from the manifest of the previous
+    #: version or recorded as new files are written
+    file_metadata: dict[str, FileMetadata] = Field(default_factory=dict)
 
     def model_post_init(self, _context):
         """Find existing files in deposition after initialization."""
         # Draft starts with all files in previous published deposition
+        published_files = {}
+        if self.deposition.published_version is not None:
+            published_files = self.deposition.published_version.files
         draft_files = {
-            fname: self.deposition.get_deposition_path(DepositionDirectory.PUBLISHED)
-            / fname
-            for fname in self.deposition.deposition_files[DepositionDirectory.PUBLISHED]
+            fname: self.deposition.get_published_path(fname)
+            for fname in published_files
         }
 
         # If we are retrying a previous run there may already be files in the workspace directory
         # Add these to the draft as well as files in the current published archive
         # TODO: Check if we're doing a retry as we don't expect files here unless we're doing a retry
+        workspace_files = self.deposition.deposition_files[
+            DepositionDirectory.WORKSPACE
+        ]
         draft_files |= {
             fname: self.deposition.get_deposition_path(DepositionDirectory.WORKSPACE)
             / fname
-            for fname in self.deposition.deposition_files[DepositionDirectory.WORKSPACE]
+            for fname in sorted(workspace_files)
         }
         self.resources_in_draft = draft_files
+        self.file_metadata = {
+            fname: metadata
+            for fname, metadata in published_files.items()
+            if fname not in workspace_files
+        } | self.file_metadata
 
     async def list_files(self):
         """Return files that are included in the current version of the draft."""
@@ -282,30 +734,98 @@ class FsspecDraftDeposition(DraftDeposition):
         """Return link to deposition."""
         return self.deposition.deposition_path.as_uri()
 
+    def _get_all_file_metadata(self) -> dict[str, FileMetadata]:
+        """Get checksums and sizes for all files in the draft.
+
+        Use metadata from the previous version or recorded while writing files where
+        possible, and get the rest with at most one listing per deposition directory.
+        """
+        directory_metadata = {}
+
+        def _get_metadata(fname: str, path: UPath) -> FileMetadata:
+            if metadata := self.file_metadata.get(fname):
+                return metadata
+            deposition_directory = DepositionDirectory(path.parent.name)
+            if deposition_directory not in directory_metadata:
+                directory_metadata[deposition_directory] = (
+                    self.deposition.get_file_metadata(deposition_directory)
+                )
+            return directory_metadata[deposition_directory][fname]
+
+        return {
+            fname: _get_metadata(fname, path)
+            for fname, path in self.resources_in_draft.items()
+        }
+
+    def _relative_path(self, path: UPath) -> str:
+        """Return path relative to the deposition path, like ``workspace/file.zip``."""
+        return str(
+            PurePosixPath(path.path).relative_to(self.deposition.deposition_path.path)
+        )
+
     async def publish(self) -> FsspecPublishedDeposition:
         """Publish deposition."""
-        # Delete files no longer included in published deposition
-        self.deposition.get_deposition_path(DepositionDirectory.PUBLISHED).mkdir(
-            exist_ok=True
-        )
-        for path in self.files_to_delete.values():
-            path.unlink()
-
-        # Move files from draft to published deposition
-        for filename in self.deposition.deposition_files[DepositionDirectory.WORKSPACE]:
-            (
-                self.deposition.get_deposition_path(DepositionDirectory.WORKSPACE)
-                / filename
-            ).rename(
-                self.deposition.get_deposition_path(DepositionDirectory.PUBLISHED)
-                / filename
+        deposition = self.deposition
+        file_metadata = self._get_all_file_metadata()
+
+        # Move all new files in the draft into blobs
+        files_to_move = {
+            self._relative_path(path): self._relative_path(
+                deposition.get_blob_path(file_metadata[fname].md5_hash, fname)
+            )
+            for fname, path in self.resources_in_draft.items()
+            if not self._relative_path(path).startswith(
+                f"{DepositionDirectory.BLOBS.value}/"
             )
+        }
+        new_version = VersionManifest(
+            version=deposition.get_next_version(),
+            created=datetime.datetime.now(tz=datetime.UTC).isoformat(),
+            files=file_metadata,
+        )
+        versions = [new_version]
+
+        # The first time we publish a legacy deposition, move it into the versioned
+        # layout too so it stays available as an old version
+        if deposition.is_legacy:
+            legacy_version = deposition.published_version
+            files_to_move |= {
+                f"{DepositionDirectory.PUBLISHED.value}/{fname}": self._relative_path(
+                    deposition.get_blob_path(metadata.md5_hash, fname)
+                )
+                for fname, metadata in legacy_version.files.items()
+            }
+            versions = [legacy_version, new_version]
+
+        # Do a full listing of the workspace before publishing, so we clean up any
+        # files that were written to it but aren't part of the draft
+        files_to_delete = [
+            f"{DepositionDirectory.WORKSPACE.value}/{filename}"
+            for filename in deposition.list_directory(DepositionDirectory.WORKSPACE)
+            if f"{DepositionDirectory.WORKSPACE.value}/{filename}" not in files_to_move
+        ]
+        await self.api_client.publish(
+            deposition.deposition_path,
+            PublishManifest(
+                files_to_delete=files_to_delete,
+                files_to_move=files_to_move,
+                versions=versions,
+            ),
+        )
 
         return FsspecPublishedDeposition(
             dataset_id=self.dataset_id,
             api_client=self.api_client,
             settings=self.settings.model_copy(update={"initialize": False}),
-            deposition=Deposition.from_upath(self.deposition.deposition_path),
+            deposition=deposition.model_copy(
+                update={
+                    "deposition_files": {
+                        DepositionDirectory.PUBLISHED: set(),
+                        DepositionDirectory.WORKSPACE: set(),
+                    },
+                    "published_version": new_version,
+                }
+            ),
         )
 
     def get_checksum(self, filename: str) -> str | None:
@@ -315,7 +835,9 @@ class FsspecDraftDeposition(DraftDeposition):
             filename: Name of file to checksum.
         """
         checksum = None
-        if filepath := self.resources_in_draft.get(filename):
+        if metadata := self.file_metadata.get(filename):
+            checksum = metadata.md5_hash
+        elif filepath := self.resources_in_draft.get(filename):
             checksum = self.deposition.get_checksum(filepath)
         return checksum
 
@@ -324,22 +846,84 @@ class FsspecDraftDeposition(DraftDeposition):
         filename: str,
         data: BinaryIO,
     ) -> FsspecDraftDeposition:
-        """Create a file in a deposition."""
-        self.deposition.get_deposition_path(DepositionDirectory.WORKSPACE).mkdir(
-            exist_ok=True
-        )
+        """Create a file in a deposition.
+
+        The checksum recorded for the file is the one reported by the filesystem for
+        the written file where there is one (GCS, and S3 files uploaded in a single
+        part), so corrupted uploads are caught when checksums are compared. Other
+        filesystems don't report a hash, and reading the file back to check it would
+        double the I/O of every upload, so they record the hash of the bytes sent
+        and uploads to them aren't verified.
+        """
+        workspace_files = self.deposition.deposition_files[
+            DepositionDirectory.WORKSPACE
+        ]
+        # Only need to create the workspace before the first file is written to it
+        if not workspace_files:
+            self.deposition.get_deposition_path(DepositionDirectory.WORKSPACE).mkdir(
+                parents=True, exist_ok=True
+            )
         new_file_path = (
             self.deposition.get_deposition_path(DepositionDirectory.WORKSPACE)
             / filename
         )
-        with new_file_path.open(mode="wb") as f:
-            f.write(data.read())
+        # Hash file while writing so we don't need to read it back later
+        hash_md5 = md5()  # noqa: S324
+        size = 0
+
+        def _read_chunks(chunk_size: int):
+            nonlocal size
+            for chunk in iter(lambda: data.read(chunk_size), b""):
+                hash_md5.update(chunk)
+                size += len(chunk)
+                yield chunk
+
+        # Upload files larger than a single part in parts, to filesystems that can
+        # combine them server side
+        part_size = self.api_client.multipart_part_size
+        chunks = _read_chunks(part_size)
+        first_chunk = next(chunks, b"")
+        upload = None
+        if len(first_chunk) == part_size:
+            upload = get_multipart_upload(
+                new_file_path,
+                parts_path=self.deposition.get_deposition_path(
+                    DepositionDirectory.PARTS
+                )
+                / filename,
+            )
+        if upload is None:
+            with new_file_path.open(mode="wb") as f:
+                f.write(first_chunk)
+                for chunk in chunks:
+                    f.write(chunk)
+        else:
+            await upload_multipart(
+                upload,
+                itertools.chain([first_chunk], chunks),
+                concurrency=self.api_client.multipart_concurrency,
+            )
+
+        md5_hash = hash_md5.hexdigest()
+        if new_file_path.protocol not in LOCAL_PROTOCOLS:
+            info = await asyncio.to_thread(new_file_path.fs.info, new_file_path.path)
+            md5_hash = _md5_from_info(info, new_file_path.protocol) or md5_hash
 
         return self.model_copy(
             update={
-                "deposition": Deposition.from_upath(self.deposition.deposition_path),
+                "deposition": self.deposition.add_file(
+                    DepositionDirectory.WORKSPACE, filename
+                ),
                 "resources_in_draft": self.resources_in_draft
                 | {filename: new_file_path},
+                "file_metadata": self.file_metadata
+                | {filename: FileMetadata(md5_hash=md5_hash, size=size)},
+                # Updates delete the old file first, but the new file is kept
+                "files_to_delete": {
+                    key: value
+                    for key, value in self.files_to_delete.items()
+                    if key != filename
+                },
             }
         )
 
@@ -354,16 +938,30 @@ class FsspecDraftDeposition(DraftDeposition):
                     for key, value in self.resources_in_draft.items()
                     if key != filename
                 },
+                "file_metadata": {
+                    key: value
+                    for key, value in self.file_metadata.items()
+                    if key != filename
+                },
             }
         )
 
     async def get_file(self, filename: str) -> bytes:
         """Download file from deposition."""
-        return self.api_client.get_file(
-            self.deposition,
-            filename,
-            deposition_directory=DepositionDirectory.WORKSPACE,
-        )
+        return self.api_client.get_file(self.resources_in_draft[filename])
+
+    async def iter_file(
+        self,
+        filename: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a file, or a range of bytes from it, from the draft."""
+        if (path := self.resources_in_draft.get(filename)) is None:
+            raise FileNotFoundError(f"{filename} is not in the draft.")
+        async for chunk in self.api_client.iter_file(path, start, end, chunk_size):
+            yield chunk
 
     async def cleanup_after_error(self, e: Exception):
         """Cleanup draft after an error during an archive run."""
@@ -372,22 +970,24 @@ class FsspecDraftDeposition(DraftDeposition):
         )
 
     async def delete_deposition(self) -> None:
-        """Delete an un-submitted deposition."""
-        raise NotImplementedError(
-            "Versioning is not yet implemented for fsspec backend, so deleting a draft deposition is not possible."
+        """Delete an un-submitted deposition.
+
+        Published versions are never modified by a draft, so this only has to delete
+        the files in the workspace.
+        """
+        workspace_path = self.deposition.get_deposition_path(
+            DepositionDirectory.WORKSPACE
         )
+        if workspace_path.exists():
+            workspace_path.fs.rm(workspace_path.path, recursive=True)
 
     def generate_change(
         self, filename: str, resource: ResourceInfo
     ) -> DepositionChange:
         """Check whether file exists in most recent published version and should be deleted."""
-        remote_path = (
-            self.deposition.get_deposition_path(DepositionDirectory.PUBLISHED)
-            / filename
-        )
-
-        if remote_path.exists():
-            remote_md5 = self.deposition.get_checksum(remote_path)
+        published_version = self.deposition.published_version
+        if published_version is not None and filename in published_version.files:
+            remote_md5 = published_version.files[filename].md5_hash
             local_md5 = compute_md5(resource.local_path)
             if remote_md5 != local_md5:
                 logger.info(
@@ -417,20 +1017,23 @@ class FsspecDraftDeposition(DraftDeposition):
         """Generate new datapackage, attach to deposition, and return."""
         logger.info(f"Creating new datapackage.json for {self.dataset_id}")
 
-        # Create updated datapackage
+        file_metadata = self._get_all_file_metadata()
+
+        # Create updated datapackage, pointing at the blobs files will be published to
         resources = [
-            _resource_from_upath(
-                path,
+            _resource_from_blob(
+                fname,
+                self.deposition.get_blob_path(metadata.md5_hash, fname),
                 partitions_in_deposition[fname],
-                self.deposition.get_checksum(path),
+                metadata,
             )
-            for fname, path in self.resources_in_draft.items()
+            for fname, metadata in file_metadata.items()
             if fname != "datapackage.json" and fname not in self.files_to_delete
         ]
         datapackage = DataPackage.new_datapackage(
             self.dataset_id,
             resources,
-            self.deposition.version,
+            self.deposition.get_next_version(),
         )
 
         return datapackage
@@ -0,0 +1,238 @@
+"""Chunked, concurrent uploads of large files to fsspec compatible object stores.
+
+Writing a file through a single ``open("wb")`` stream uploads it sequentially, which is
+slow for multi-GB files on remote object stores. Instead, files are split into parts
+that are uploaded concurrently and retried individually, then combined into the final
+file once every part has been uploaded.
+
+S3 supports this natively with multipart uploads. On GCS each part is uploaded as a
+temporary object, and they're combined using the server side ``compose`` API. Other
+filesystems have no way to combine parts without reading them back and writing them
+again, which would double the I/O and storage needed for the largest files, so files
+are written to them through a single stream instead.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+
+import aiohttp
+from pydantic import BaseModel, ConfigDict, Field
+from upath import UPath
+
+from pudl_archiver.utils import retry_async
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+#: fsspec protocols for filesystems that combine objects server side with ``merge``
+COMPOSE_PROTOCOLS = ("gs", "gcs")
+
+#: Maximum number of objects that can be combined in a single GCS compose request
+GCS_MAX_COMPOSE = 32
+
+#: Number of times to try uploading each part
+PART_RETRY_COUNT = 5
+
+#: Seconds to wait before retrying a part for the first time
+PART_RETRY_BASE_S = 2
+
+
+class MultipartUpload(BaseModel, ABC):
+    """Upload a single file to an fsspec filesystem in multiple parts."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    path: UPath
+
+    @abstractmethod
+    async def start(self):
+        """Prepare to upload parts."""
+        ...
+
+    @abstractmethod
+    async def upload_part(self, part_number: int, data: bytes):
+        """Upload a single part of the file.
+
+        Args:
+            part_number: 1 indexed position of the part in the file.
+            data: Contents of the part.
+        """
+        ...
+
+    @abstractmethod
+    async def complete(self):
+        """Combine all uploaded parts into the final file."""
+        ...
+
+    @abstractmethod
+    async def abort(self):
+        """Clean up any uploaded parts after a failed upload."""
+        ...
+
+
+class S3MultipartUpload(MultipartUpload):
+    """Use the native S3 multipart upload API.
+
+    All parts except the last must be at least 5 MiB.
+    """
+
+    upload_id: str | None = None
+    etags: dict[int, str] = Field(default_factory=dict)
+
+    def _call_s3(self, method: str, **kwargs):
+        bucket, key, _ = self.path.fs.split_path(self.path.path)
+        return asyncio.to_thread(
+            self.path.fs.call_s3, method, Bucket=bucket, Key=key, **kwargs
+        )
+
+    async def start(self):
+        """Create a new multipart upload."""
+        response = await self._call_s3("create_multipart_upload")
+        self.upload_id = response["UploadId"]
+
+    async def upload_part(self, part_number: int, data: bytes):
+        """Upload a single part of the file."""
+        response = await self._call_s3(
+            "upload_part", PartNumber=part_number, UploadId=self.upload_id, Body=data
+        )
+        self.etags[part_number] = response["ETag"]
+
+    async def complete(self):
+        """Complete the multipart upload."""
+        await self._call_s3(
+            "complete_multipart_upload",
+            UploadId=self.upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": part_number, "ETag": self.etags[part_number]}
+                    for part_number in sorted(self.etags)
+                ]
+            },
+        )
+
+    async def abort(self):
+        """Abort the multipart upload so S3 deletes any uploaded parts."""
+        if self.upload_id is not None:
+            await self._call_s3("abort_multipart_upload", UploadId=self.upload_id)
+
+
+class ComposeMultipartUpload(MultipartUpload):
+    """Upload parts as temporary objects and compose them once they're all uploaded."""
+
+    #: directory to store temporary parts in
+    parts_path: UPath
+    part_numbers: set[int] = Field(default_factory=set)
+
+    def _part_path(self, part_number: int) -> UPath:
+        return self.parts_path / f"{part_number:05d}"
+
+    async def start(self):
+        """Create directory for parts."""
+        await asyncio.to_thread(self.parts_path.mkdir, parents=True, exist_ok=True)
+
+    async def upload_part(self, part_number: int, data: bytes):
+        """Upload a single part as a temporary file."""
+        await asyncio.to_thread(self._part_path(part_number).write_bytes, data)
+        self.part_numbers.add(part_number)
+
+    async def _compose(self, paths: list[str]):
+        """Combine parts server side, in batches of at most ``GCS_MAX_COMPOSE``."""
+        fs = self.path.fs
+        level = 0
+        while len(paths) > GCS_MAX_COMPOSE:
+            batches = [
+                paths[i : i + GCS_MAX_COMPOSE]
+                for i in range(0, len(paths), GCS_MAX_COMPOSE)
+            ]
+            paths = [
+                (self.parts_path / f"compose-{level}-{i:05d}").path
+                for i in range(len(batches))
+            ]
+            await asyncio.gather(
+                *(
+                    asyncio.to_thread(fs.merge, path, batch)
+                    for path, batch in zip(paths, batches, strict=True)
+                )
+            )
+            level += 1
+        await asyncio.to_thread(fs.merge, self.path.path, paths)
+
+    async def complete(self):
+        """Combine all parts into the final file and delete them."""
+        paths = [
+            self._part_path(part_number).path
+            for part_number in sorted(self.part_numbers)
+        ]
+        await self._compose(paths)
+        await self.abort()
+
+    async def abort(self):
+        """Delete the directory containing parts."""
+        if self.parts_path.exists():
+            await asyncio.to_thread(
+                self.parts_path.fs.rm, self.parts_path.path, recursive=True
+            )
+
+
+def get_multipart_upload(path: UPath, parts_path: UPath) -> MultipartUpload | None:
+    """Return the multipart upload implementation for a filesystem, if it has one.
+
+    Args:
+        path: Path to upload file to.
+        parts_path: Directory to store temporary parts in, if the filesystem doesn't
+            support multipart uploads natively. Deleted after the upload.
+
+    Returns:
+        None if the filesystem can't combine parts server side, in which case the
+        file should be written through a single stream.
+    """
+    if path.protocol in ("s3", "s3a"):
+        return S3MultipartUpload(path=path)
+    if path.protocol in COMPOSE_PROTOCOLS:
+        return ComposeMultipartUpload(path=path, parts_path=parts_path)
+    return None
+
+
+async def upload_multipart(
+    upload: MultipartUpload, parts: Iterable[bytes], concurrency: int
+):
+    """Upload parts concurrently, retrying each part individually if it fails.
+
+    Parts are only read from ``parts`` once there is capacity to upload them, so at
+    most ``concurrency + 1`` parts are held in memory at once.
+
+    Args:
+        upload: Multipart upload to add parts to.
+        parts: Contents of each part of the file, in order.
+        concurrency: Maximum number of parts to upload at once.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _upload_part(part_number: int, data: bytes):
+        try:
+            await retry_async(
+                upload.upload_part,
+                args=[part_number, data],
+                retry_count=PART_RETRY_COUNT,
+                retry_base_s=PART_RETRY_BASE_S,
+                retry_on=(OSError, aiohttp.ClientError, asyncio.TimeoutError),
+            )
+        finally:
+            semaphore.release()
+
+    await upload.start()
+    tasks = []
+    try:
+        for part_number, data in enumerate(parts, start=1):
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(_upload_part(part_number, data)))
+        await asyncio.gather(*tasks)
+        await upload.complete()
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.warning(f"Multipart upload of {upload.path} failed, aborting.")
+        await upload.abort()
+        raise
@@ -2,25 +2,29 @@
 
 import asyncio
 import importlib
+import io
 import json
 import logging
 import os
 import traceback
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import BinaryIO, Literal
 
 import aiohttp
 import semantic_version  # type: ignore  # noqa: PGH003
 import yaml
-from pydantic import BaseModel, PrivateAttr
+from pydantic import BaseModel, Field, PrivateAttr
 
 from pudl_archiver.depositors.depositor import (
+    STREAM_CHUNK_SIZE,
     DepositionAction,
     DepositionChange,
     DepositorAPIClient,
     DraftDeposition,
     PublishedDeposition,
     register_depositor,
+    resolve_byte_range,
 )
 from pudl_archiver.frictionless import (
     MEDIA_TYPES,
@@ -32,6 +36,7 @@ from pudl_archiver.frictionless import (
 from pudl_archiver.utils import RunSettings, Url, compute_md5, retry_async
 
 from .entities import (
+    BucketFile,
     Deposition,
     DepositionFile,
     DepositionMetadata,
@@ -39,6 +44,7 @@ from .entities import (
     Record,
     SandboxDoi,
 )
+from .rate_limit import RateLimitMetrics, ZenodoRateLimiter, get_rate_limiter
 
 logger = logging.getLogger(f"catalystcoop.{__name__}")
 
@@ -106,25 +112,48 @@ class ZenodoAPIClient(DepositorAPIClient):
     """
 
     sandbox: bool
+    #: base URL of a Zenodo compatible server to use instead of zenodo.org
+    server_url: str | None = None
+    max_concurrent_reads: int = 16
+    max_concurrent_writes: int = 8
 
     # Private attributes
     _request = PrivateAttr()
     _dataset_settings_path = PrivateAttr()
     _session = PrivateAttr()
+    _rate_limiter: ZenodoRateLimiter = PrivateAttr()
 
     @classmethod
     async def initialize_client(
         cls,
         session: aiohttp.ClientSession,
         sandbox: bool,
+        server_url: str | None = None,
+        max_concurrent_reads: int = 16,
+        max_concurrent_writes: int = 8,
     ) -> ZenodoAPIClient:
         """Initialize API client connection.
 
         Args:
             session: HTTP handler - we don't use it directly, it's wrapped in self._request.
+            sandbox: Use the Zenodo sandbox server and tokens.
+            server_url: Base URL of a Zenodo compatible server to use instead of
+                zenodo.org, like a local fake server for testing.
+            max_concurrent_reads: Maximum number of GET requests to the server in
+                flight at once, shared by all clients in the process.
+            max_concurrent_writes: Maximum number of other requests to the server in
+                flight at once, shared by all clients in the process.
         """
-        self = cls(sandbox=sandbox)
+        self = cls(
+            sandbox=sandbox,
+            server_url=server_url,
+            max_concurrent_reads=max_concurrent_reads,
+            max_concurrent_writes=max_concurrent_writes,
+        )
         self._session = session
+        self._rate_limiter = get_rate_limiter(
+            self.api_root, max_concurrent_reads, max_concurrent_writes
+        )
         self._request = self._make_requester(session)
         self._dataset_settings_path = (
             importlib.resources.files("pudl_archiver.package_data") / "zenodo_doi.yaml"
@@ -153,6 +182,57 @@ class ZenodoAPIClient(DepositorAPIClient):
             file_bytes = await retry_async(response.read)
         return file_bytes
 
+    async def iter_file(
+        self,
+        deposition: Deposition,
+        filename: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a range of bytes from a file in a deposition.
+
+        Partial files are requested with a ``Range`` header. If the server ignores it
+        and sends the whole file, bytes before the range are skipped as they arrive.
+
+        Args:
+            deposition: Deposition containing the file.
+            filename: Name of file to read.
+            start: Offset of the first byte to read. Negative values count back from
+                the end of the file.
+            end: Offset after the last byte to read, or None to read to the end.
+            chunk_size: Maximum size of each chunk yielded.
+        """
+        if not deposition or not (file_info := deposition.files_map.get(filename)):
+            raise FileNotFoundError(f"{filename} is not in deposition {deposition}.")
+        start, end = resolve_byte_range(start, end, file_info.filesize)
+        if start == end:
+            return
+        headers = self.auth_write
+        if start > 0 or end < file_info.filesize:
+            headers = headers | {"Range": f"bytes={start}-{end - 1}"}
+        response = await self._request(
+            "GET",
+            file_info.links.canonical,
+            f"Download {filename} bytes {start}-{end}",
+            parse_json=False,
+            headers=headers,
+        )
+        try:
+            # A 200 response means the server sent the whole file instead of the
+            # partial content requested
+            position = start if response.status == 206 else 0
+            async for chunk in response.content.iter_chunked(chunk_size):
+                chunk_start = position
+                position += len(chunk)
+                if position <= start:
+                    continue
+                yield chunk[max(start - chunk_start, 0) : end - chunk_start]
+                if position >= end:
+                    break
+        finally:
+            response.release()
+
     async def list_files(self, deposition: Deposition) -> list[str]:
         """Return list of filenames from previous version of deposition."""
         return list(deposition.files_map.keys())
@@ -161,45 +241,51 @@ class ZenodoAPIClient(DepositorAPIClient):
         """Get URL which points to deposition."""
         return deposition.links.html
 
-    async def create_file(
+    async def upload_file(
         self,
         deposition: Deposition,
         filename: str,
         data: BinaryIO,
         force_api: Literal["bucket", "files"] | None = None,
-    ) -> Deposition:
-        """Create a file in a deposition.
+    ) -> str:
+        """Upload a file to a deposition.
 
         Args:
             filename: the filename of the file you want to create.
             data: the actual data associated with the file.
 
         Returns:
-            Remote deposition after creating file.
+            md5 checksum of the uploaded file reported by Zenodo.
         """
         if deposition.links.bucket and force_api != "files":
             url = f"{deposition.links.bucket}/{filename}"
-            await self._request(
-                "PUT",
-                url,
-                log_label=f"Uploading {filename} to bucket",
-                data=data,
-                headers=self.auth_write,
-                timeout=3600,
+            response = BucketFile(
+                **await self._request(
+                    "PUT",
+                    url,
+                    log_label=f"Uploading {filename} to bucket",
+                    data=data,
+                    headers=self.auth_write,
+                    timeout=3600,
+                )
             )
+            # Bucket API prefixes checksums with the hash algorithm, like md5:<hash>
+            checksum = response.checksum.removeprefix("md5:")
         elif deposition.links.files and force_api != "bucket":
             url = f"{deposition.links.files}"
-            await self._request(
-                "POST",
-                url,
-                log_label=f"Uploading {filename} to files API",
-                data={"file": data, "name": filename},
-                headers=self.auth_write,
+            response = DepositionFile(
+                **await self._request(
+                    "POST",
+                    url,
+                    log_label=f"Uploading {filename} to files API",
+                    data={"file": data, "name": filename},
+                    headers=self.auth_write,
+                )
             )
+            checksum = response.checksum
         else:
             raise RuntimeError("No file or bucket link available for deposition.")
-
-        return await self.get_deposition_by_id(deposition.id_)
+        return checksum
 
     async def delete_file(
         self,
@@ -449,7 +535,9 @@ class ZenodoAPIClient(DepositorAPIClient):
     @property
     def api_root(self):
         """Return base URL for zenodo server (sandbox or production)."""
-        if self.sandbox:
+        if self.server_url:
+            api_root = f"{self.server_url}/api"
+        elif self.sandbox:
             api_root = "https://sandbox.zenodo.org/api"
         else:
             api_root = "https://zenodo.org/api"
@@ -525,6 +613,14 @@ class ZenodoAPIClient(DepositorAPIClient):
         logger.debug(deposition)
         return deposition
 
+    def rate_limit_metrics(self) -> dict[str, RateLimitMetrics]:
+        """Time spent waiting on the read and write rate limits of the server.
+
+        The rate limits are shared by all clients of the server in the process, so
+        this includes requests made by other clients.
+        """
+        return self._rate_limiter.metrics()
+
     def _make_requester(self, session):
         """Wraps our session requests with some Zenodo-specific error handling."""
 
@@ -551,9 +647,18 @@ class ZenodoAPIClient(DepositorAPIClient):
             """
             logger.info(f"{method} {url} - {log_label}")
 
+            # Uploads have to be sent from the start again when a request is retried
+            data = kwargs.get("data")
+            start = data.tell() if isinstance(data, io.IOBase) else None
+            budget = self._rate_limiter.budget_for(method)
+
             async def run_request():
-                # Convert all urls to str to in case they are pydantic Url types
-                response = await session._request(method, str(url), **kwargs)
+                if start is not None:
+                    data.seek(start)
+                async with budget.slot():
+                    # Convert all urls to str to in case they are pydantic Url types
+                    response = await session._request(method, str(url), **kwargs)
+                    budget.update(response.status, response.headers)
                 if response.status >= 400:
                     if response.headers["Content-Type"] == "application/json":
                         json_resp = await response.json()
@@ -620,6 +725,19 @@ class ZenodoPublishedDeposition(PublishedDeposition):
         """
         return await self.api_client.get_file(self.deposition, filename)
 
+    async def iter_file(
+        self,
+        filename: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a file, or a range of bytes from it, from the deposition."""
+        async for chunk in self.api_client.iter_file(
+            self.deposition, filename, start, end, chunk_size
+        ):
+            yield chunk
+
     async def list_files(self) -> list[str]:
         """Return list of filenames from published version of deposition."""
         return await self.api_client.list_files(self.deposition)
@@ -632,9 +750,37 @@ class ZenodoDraftDeposition(DraftDeposition):
     settings: RunSettings
     dataset_id: str
     api_client: ZenodoAPIClient
+    #: checksums reported by Zenodo in the responses to uploads made from this draft
+    upload_checksums: dict[str, str] = Field(default_factory=dict)
+    #: files uploaded since ``deposition`` was last fetched, which may be missing from
+    #: its file list or listed with stale metadata
+    unlisted_files: set[str] = Field(default_factory=set)
+
+    async def _current_deposition(self, filename: str | None = None) -> Deposition:
+        """Fetch the deposition again if it doesn't reflect uploads from this draft.
+
+        Uploads only update ``upload_checksums``, so the deposition is fetched once
+        when a file list or file link is needed rather than after every upload.
+
+        Args:
+            filename: only fetch the deposition if this file was uploaded since it
+                was last fetched. If None, fetch it if any file was.
+        """
+        if (filename is None and self.unlisted_files) or filename in (
+            self.unlisted_files
+        ):
+            self.deposition = await self.api_client.get_deposition_by_id(
+                self.deposition.id_
+            )
+            self.unlisted_files = set()
+        return self.deposition
 
     async def publish(self) -> ZenodoPublishedDeposition:
-        """Publish draft deposition and return new depositor with updated deposition."""
+        """Publish draft deposition and return new depositor with updated deposition.
+
+        The deposition isn't fetched again first: publishing only needs its links,
+        and Zenodo responds with the published deposition and all of its files.
+        """
         published = await self.api_client.publish(self.deposition)
         if self.settings.initialize:
             self.api_client.update_dataset_settings(self.dataset_id, published)
@@ -660,15 +806,15 @@ class ZenodoDraftDeposition(DraftDeposition):
             data: the actual data associated with the file.
 
         Returns:
-            None if success.
+            Draft with the checksum from the upload response recorded for the file.
         """
+        checksum = await self.api_client.upload_file(
+            self.deposition, filename, data, force_api=force_api
+        )
         return self.model_copy(
             update={
-                "deposition": await self.api_client.create_file(
-                    self.deposition,
-                    filename,
-                    data,
-                )
+                "upload_checksums": self.upload_checksums | {filename: checksum},
+                "unlisted_files": self.unlisted_files | {filename},
             }
         )
 
@@ -687,8 +833,14 @@ class ZenodoDraftDeposition(DraftDeposition):
         return self.model_copy(
             update={
                 "deposition": await self.api_client.delete_file(
-                    self.deposition, filename
-                )
+                    await self._current_deposition(filename), filename
+                ),
+                "upload_checksums": {
+                    key: value
+                    for key, value in self.upload_checksums.items()
+                    if key != filename
+                },
+                "unlisted_files": set(),
             }
         )
 
@@ -702,20 +854,40 @@ class ZenodoDraftDeposition(DraftDeposition):
         Args:
             filename: Name of file to fetch.
         """
-        return await self.api_client.get_file(self.deposition, filename)
+        return await self.api_client.get_file(
+            await self._current_deposition(filename), filename
+        )
+
+    async def iter_file(
+        self,
+        filename: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a file, or a range of bytes from it, from the deposition."""
+        async for chunk in self.api_client.iter_file(
+            await self._current_deposition(filename), filename, start, end, chunk_size
+        ):
+            yield chunk
 
     def get_checksum(self, filename: str) -> str | None:
         """Get checksum for a file in the current deposition.
 
+        Checksums from upload responses are used where available, since the
+        deposition may not reflect an upload immediately.
+
         Args:
             filename: Name of file to checksum.
         """
+        if checksum := self.upload_checksums.get(filename):
+            return checksum
         file_info = self.deposition.files_map.get(filename)
         return file_info.checksum if file_info else None
 
     async def list_files(self) -> list[str]:
         """Return list of filenames from published version of deposition."""
-        return await self.api_client.list_files(self.deposition)
+        return await self.api_client.list_files(await self._current_deposition())
 
     def generate_change(
         self, filename: str, resource: ResourceInfo
@@ -749,6 +921,14 @@ class ZenodoDraftDeposition(DraftDeposition):
             resource=resource.local_path,
         )
 
+    async def attach_datapackage(
+        self,
+        partitions_in_deposition: dict[str, Partitions],
+    ) -> tuple[ZenodoDraftDeposition, DataPackage]:
+        """Fetch the deposition's files once, then generate and attach a datapackage."""
+        await self._current_deposition()
+        return await super().attach_datapackage(partitions_in_deposition)
+
     def generate_datapackage(
         self, partitions_in_deposition: dict[str, Partitions]
     ) -> DataPackage:
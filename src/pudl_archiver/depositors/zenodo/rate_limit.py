@@ -0,0 +1,177 @@
+"""Pace requests to Zenodo using the rate limit headers in its responses.
+
+Zenodo reports how many requests are left in the current rate limit window in the
+``X-RateLimit-Remaining`` header, and when the window resets in ``X-RateLimit-Reset``
+as a Unix timestamp. Without looking at these, concurrent drafts each keep sending
+requests until they get ``429 Too Many Requests`` errors, and then spend their retry
+budget backing off.
+
+All ``ZenodoAPIClient`` instances talking to the same server in an event loop share a
+``ZenodoRateLimiter``, so every dataset archived in a process is paced together.
+Reads and writes have separate budgets, each with a cap on concurrent requests, so a
+burst of uploads doesn't hold up the small reads needed to keep drafts moving.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from typing import Literal
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+#: How long to wait after a 429 response that doesn't say when to try again
+DEFAULT_RATE_LIMIT_WAIT_S = 60.0
+
+READ_METHODS = {"GET", "HEAD"}
+
+
+class RateLimitMetrics(BaseModel):
+    """Time spent waiting on a rate limit budget."""
+
+    requests: int = 0
+    #: number of 429 responses received
+    rate_limited: int = 0
+    #: number of requests that waited for the rate limit window to reset
+    rate_limit_waits: int = 0
+    rate_limit_wait_s: float = 0.0
+    max_rate_limit_wait_s: float = 0.0
+    #: time spent waiting for another request to finish, because of the cap on
+    #: concurrent requests
+    queue_wait_s: float = 0.0
+
+
+class RateLimitBudget:
+    """Track the requests left in one rate limit window and pace requests to fit."""
+
+    def __init__(self, name: str, max_concurrency: int):
+        """Create a budget with no known limit.
+
+        Args:
+            name: Name of the budget used when logging.
+            max_concurrency: Maximum number of requests in flight at once.
+        """
+        self.name = name
+        self.metrics = RateLimitMetrics()
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait until a request fits in the budget, then hold a slot while it runs."""
+        start = time.monotonic()
+        async with self._semaphore:
+            self.metrics.queue_wait_s += time.monotonic() - start
+            await self._reserve()
+            yield
+
+    async def _reserve(self):
+        """Take one request from the budget, waiting for the window to reset if needed."""
+        # Reserve under a lock, so requests waiting on the same reset go one at a time
+        # and each sees the budget left by the others.
+        async with self._lock:
+            if self.reset_at is not None and time.time() >= self.reset_at:
+                self.remaining = None
+                self.reset_at = None
+            if self.remaining is not None and self.remaining <= 0:
+                wait_s = max(
+                    (self.reset_at or time.time() + DEFAULT_RATE_LIMIT_WAIT_S)
+                    - time.time(),
+                    0.0,
+                )
+                logger.info(
+                    f"Zenodo {self.name} rate limit reached, waiting {wait_s:.1f}s for "
+                    "it to reset."
+                )
+                self.metrics.rate_limit_waits += 1
+                self.metrics.rate_limit_wait_s += wait_s
+                self.metrics.max_rate_limit_wait_s = max(
+                    self.metrics.max_rate_limit_wait_s, wait_s
+                )
+                await asyncio.sleep(wait_s)
+                self.remaining = None
+                self.reset_at = None
+            if self.remaining is not None:
+                self.remaining -= 1
+            self.metrics.requests += 1
+
+    def update(self, status: int, headers: Mapping[str, str]):
+        """Update the budget from the rate limit headers of a response.
+
+        Args:
+            status: HTTP status of the response.
+            headers: Response headers.
+        """
+        if (reset := headers.get("X-RateLimit-Reset")) is not None:
+            reset_at = float(reset)
+            if self.reset_at is None or reset_at > self.reset_at:
+                # A new window started, so the old remaining count is out of date
+                self.remaining = None
+            self.reset_at = reset_at
+        if (remaining := headers.get("X-RateLimit-Remaining")) is not None:
+            # Responses can arrive out of order, so keep the lowest count seen in
+            # this window
+            remaining = int(remaining)
+            self.remaining = (
+                remaining if self.remaining is None else min(self.remaining, remaining)
+            )
+        if status == 429:
+            self.metrics.rate_limited += 1
+            self.remaining = 0
+            if (retry_after := headers.get("Retry-After")) is not None:
+                self.reset_at = time.time() + float(retry_after)
+            elif self.reset_at is None or self.reset_at <= time.time():
+                self.reset_at = time.time() + DEFAULT_RATE_LIMIT_WAIT_S
+
+
+class ZenodoRateLimiter:
+    """Separate read and write rate limit budgets for one Zenodo server."""
+
+    def __init__(self, max_concurrent_reads: int, max_concurrent_writes: int):
+        """Create read and write budgets.
+
+        Args:
+            max_concurrent_reads: Maximum number of read requests in flight at once.
+            max_concurrent_writes: Maximum number of write requests in flight at once.
+        """
+        self.read = RateLimitBudget("read", max_concurrent_reads)
+        self.write = RateLimitBudget("write", max_concurrent_writes)
+
+    def budget_for(self, method: str) -> RateLimitBudget:
+        """Get the budget that requests using an HTTP method count against."""
+        return self.read if method.upper() in READ_METHODS else self.write
+
+    def metrics(self) -> dict[Literal["read", "write"], RateLimitMetrics]:
+        """Wait time metrics for reads and writes."""
+        return {"read": self.read.metrics, "write": self.write.metrics}
+
+
+_rate_limiters: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, ZenodoRateLimiter]
+] = weakref.WeakKeyDictionary()
+
+
+def get_rate_limiter(
+    api_root: str, max_concurrent_reads: int = 16, max_concurrent_writes: int = 8
+) -> ZenodoRateLimiter:
+    """Get the rate limiter shared by all clients of a server in this event loop.
+
+    The concurrency limits are only used when the rate limiter is first created.
+
+    Args:
+        api_root: Root URL of the Zenodo API.
+        max_concurrent_reads: Maximum number of read requests in flight at once.
+        max_concurrent_writes: Maximum number of write requests in flight at once.
+    """
+    limiters = _rate_limiters.setdefault(asyncio.get_running_loop(), {})
+    if api_root not in limiters:
+        limiters[api_root] = ZenodoRateLimiter(
+            max_concurrent_reads, max_concurrent_writes
+        )
+    return limiters[api_root]
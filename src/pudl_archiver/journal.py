@@ -0,0 +1,134 @@
+"""Append-only journal of the resources completed during an archive run.
+
+A ``RunSummary`` is only written once a run finishes, so if the process is killed
+part way through a run, there's no record of what was already downloaded and added
+to the draft deposition. The journal is written one line at a time as each resource
+is added to the draft, and each line is flushed to disk before moving on, so it
+survives the process being killed. The ``resume`` command uses it to skip resources
+that are already in the draft.
+"""
+
+import asyncio
+import datetime
+import logging
+import os
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from pudl_archiver.frictionless import Partitions, ResourceInfo
+from pudl_archiver.utils import RunSettings
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+
+class JournalStart(BaseModel):
+    """First entry in a journal, recording what the run was archiving."""
+
+    entry_type: Literal["start"] = "start"
+    dataset: str
+    run_settings: RunSettings
+    started: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(tz=datetime.UTC)
+    )
+
+
+class JournalResource(BaseModel):
+    """Entry recording a resource that was added to the draft deposition."""
+
+    entry_type: Literal["resource"] = "resource"
+    name: str
+    partitions: Partitions
+    md5_hash: str | None
+    action: str
+    completed: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(tz=datetime.UTC)
+    )
+
+
+JournalEntry = TypeAdapter(JournalStart | JournalResource)
+
+
+class RunJournal:
+    """Append entries to a run journal file, and read back previous entries."""
+
+    def __init__(
+        self, path: Path, start: JournalStart, resources: list[JournalResource]
+    ):
+        """Use ``RunJournal.create`` or ``RunJournal.load`` to get a journal.
+
+        Args:
+            path: Path to the journal file.
+            start: The journal's first entry.
+            resources: Resources recorded in the journal so far.
+        """
+        self.path = path
+        self.start = start
+        self.resources = resources
+
+    @classmethod
+    def create(
+        cls, path: str | Path, dataset: str, run_settings: RunSettings
+    ) -> RunJournal:
+        """Start a new journal, replacing any existing journal at ``path``."""
+        path = Path(path)
+        start = JournalStart(dataset=dataset, run_settings=run_settings)
+        path.write_text(start.model_dump_json() + "\n")
+        return cls(path, start, [])
+
+    @classmethod
+    def load(cls, path: str | Path) -> RunJournal:
+        """Read an existing journal so a run can be resumed.
+
+        New entries are appended to the same file. If the process was killed while
+        writing the last line, that line is ignored.
+        """
+        path = Path(path)
+        lines = path.read_text().splitlines()
+        entries = []
+        for i, line in enumerate(lines):
+            try:
+                entries.append(JournalEntry.validate_json(line))
+            except ValidationError:
+                if i < len(lines) - 1:
+                    raise
+                logger.warning(f"Ignoring incomplete last entry of journal {path}.")
+        if not entries or not isinstance(entries[0], JournalStart):
+            raise RuntimeError(f"Journal {path} doesn't start with a start entry.")
+        return cls(path, entries[0], entries[1:])
+
+    @property
+    def dataset(self) -> str:
+        """Dataset the journaled run was archiving."""
+        return self.start.dataset
+
+    async def record_resource(
+        self,
+        name: str,
+        resource: ResourceInfo,
+        md5_hash: str | None,
+        action: str,
+    ):
+        """Append a resource that has been added to the draft deposition.
+
+        Args:
+            name: Filename of the resource in the deposition.
+            resource: Info about the downloaded resource.
+            md5_hash: Checksum of the file in the draft deposition.
+            action: Name of the ``DepositionAction`` applied to the deposition.
+        """
+        entry = JournalResource(
+            name=name,
+            partitions=resource.partitions,
+            md5_hash=md5_hash,
+            action=action,
+        )
+        await asyncio.to_thread(self._append, entry.model_dump_json())
+        self.resources.append(entry)
+
+    def _append(self, line: str):
+        with self.path.open("a") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
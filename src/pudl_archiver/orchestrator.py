@@ -1,14 +1,30 @@
 """Core routines for archiving raw data packages."""
 
+import asyncio
 import logging
 
 import aiohttp
 
 from pudl_archiver.archivers.classes import AbstractDatasetArchiver
-from pudl_archiver.archivers.validate import RunSummary, exception_validation
-from pudl_archiver.depositors import PublishedDeposition, get_deposition
-from pudl_archiver.frictionless import Partitions
-from pudl_archiver.utils import RunSettings
+from pudl_archiver.archivers.validate import (
+    FileDiff,
+    RunSummary,
+    exception_validation,
+)
+from pudl_archiver.archivers.zip_diff import (
+    ZipMember,
+    diff_zip_members,
+    local_zip_members,
+    remote_zip_members,
+)
+from pudl_archiver.depositors import (
+    DraftDeposition,
+    PublishedDeposition,
+    get_deposition,
+)
+from pudl_archiver.frictionless import DataPackage, Partitions
+from pudl_archiver.journal import RunJournal
+from pudl_archiver.utils import RunSettings, compute_md5
 
 logger = logging.getLogger(f"catalystcoop.{__name__}")
 
@@ -19,24 +35,58 @@ async def orchestrate_run(
     run_settings: RunSettings,
     session: aiohttp.ClientSession,
     skip_partitions: dict[str, Partitions] | None = None,
+    journal: RunJournal | None = None,
 ) -> tuple[RunSummary, PublishedDeposition | None]:
-    """Use downloader and depositor to archive a dataset."""
+    """Use downloader and depositor to archive a dataset.
+
+    If a journal is passed, each resource is recorded in it once it has been added to
+    the draft. Resources already recorded in the journal by a previous attempt at the
+    run are skipped, as long as the draft still contains them. Archivers that don't
+    return partitions from ``get_resources`` can't skip them, so they're downloaded
+    again, but aren't added to the draft again if they haven't changed.
+
+    Each downloaded file is deleted as soon as it has been added to the draft, so
+    only the resources in progress take up local disk space.
+    """
     skip_partitions = skip_partitions or {}
     resources = {}
+    # Central directories of downloaded zipfiles, read before they're deleted
+    zip_members = {}
     # Get datapackage from previous version if there is one
-    draft, original_datapackage = await get_deposition(dataset, session, run_settings)
+    draft, original_datapackage, published = await get_deposition(
+        dataset, session, run_settings
+    )
+    downloader.previous_version = published
+    journaled_partitions = {}
+    if journal is not None:
+        journaled_partitions = _journaled_partitions(draft, journal)
 
     # Download resources and add to archive
     run_exception = None
     try:
         async for name, resource in downloader.download_all_resources(
             skip_partitions.values(),
+            resumed_partitions=journaled_partitions.values(),
         ):
             resources[name] = resource
-            draft = await draft.add_resource(name, resource)
+            if published is not None and name.endswith(".zip"):
+                zip_members[name] = await _read_zip_members(resource.local_path)
+            if name in journaled_partitions and draft.get_checksum(
+                name
+            ) == await asyncio.to_thread(compute_md5, resource.local_path):
+                logger.info(f"{name} is already in the draft, not adding it again.")
+            else:
+                draft = await draft.add_resource(name, resource, journal=journal)
+            await downloader.workspace.release(resource.local_path)
     except Exception as e:
         run_exception = e
         logger.exception("Error downloading resources")
+    finally:
+        logger.info(
+            f"Download workspace usage: {downloader.workspace.metrics.model_dump()}"
+        )
+        downloader.workspace.cleanup()
+    skip_partitions = journaled_partitions | skip_partitions
 
     # Delete files in draft that weren't downloaded by downloader
     for filename in await draft.list_files():
@@ -61,6 +111,9 @@ async def orchestrate_run(
         original_datapackage, new_datapackage, resources
     )
     validations.append(exception_validation(run_exception))
+    member_changes = await _zip_member_changes(
+        published, original_datapackage, new_datapackage, zip_members
+    )
     summary = RunSummary.create_summary(
         name=dataset,
         baseline_datapackage=original_datapackage,
@@ -75,6 +128,7 @@ async def orchestrate_run(
         }
         | skip_partitions,
         run_settings=run_settings,
+        member_changes=member_changes,
     )
     published = await draft.publish_if_valid(
         summary,
@@ -82,3 +136,81 @@ async def orchestrate_run(
         run_settings.auto_publish,
     )
     return summary, published
+
+
+def _journaled_partitions(
+    draft: DraftDeposition, journal: RunJournal
+) -> dict[str, Partitions]:
+    """Find resources recorded in the journal that are still in the draft."""
+    partitions = {}
+    latest_entries = {entry.name: entry for entry in journal.resources}
+    for entry in latest_entries.values():
+        if draft.get_checksum(entry.name) == entry.md5_hash:
+            partitions[entry.name] = entry.partitions
+        else:
+            logger.warning(
+                f"{entry.name} in the draft doesn't match the journal, downloading "
+                "it again."
+            )
+    if partitions:
+        logger.info(f"Skipping {len(partitions)} resources completed previously.")
+    return partitions
+
+
+async def _read_zip_members(path) -> dict[str, ZipMember] | None:
+    """Read the central directory of a downloaded zipfile, if it's valid."""
+    try:
+        return await asyncio.to_thread(local_zip_members, path)
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"Couldn't read members of {path}: {e!r}")
+        return None
+
+
+async def _zip_member_changes(
+    published: PublishedDeposition | None,
+    baseline_datapackage: DataPackage | None,
+    new_datapackage: DataPackage,
+    zip_members: dict[str, dict[str, ZipMember] | None],
+) -> dict[str, list[FileDiff]]:
+    """Find changes to the members of zipfiles that were updated in this run.
+
+    Only the central directory of each published zipfile is read. Failing to compare
+    a zipfile isn't an error, it's just left out of the summary.
+
+    Args:
+        published: The previously published deposition.
+        baseline_datapackage: Datapackage of the previously published deposition.
+        new_datapackage: Datapackage of the new draft.
+        zip_members: Members of each zipfile downloaded in this run.
+    """
+    if published is None or baseline_datapackage is None:
+        return {}
+    baseline_resources = {
+        resource.name: resource for resource in baseline_datapackage.resources
+    }
+    updated = [
+        resource
+        for resource in new_datapackage.resources
+        if resource.name.endswith(".zip")
+        and zip_members.get(resource.name) is not None
+        and resource.name in baseline_resources
+        and resource.hash_ != baseline_resources[resource.name].hash_
+    ]
+
+    async def _diff(name: str) -> list[FileDiff] | None:
+        try:
+            baseline = await remote_zip_members(
+                lambda start, end: published.read_range(name, start, end),
+                baseline_resources[name].bytes_,
+            )
+            return diff_zip_members(baseline, zip_members[name])
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Couldn't compare members of {name}: {e!r}")
+            return None
+
+    diffs = await asyncio.gather(*[_diff(resource.name) for resource in updated])
+    return {
+        resource.name: diff
+        for resource, diff in zip(updated, diffs, strict=True)
+        if diff is not None
+    }
@@ -7,6 +7,7 @@ import zipfile
 from collections.abc import Awaitable, Callable
 from hashlib import md5
 from io import BytesIO
+from pathlib import Path
 from time import time
 
 import aiohttp
@@ -91,6 +92,26 @@ def add_to_archive_stable_hash(archive: zipfile.ZipFile, filename, data: bytes):
     archive.writestr(info, data)
 
 
+def add_to_zipfile(
+    zip_path: Path, filename: str, data: bytes | str | Path, mode: str = "a"
+):
+    """Open a zipfile on disk and add a file to it with a stable hash.
+
+    This is a module level function so archivers can compress files in a worker
+    process with :meth:`AbstractDatasetArchiver.run_cpu`.
+
+    Args:
+        zip_path: Path to the zipfile.
+        filename: Name of the file within the zipfile.
+        data: Contents of the file, or the path to a file to read them from.
+        mode: Mode to open the zipfile with: "a" to append, or "w" to overwrite.
+    """
+    if isinstance(data, Path):
+        data = data.read_bytes()
+    with zipfile.ZipFile(zip_path, mode, compression=zipfile.ZIP_DEFLATED) as archive:
+        add_to_archive_stable_hash(archive=archive, filename=filename, data=data)
+
+
 async def _rate_limited_scheduler(
     tasks: list[typing.Awaitable],
     result_queue: asyncio.Queue,
@@ -139,12 +160,18 @@ class RunSettings(BaseModel):
     initialize: bool = False
     only_years: list[int] | None = []
     summary_file: str | None = None
+    journal_file: str | None = None
     clobber_unchanged: bool = False
     auto_publish: bool = False
     refresh_metadata: bool = False
     depositor: Depositors = "zenodo"
     depositor_args: dict[str, typing.Any] = {}
     retry_run: str | None = None
+    only_changed: bool = False
+    #: pause downloads while downloaded files take up more than this many bytes
+    max_disk_bytes: int | None = None
+    #: reuse unchanged files from the last published version where supported
+    incremental: bool = False
 
 
 def compute_md5(file_path: UPath) -> str:
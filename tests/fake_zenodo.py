@@ -0,0 +1,483 @@
+"""A local stand-in for the parts of the Zenodo API used by the Zenodo depositor.
+
+This lets us exercise ``ZenodoAPIClient`` end to end without the sandbox, so tests are
+fast and deterministic and depositor performance can be measured. The server keeps all
+depositions in memory, and implements just enough of the API for a full archiver run:
+
+* ``POST/GET/PUT/DELETE deposit/depositions[/{id}]``
+* ``POST deposit/depositions/{id}/actions/publish``
+* ``DELETE deposit/depositions/{id}/files/{file_id}``
+* ``PUT files/{bucket_id}/{filename}`` (the bucket API)
+* ``GET/POST records/{id}[/versions[/latest]]``
+* file downloads
+
+To simulate a slow or unreliable server, ``FakeZenodoConfig`` can add latency to every
+request, randomly fail requests with a 500 error before they're handled, corrupt
+uploaded files, cap the bandwidth of uploads and downloads, and enforce a rate limit,
+reporting the budget left in ``X-RateLimit-*`` headers like Zenodo does. The number of
+calls to each endpoint is recorded in ``FakeZenodo.calls``.
+
+Links returned by the server use the host from each request. ``FileLinks.canonical``
+only accepts zenodo.org URLs without a port, like production, so clients should request
+``fake_zenodo_url()`` and use ``fake_zenodo_session``, which connects requests for any
+host and port to the fake server.
+"""
+
+import asyncio
+import datetime
+import hashlib
+import random
+import socket
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+
+import aiohttp
+from aiohttp import web
+from aiohttp.abc import AbstractResolver, ResolveResult
+from aiohttp.test_utils import TestServer
+
+#: Hostname clients should use to reach the fake server
+FAKE_ZENODO_HOST = "sandbox.zenodo.org"
+
+
+@dataclass
+class FakeZenodoConfig:
+    """Configure how the fake server simulates real network conditions."""
+
+    #: seconds to wait before handling each request
+    latency_s: float = 0.0
+    #: probability that a request fails with a 500 error
+    error_rate: float = 0.0
+    #: maximum upload and download speed in bytes per second
+    bandwidth_bps: float | None = None
+    #: probability that an uploaded file is stored with corrupted contents
+    corrupt_rate: float = 0.0
+    #: maximum number of read (GET) requests, and separately other requests, per
+    #: rate limit window. Requests over the limit get a 429 error.
+    rate_limit: int | None = None
+    #: length of a rate limit window in seconds
+    rate_limit_window_s: float = 1.0
+    #: seed for the random number generator used for error injection
+    seed: int = 0
+
+
+@dataclass
+class FakeFile:
+    """A file stored in a fake deposition."""
+
+    id_: str
+    filename: str
+    data: bytes
+
+    @property
+    def checksum(self) -> str:
+        """MD5 hash of file, as used by Zenodo."""
+        return hashlib.md5(self.data).hexdigest()  # noqa: S324
+
+
+@dataclass
+class FakeDeposition:
+    """A single draft or published version of a fake deposition."""
+
+    id_: int
+    conceptrecid: int
+    metadata: dict
+    bucket_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    files: dict[str, FakeFile] = field(default_factory=dict)
+    submitted: bool = False
+    created: str = field(
+        default_factory=lambda: datetime.datetime.now(tz=datetime.UTC).isoformat()
+    )
+
+    def to_json(self, base_url: str, latest_draft_id: int | None = None) -> dict:
+        """Format the deposition like the Zenodo depositions API."""
+        deposition_url = f"{base_url}/api/deposit/depositions/{self.id_}"
+        record_path = (
+            f"records/{self.id_}" if self.submitted else f"records/{self.id_}/draft"
+        )
+        metadata = self.metadata
+        if self.submitted:
+            metadata = metadata | {"doi": f"10.5072/zenodo.{self.id_}"}
+        return {
+            "conceptdoi": f"10.5072/zenodo.{self.conceptrecid}"
+            if self.submitted
+            else None,
+            "conceptrecid": str(self.conceptrecid),
+            "created": self.created,
+            "files": [
+                {
+                    "checksum": file.checksum,
+                    "filename": file.filename,
+                    "id": file.id_,
+                    "filesize": len(file.data),
+                    "links": {
+                        "self": f"{deposition_url}/files/{file.id_}",
+                        "download": f"{base_url}/api/{record_path}/files/"
+                        f"{file.filename}/content",
+                    },
+                }
+                for file in self.files.values()
+            ],
+            "id": self.id_,
+            "metadata": metadata,
+            "modified": datetime.datetime.now(tz=datetime.UTC).isoformat(),
+            "links": {
+                "bucket": None
+                if self.submitted
+                else f"{base_url}/api/files/{self.bucket_id}",
+                "discard": f"{deposition_url}/actions/discard",
+                "edit": f"{deposition_url}/actions/edit",
+                "files": f"{deposition_url}/files",
+                "html": f"{base_url}/deposit/{self.id_}",
+                "latest_draft": f"{base_url}/api/deposit/depositions/"
+                f"{latest_draft_id or self.id_}",
+                "latest_draft_html": f"{base_url}/deposit/{latest_draft_id or self.id_}",
+                "publish": f"{deposition_url}/actions/publish",
+                "self": deposition_url,
+            },
+            "owner": 1,
+            "record_id": self.id_,
+            "record_url": f"{base_url}/records/{self.id_}",
+            "state": "done" if self.submitted else "unsubmitted",
+            "submitted": self.submitted,
+            "title": self.metadata.get("title", ""),
+        }
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response({"status": status, "message": message}, status=status)
+
+
+class FakeZenodo:
+    """In memory fake of the Zenodo API."""
+
+    def __init__(self, config: FakeZenodoConfig | None = None):
+        """Create an empty fake Zenodo server.
+
+        Args:
+            config: Latency, error and bandwidth settings.
+        """
+        self.config = config or FakeZenodoConfig()
+        self.depositions: dict[int, FakeDeposition] = {}
+        self.calls: Counter[str] = Counter()
+        self.errors_injected = 0
+        self.uploads_corrupted = 0
+        self.rate_limited = 0
+        self.bytes_downloaded = 0
+        self._rate_limit_windows: dict[str, tuple[int, int]] = {}
+        self._next_id = 100
+        self._random = random.Random(self.config.seed)  # noqa: S311
+        self.app = web.Application(middlewares=[self._simulate_network])
+        self.app.add_routes(
+            [
+                web.post("/api/deposit/depositions", self.create_deposition),
+                web.get("/api/deposit/depositions/{id}", self.get_deposition),
+                web.put("/api/deposit/depositions/{id}", self.update_deposition),
+                web.delete("/api/deposit/depositions/{id}", self.delete_deposition),
+                web.post("/api/deposit/depositions/{id}/actions/publish", self.publish),
+                web.delete(
+                    "/api/deposit/depositions/{id}/files/{file_id}", self.delete_file
+                ),
+                web.put("/api/files/{bucket_id}/{filename}", self.upload_file),
+                web.get("/api/records/{id}", self.get_record),
+                web.get("/api/records/{id}/versions/latest", self.get_record),
+                web.post("/api/records/{id}/versions", self.new_version),
+                web.get(
+                    "/api/records/{id}/draft/files/{filename}/content",
+                    self.download_file,
+                ),
+                web.get(
+                    "/api/records/{id}/files/{filename}/content", self.download_file
+                ),
+                web.get("/records/{id}/files/{filename}", self.download_file),
+            ]
+        )
+
+    @property
+    def total_calls(self) -> int:
+        """Total number of requests made to the server."""
+        return sum(self.calls.values())
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def _base_url(self, request: web.Request) -> str:
+        return f"{request.scheme}://{request.host}"
+
+    def _latest(self, conceptrecid: int, submitted: bool) -> FakeDeposition | None:
+        versions = [
+            deposition
+            for deposition in self.depositions.values()
+            if deposition.conceptrecid == conceptrecid
+            and deposition.submitted == submitted
+        ]
+        return max(versions, key=lambda d: d.id_) if versions else None
+
+    def _deposition_json(
+        self, request: web.Request, deposition: FakeDeposition, status: int = 200
+    ) -> web.Response:
+        draft = self._latest(deposition.conceptrecid, submitted=False)
+        return web.json_response(
+            deposition.to_json(
+                self._base_url(request), latest_draft_id=draft.id_ if draft else None
+            ),
+            status=status,
+        )
+
+    async def _throttle(self, n_bytes: int):
+        if self.config.bandwidth_bps:
+            await asyncio.sleep(n_bytes / self.config.bandwidth_bps)
+
+    def _rate_limit(self, method: str) -> tuple[dict[str, str], bool]:
+        """Count a request against the rate limit.
+
+        Returns:
+            Rate limit headers to send, and whether the request is over the limit.
+        """
+        if self.config.rate_limit is None:
+            return {}, False
+        budget = "read" if method == "GET" else "write"
+        window_s = self.config.rate_limit_window_s
+        window = int(time.time() // window_s)
+        current, used = self._rate_limit_windows.get(budget, (window, 0))
+        if current != window:
+            used = 0
+        used += 1
+        self._rate_limit_windows[budget] = (window, used)
+        headers = {
+            "X-RateLimit-Limit": str(self.config.rate_limit),
+            "X-RateLimit-Remaining": str(max(self.config.rate_limit - used, 0)),
+            "X-RateLimit-Reset": str((window + 1) * window_s),
+        }
+        return headers, used > self.config.rate_limit
+
+    @web.middleware
+    async def _simulate_network(self, request: web.Request, handler):
+        resource = request.match_info.route.resource
+        self.calls[
+            f"{request.method} {resource.canonical if resource else request.path}"
+        ] += 1
+        if self.config.latency_s:
+            await asyncio.sleep(self.config.latency_s)
+        rate_limit_headers, rate_limited = self._rate_limit(request.method)
+        if rate_limited:
+            self.rate_limited += 1
+            response = _error(429, "Too many requests")
+        elif self._random.random() < self.config.error_rate:
+            self.errors_injected += 1
+            response = _error(500, "Injected error")
+        else:
+            response = await handler(request)
+        response.headers.update(rate_limit_headers)
+        return response
+
+    def _get(self, request: web.Request) -> FakeDeposition:
+        deposition_id = int(request.match_info["id"])
+        if deposition_id not in self.depositions:
+            raise web.HTTPNotFound(
+                text='{"status": 404, "message": "PID does not exist."}',
+                content_type="application/json",
+            )
+        return self.depositions[deposition_id]
+
+    async def create_deposition(self, request: web.Request) -> web.Response:
+        """Create a new deposition, reserving a concept record ID first."""
+        payload = await request.json()
+        conceptrecid = self._new_id()
+        deposition = FakeDeposition(
+            id_=self._new_id(), conceptrecid=conceptrecid, metadata=payload["metadata"]
+        )
+        self.depositions[deposition.id_] = deposition
+        return self._deposition_json(request, deposition, status=201)
+
+    async def get_deposition(self, request: web.Request) -> web.Response:
+        """Get a deposition by ID."""
+        return self._deposition_json(request, self._get(request))
+
+    async def update_deposition(self, request: web.Request) -> web.Response:
+        """Update the metadata of a draft deposition."""
+        deposition = self._get(request)
+        if deposition.submitted:
+            return _error(400, "Published depositions can't be edited.")
+        payload = await request.json()
+        deposition.metadata = payload["metadata"]
+        return self._deposition_json(request, deposition)
+
+    async def delete_deposition(self, request: web.Request) -> web.Response:
+        """Delete a draft deposition."""
+        deposition = self._get(request)
+        if deposition.submitted:
+            return _error(403, "Published depositions can't be deleted.")
+        del self.depositions[deposition.id_]
+        return web.Response(status=204)
+
+    async def publish(self, request: web.Request) -> web.Response:
+        """Publish a draft deposition."""
+        deposition = self._get(request)
+        deposition.submitted = True
+        deposition.metadata = deposition.metadata | {
+            "publication_date": datetime.date.today().isoformat()
+        }
+        return self._deposition_json(request, deposition, status=202)
+
+    async def delete_file(self, request: web.Request) -> web.Response:
+        """Delete a file from a draft deposition."""
+        deposition = self._get(request)
+        for filename, file in list(deposition.files.items()):
+            if file.id_ == request.match_info["file_id"]:
+                del deposition.files[filename]
+                return web.Response(status=204)
+        return _error(404, "File does not exist.")
+
+    async def upload_file(self, request: web.Request) -> web.Response:
+        """Upload a file to a deposition bucket, replacing any file with the same name."""
+        bucket_id = request.match_info["bucket_id"]
+        filename = request.match_info["filename"]
+        deposition = next(
+            (
+                deposition
+                for deposition in self.depositions.values()
+                if deposition.bucket_id == bucket_id and not deposition.submitted
+            ),
+            None,
+        )
+        if deposition is None:
+            return _error(404, "Bucket does not exist.")
+        chunks = []
+        async for chunk in request.content.iter_chunked(2**16):
+            await self._throttle(len(chunk))
+            chunks.append(chunk)
+        data = b"".join(chunks)
+        if (
+            self.config.corrupt_rate
+            and self._random.random() < self.config.corrupt_rate
+        ):
+            self.uploads_corrupted += 1
+            data = data[:-1]
+        file = FakeFile(id_=uuid.uuid4().hex, filename=filename, data=data)
+        deposition.files[filename] = file
+        now = datetime.datetime.now(tz=datetime.UTC).isoformat()
+        return web.json_response(
+            {
+                "key": filename,
+                "mimetype": "application/octet-stream",
+                "checksum": f"md5:{file.checksum}",
+                "version_id": file.id_,
+                "size": len(file.data),
+                "created": now,
+                "updated": now,
+                "links": {},
+                "is_head": True,
+                "delete_marker": False,
+            },
+            status=201,
+        )
+
+    async def download_file(self, request: web.Request) -> web.StreamResponse:
+        """Download a file from a deposition."""
+        deposition = self._get(request)
+        if not (file := deposition.files.get(request.match_info["filename"])):
+            return _error(404, "File does not exist.")
+        data = file.data
+        headers = {"Content-Type": "application/octet-stream"}
+        status = 200
+        if "Range" in request.headers:
+            byte_range = request.http_range
+            start, stop, _ = byte_range.indices(len(file.data))
+            data = file.data[byte_range]
+            headers["Content-Range"] = f"bytes {start}-{stop - 1}/{len(file.data)}"
+            status = 206
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_length = len(data)
+        await response.prepare(request)
+        for start in range(0, len(data), 2**16):
+            chunk = data[start : start + 2**16]
+            await self._throttle(len(chunk))
+            self.bytes_downloaded += len(chunk)
+            await response.write(chunk)
+        await response.write_eof()
+        return response
+
+    async def get_record(self, request: web.Request) -> web.Response:
+        """Get the latest published version of a record or concept record."""
+        record_id = int(request.match_info["id"])
+        conceptrecid = (
+            self.depositions[record_id].conceptrecid
+            if record_id in self.depositions
+            else record_id
+        )
+        if not (record := self._latest(conceptrecid, submitted=True)):
+            return _error(404, "Record does not exist.")
+        return web.json_response(
+            {
+                "id": record.id_,
+                "links": record.to_json(self._base_url(request))["links"],
+            }
+        )
+
+    async def new_version(self, request: web.Request) -> web.Response:
+        """Create a new draft from a published record, or return the existing draft."""
+        published = self._get(request)
+        draft = self._latest(published.conceptrecid, submitted=False)
+        if draft is None:
+            draft = FakeDeposition(
+                id_=self._new_id(),
+                conceptrecid=published.conceptrecid,
+                metadata={
+                    key: value
+                    for key, value in published.metadata.items()
+                    if key not in ("doi", "publication_date")
+                },
+                files=dict(published.files),
+            )
+            self.depositions[draft.id_] = draft
+        return web.json_response(
+            {"id": draft.id_, "links": draft.to_json(self._base_url(request))["links"]},
+            status=201,
+        )
+
+
+class _FakeZenodoResolver(AbstractResolver):
+    """Resolve every hostname and port to a fake server on the local machine."""
+
+    def __init__(self, server_port: int):
+        self.server_port = server_port
+
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> list[ResolveResult]:
+        return [
+            {
+                "hostname": host,
+                "host": "127.0.0.1",
+                "port": self.server_port,
+                "family": socket.AF_INET,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST,
+            }
+        ]
+
+    async def close(self) -> None:
+        pass
+
+
+async def start_fake_zenodo(fake: FakeZenodo) -> TestServer:
+    """Start serving a fake Zenodo on a free local port."""
+    server = TestServer(fake.app, host="127.0.0.1")
+    await server.start_server()
+    return server
+
+
+def fake_zenodo_session(server: TestServer) -> aiohttp.ClientSession:
+    """Create a session that sends requests for any host to a running fake server."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(resolver=_FakeZenodoResolver(server.port))
+    )
+
+
+def fake_zenodo_url() -> str:
+    """Return the base URL clients should use to reach the fake server."""
+    return f"http://{FAKE_ZENODO_HOST}"
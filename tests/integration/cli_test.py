@@ -10,6 +10,7 @@ from pudl_archiver.archivers.eia.eia860 import Eia860Archiver
 from pudl_archiver.archivers.ferc.ferc1 import Ferc1Archiver
 from pudl_archiver.archivers.validate import RunSummary, ValidationTestResult
 from pudl_archiver.cli import pudl_archiver
+from pudl_archiver.journal import RunJournal
 from pudl_archiver.utils import RunSettings
 
 
@@ -152,3 +153,89 @@ def test_publish_run_rejects_unsuccessful_run(
         )
 
     archive_dataset_mock.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    "args,expected_depositor_args",
+    [
+        (
+            ["archive", "batch", "eia860", "ferc1", "--sandbox"],
+            {"eia860": {"sandbox": True}, "ferc1": {"sandbox": True}},
+        ),
+        (
+            [
+                "archive",
+                "batch",
+                "eia860",
+                "ferc1",
+                "--depositor",
+                "fsspec",
+                "--deposition-path",
+                "gs://bucket/",
+            ],
+            {
+                "eia860": {"deposition_path": "gs://bucket/eia860"},
+                "ferc1": {"deposition_path": "gs://bucket/ferc1"},
+            },
+        ),
+    ],
+)
+def test_batch(args, expected_depositor_args, mocker):
+    """``archive batch`` should build separate run settings for each dataset."""
+    archive_datasets_mock = unittest.mock.MagicMock()
+    mocker.patch("pudl_archiver.cli.archive_datasets", new=archive_datasets_mock)
+    mocker.patch("pudl_archiver.cli.asyncio.run")
+
+    result = CliRunner().invoke(pudl_archiver, args, catch_exceptions=False)
+
+    assert result.exit_code == 0
+    run_settings = archive_datasets_mock.call_args.kwargs["run_settings"]
+    assert {
+        dataset: settings.depositor_args for dataset, settings in run_settings.items()
+    } == expected_depositor_args
+    assert run_settings["ferc1"].summary_file == "ferc1_run_summary.json"
+    assert run_settings["ferc1"].journal_file == "ferc1_run_journal.jsonl"
+
+    CliRunner().invoke(pudl_archiver, [*args, "--no-journal"], catch_exceptions=False)
+    run_settings = archive_datasets_mock.call_args.kwargs["run_settings"]
+    assert run_settings["ferc1"].journal_file is None
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["archive", "batch"],
+        ["archive", "batch", "--all", "eia860"],
+        ["archive", "batch", "not_a_dataset"],
+        ["archive", "batch", "eia860", "--depositor", "fsspec"],
+    ],
+)
+def test_batch_bad_args(args, mocker):
+    """``archive batch`` should reject bad combinations of datasets and options."""
+    archive_datasets_mock = unittest.mock.MagicMock()
+    mocker.patch("pudl_archiver.cli.archive_datasets", new=archive_datasets_mock)
+
+    result = CliRunner().invoke(pudl_archiver, args)
+
+    assert result.exit_code == 2
+    archive_datasets_mock.assert_not_called()
+
+
+def test_resume(tmp_path, mocker):
+    """``resume`` should rerun the journaled dataset with the journal's settings."""
+    journal_path = tmp_path / "eia860_run_journal.jsonl"
+    settings = RunSettings(auto_publish=True, depositor="fsspec", only_years=[2020])
+    RunJournal.create(journal_path, "eia860", settings)
+    archive_dataset_mock = unittest.mock.MagicMock()
+    mocker.patch("pudl_archiver.cli.archive_dataset", new=archive_dataset_mock)
+    mocker.patch("pudl_archiver.cli.asyncio.run")
+
+    result = CliRunner().invoke(
+        pudl_archiver, ["resume", str(journal_path)], catch_exceptions=False
+    )
+
+    assert result.exit_code == 0
+    kwargs = archive_dataset_mock.call_args.kwargs
+    assert kwargs["dataset"] == "eia860"
+    assert kwargs["run_settings"] == settings.model_copy(update={"auto_publish": False})
+    assert kwargs["journal"].path == journal_path
@@ -0,0 +1,54 @@
+"""Shared fixtures for integration tests."""
+
+import functools
+
+import pytest
+
+from pudl_archiver.depositors.zenodo.entities import (
+    DepositionCreator,
+    DepositionMetadata,
+)
+from pudl_archiver.metadata.constants import LICENSES
+from pudl_archiver.utils import retry_async
+
+
+@pytest.fixture()
+def zenodo_env(tmp_path, monkeypatch, mocker):
+    """Set up fake tokens, DOI settings and data source metadata."""
+    monkeypatch.setenv("ZENODO_SANDBOX_TOKEN_UPLOAD", "fake-upload-token")
+    monkeypatch.setenv("ZENODO_SANDBOX_TOKEN_PUBLISH", "fake-publish-token")
+
+    # Don't write DOIs of fake depositions to the real settings file
+    (tmp_path / "zenodo_doi.yaml").write_text("pudl_test:\n    sandbox_doi: null\n")
+    mocker.patch(
+        "pudl_archiver.depositors.zenodo.depositor.importlib.resources.files",
+        return_value=tmp_path,
+    )
+    mocker.patch(
+        "pudl_archiver.depositors.zenodo.entities.DepositionMetadata.from_data_source",
+        return_value=DepositionMetadata(
+            title="PUDL Test",
+            creators=[DepositionCreator(name="Catalyst Cooperative")],
+            description="Test dataset for the fake Zenodo server.",
+            version="1.0.0",
+            license="cc-zero",
+            keywords=["test"],
+        ),
+    )
+    mocker.patch(
+        "pudl_archiver.frictionless.get_pudl_sources",
+        return_value={
+            "pudl_test": {
+                "name": "pudl_test",
+                "title": "Pudl Test",
+                "path": "https://fake.link",
+                "license_raw": LICENSES["cc-by-4.0"],
+                "contributors": [],
+            }
+        },
+    )
+    # Don't wait between retries of failed requests
+    mocker.patch(
+        "pudl_archiver.depositors.zenodo.depositor.retry_async",
+        new=functools.partial(retry_async, retry_base_s=0),
+    )
@@ -0,0 +1,140 @@
+"""Benchmark fsspec depositor operations against a local filesystem.
+
+These tests create thousands of small files to make the cost of per-file overhead in
+the depositor visible. They log throughput so regressions can be spotted, and assert
+on the number of expensive filesystem operations rather than on wall-clock time, so
+they stay deterministic on slow CI runners.
+"""
+
+import hashlib
+import io
+import logging
+import time
+
+import pytest
+
+from pudl_archiver.depositors import fsspec as fsspec_depositor
+from pudl_archiver.depositors.fsspec import (
+    Deposition,
+    DepositionDirectory,
+    FsspecAPIClient,
+    FsspecDraftDeposition,
+)
+from pudl_archiver.metadata.constants import LICENSES
+from pudl_archiver.utils import RunSettings
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+N_FILES = 2000
+
+
+@pytest.fixture()
+async def draft(tmp_path) -> FsspecDraftDeposition:
+    """Create a new draft deposition on the local filesystem."""
+    deposition_path = tmp_path / "deposition"
+    settings = RunSettings(
+        initialize=True,
+        depositor="fsspec",
+        depositor_args={"deposition_path": str(deposition_path)},
+    )
+    api_client = await FsspecAPIClient.initialize_client(
+        session=None, deposition_path=str(deposition_path)
+    )
+    return await FsspecDraftDeposition.new_draft(
+        settings=settings, api_client=api_client, dataset_id="pudl_test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_file_listing(draft, mocker):
+    """Writing files to a draft should not re-list the deposition after each write."""
+    list_spy = mocker.spy(Deposition, "list_directory")
+
+    start = time.perf_counter()
+    for i in range(N_FILES):
+        draft = await draft.create_file(
+            f"file_{i}.csv", io.BytesIO(f"a,b\n{i},{i}\n".encode())
+        )
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Created {N_FILES} files in {elapsed:.2f}s ({N_FILES / elapsed:.0f} files/s)"
+    )
+
+    assert list_spy.call_count == 0
+    assert len(draft.deposition.deposition_files[DepositionDirectory.WORKSPACE]) == (
+        N_FILES
+    )
+    assert len(await draft.list_files()) == N_FILES
+
+    start = time.perf_counter()
+    published = await draft.publish()
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Published {N_FILES} files in {elapsed:.2f}s ({N_FILES / elapsed:.0f} files/s)"
+    )
+
+    # A single full listing of the workspace right before publishing
+    assert list_spy.call_count == 1
+    assert len(await published.list_files()) == N_FILES
+    assert (
+        len(
+            list(
+                published.deposition.get_deposition_path(
+                    DepositionDirectory.BLOBS
+                ).iterdir()
+            )
+        )
+        == N_FILES
+    )
+
+
+@pytest.mark.asyncio
+async def test_generate_datapackage_checksums(draft, mocker):
+    """Datapackage generation should reuse checksums instead of re-reading files."""
+    mocker.patch(
+        "pudl_archiver.frictionless.get_pudl_sources",
+        return_value={
+            "pudl_test": {
+                "name": "pudl_test",
+                "title": "Pudl Test",
+                "path": "https://fake.link",
+                "license_raw": LICENSES["cc-by-4.0"],
+                "contributors": [],
+            }
+        },
+    )
+    n_files = 150
+    contents = {f"ferceqr-{i}.csv": f"a,b\n{i},{i}\n".encode() for i in range(n_files)}
+    for filename, data in contents.items():
+        draft = await draft.create_file(filename, io.BytesIO(data))
+    partitions = {filename: {} for filename in contents}
+
+    md5_spy = mocker.spy(fsspec_depositor, "compute_md5")
+    start = time.perf_counter()
+    datapackage = draft.generate_datapackage(partitions)
+    logger.info(
+        f"Generated datapackage for {n_files} new files in "
+        f"{time.perf_counter() - start:.2f}s"
+    )
+    assert md5_spy.call_count == 0
+    assert {
+        resource.name: (resource.hash_, resource.bytes_)
+        for resource in datapackage.resources
+    } == {
+        filename: (hashlib.md5(data).hexdigest(), len(data))  # noqa: S324
+        for filename, data in contents.items()
+    }
+
+    # A new draft of the published deposition gets checksums from the version
+    # manifest, so it shouldn't need to list any directories
+    published = await draft.publish()
+    new_draft = await published.open_draft()
+    ls_spy = mocker.spy(type(new_draft.deposition.deposition_path.fs), "ls")
+    start = time.perf_counter()
+    new_datapackage = new_draft.generate_datapackage(partitions)
+    logger.info(
+        f"Generated datapackage for {n_files} published files in "
+        f"{time.perf_counter() - start:.2f}s"
+    )
+    assert ls_spy.call_count == 0
+    assert new_datapackage.resources == datapackage.resources
@@ -1,12 +1,28 @@
 """Test fsspec based depositor backend."""
 
+import asyncio
+import hashlib
+import io
 import json
+import os
 import tempfile
+import zipfile
 from pathlib import Path
 
 import pytest
+from fsspec.implementations.memory import MemoryFileSystem
 
 from pudl_archiver.archivers.classes import AbstractDatasetArchiver, ResourceInfo
+from pudl_archiver.depositors import fsspec
+from pudl_archiver.depositors.fsspec import (
+    PUBLISH_MANIFEST,
+    DepositionDirectory,
+    FsspecAPIClient,
+    FsspecDraftDeposition,
+    FsspecPublishedDeposition,
+)
+from pudl_archiver.depositors.multipart import ComposeMultipartUpload
+from pudl_archiver.journal import RunJournal
 from pudl_archiver.metadata.constants import LICENSES
 from pudl_archiver.orchestrator import orchestrate_run
 from pudl_archiver.utils import RunSettings
@@ -58,6 +74,27 @@ def test_files():
         yield files
 
 
+def _latest_version(deposition_path: Path) -> dict | None:
+    """Read the manifest of the most recent published version of a deposition."""
+    versions = sorted(
+        (deposition_path / "versions").glob("*.json"),
+        key=lambda path: tuple(int(part) for part in path.stem.split(".")),
+    )
+    return json.loads(versions[-1].read_text()) if versions else None
+
+
+def _is_published(deposition_path: Path, filename: str) -> bool:
+    """Check whether a file is in the most recent published version."""
+    manifest = _latest_version(deposition_path)
+    return manifest is not None and filename in manifest["files"]
+
+
+def _read_published(deposition_path: Path, filename: str) -> bytes:
+    """Read a file from the most recent published version."""
+    md5_hash = _latest_version(deposition_path)["files"][filename]["md5_hash"]
+    return (deposition_path / "blobs" / md5_hash / filename).read_bytes()
+
+
 @pytest.fixture()
 def datasource(mocker):
     """Create fake datasource for testing."""
@@ -148,8 +185,8 @@ async def test_retry_run_bad_zip(
 
     assert retry_part == v1_summary.failed_partitions["bad.zip"]
     assert ok_part == v1_summary.successful_partitions["good.zip"]
-    assert not (deposition_path / "published" / "bad.zip").exists()
-    assert not (deposition_path / "published" / "good.zip").exists()
+    assert not _is_published(deposition_path, "bad.zip")
+    assert not _is_published(deposition_path, "good.zip")
     assert (deposition_path / "workspace" / "bad.zip").exists()
     assert (deposition_path / "workspace" / "good.zip").exists()
     assert not v1_summary.success
@@ -165,8 +202,104 @@ async def test_retry_run_bad_zip(
     )
     assert not v2_downloader.good_downloaded
     assert v2_summary.success
-    assert (deposition_path / "published" / "bad.zip").exists()
-    assert (deposition_path / "published" / "good.zip").exists()
+    assert _is_published(deposition_path, "bad.zip")
+    assert _is_published(deposition_path, "good.zip")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("partitioned", [True, False])
+async def test_resume_from_journal(
+    good_zipfile,
+    fixed_bad_zipfile,
+    tmp_path,
+    datasource: dict,
+    mocker,
+    partitioned: bool,
+):
+    """Test resuming a run that was killed part way through from its journal.
+
+    The first run is interrupted by an exception that isn't caught by the
+    orchestrator, like the process being killed, so it never writes a run summary.
+    Resuming from the journal should skip the resource that was already added to the
+    draft, and publish both resources. Archivers that don't return partitions can't
+    skip downloading it, but shouldn't add it to the draft again.
+    """
+    deposition_path = tmp_path / "deposition"
+    deposition_path.mkdir()
+    journal_path = tmp_path / "journal.jsonl"
+
+    settings = RunSettings(
+        auto_publish=True,
+        initialize=True,
+        depositor="fsspec",
+        depositor_args={"deposition_path": str(deposition_path)},
+        journal_file=str(journal_path),
+    )
+    ok_part = {"part": "ok_part"}
+    killed_part = {"part": "killed_part"}
+
+    class KilledError(BaseException):
+        pass
+
+    class TestDownloader(AbstractDatasetArchiver):
+        name = "Test Downloader"
+
+        def __init__(self, killed: bool, **kwargs):
+            super().__init__(**kwargs)
+            self.killed = killed
+            self.downloaded = []
+
+        async def get_resources(self):
+            for zip_path, parts in [
+                (good_zipfile, ok_part),
+                (fixed_bad_zipfile, killed_part),
+            ]:
+                resource = self.get_zipfile(zip_path, parts=parts)
+                yield (resource, parts) if partitioned else resource
+
+        async def get_zipfile(self, zip_path, parts):
+            if parts == killed_part and self.killed:
+                # Wait for the other resource to be added to the draft first
+                await asyncio.sleep(0.1)
+                raise KilledError
+            self.downloaded.append(zip_path.name)
+            return ResourceInfo(local_path=zip_path, partitions=parts)
+
+    with pytest.raises(KilledError):
+        await orchestrate_run(
+            dataset="pudl_test",
+            downloader=TestDownloader(killed=True, session="session"),
+            run_settings=settings,
+            session="session",
+            journal=RunJournal.create(journal_path, "pudl_test", settings),
+        )
+
+    journal = RunJournal.load(journal_path)
+    assert [entry.name for entry in journal.resources] == ["good.zip"]
+    assert journal.resources[0].partitions == ok_part
+    assert journal.resources[0].action == "CREATE"
+
+    downloader = TestDownloader(killed=False, session="session")
+    add_spy = mocker.spy(FsspecDraftDeposition, "add_resource")
+    summary, _ = await orchestrate_run(
+        dataset="pudl_test",
+        downloader=downloader,
+        run_settings=journal.start.run_settings,
+        session="session",
+        journal=journal,
+    )
+    if partitioned:
+        assert downloader.downloaded == ["bad.zip"]
+    else:
+        assert sorted(downloader.downloaded) == ["bad.zip", "good.zip"]
+    assert [call.args[1] for call in add_spy.call_args_list] == ["bad.zip"]
+    assert summary.success
+    assert _is_published(deposition_path, "good.zip")
+    assert _is_published(deposition_path, "bad.zip")
+    assert [entry.name for entry in RunJournal.load(journal_path).resources] == [
+        "good.zip",
+        "bad.zip",
+    ]
 
 
 @pytest.mark.asyncio
@@ -233,8 +366,8 @@ async def test_retry_run_exception(
     with (tmp_path / "run_summary.json").open("w") as f:
         f.write(json.dumps([v1_summary.model_dump()], indent=2))
 
-    assert not (deposition_path / "published" / "bad.zip").exists()
-    assert not (deposition_path / "published" / "good.zip").exists()
+    assert not _is_published(deposition_path, "bad.zip")
+    assert not _is_published(deposition_path, "good.zip")
     assert not (deposition_path / "workspace" / "bad.zip").exists()
     assert not v1_summary.success
     assert not next(
@@ -253,8 +386,8 @@ async def test_retry_run_exception(
         skip_partitions=v1_summary.successful_partitions,
     )
     assert v2_summary.success
-    assert (deposition_path / "published" / "bad.zip").exists()
-    assert (deposition_path / "published" / "good.zip").exists()
+    assert _is_published(deposition_path, "bad.zip")
+    assert _is_published(deposition_path, "good.zip")
 
 
 @pytest.mark.asyncio
@@ -314,7 +447,7 @@ async def test_retry_run_unpartitioned(
     with (tmp_path / "run_summary.json").open("w") as f:
         f.write(json.dumps([v1_summary.model_dump()], indent=2))
 
-    assert not (deposition_path / "published" / "good.zip").exists()
+    assert not _is_published(deposition_path, "good.zip")
     assert not v1_summary.success
     assert not next(
         test
@@ -332,7 +465,7 @@ async def test_retry_run_unpartitioned(
         skip_partitions=v1_summary.successful_partitions,
     )
     assert v2_summary.success
-    assert (deposition_path / "published" / "good.zip").exists()
+    assert _is_published(deposition_path, "good.zip")
 
 
 @pytest.mark.asyncio
@@ -402,8 +535,8 @@ async def test_publish_run(
     assert v1_summary.failed_partitions == {}
     assert good_part == v1_summary.successful_partitions["good.zip"]
     assert other_part == v1_summary.successful_partitions["bad.zip"]
-    assert not (deposition_path / "published" / "good.zip").exists()
-    assert not (deposition_path / "published" / "bad.zip").exists()
+    assert not _is_published(deposition_path, "good.zip")
+    assert not _is_published(deposition_path, "bad.zip")
     assert (deposition_path / "workspace" / "good.zip").exists()
     assert (deposition_path / "workspace" / "bad.zip").exists()
 
@@ -419,8 +552,8 @@ async def test_publish_run(
         skip_partitions=v1_summary.successful_partitions,
     )
     assert v2_summary.success
-    assert (deposition_path / "published" / "good.zip").exists()
-    assert (deposition_path / "published" / "bad.zip").exists()
+    assert _is_published(deposition_path, "good.zip")
+    assert _is_published(deposition_path, "bad.zip")
 
 
 @pytest.mark.asyncio
@@ -442,9 +575,10 @@ async def test_fsspec_depositor(
 
     def verify_files(expected, deposition_path: Path):
         for file_data in expected:
-            assert (deposition_path / file_data["path"].name).read_bytes() == file_data[
-                "contents"
-            ]
+            assert (
+                _read_published(deposition_path, file_data["path"].name)
+                == file_data["contents"]
+            )
 
     class TestDownloader(AbstractDatasetArchiver):
         name = "Test Downloader"
@@ -477,4 +611,389 @@ async def test_fsspec_depositor(
         session="session",
     )
     assert v1_summary.success
-    verify_files(test_files["original"], tmp_path / "published")
+    verify_files(test_files["original"], tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_resume_interrupted_publish(tmp_path, mocker):
+    """An interrupted publish should be finished when the deposition is next opened."""
+    deposition_path = tmp_path / "deposition"
+    settings = RunSettings(
+        initialize=True,
+        depositor="fsspec",
+        depositor_args={"deposition_path": str(deposition_path)},
+    )
+    api_client = await FsspecAPIClient.initialize_client(
+        session=None, deposition_path=str(deposition_path), publish_concurrency=2
+    )
+    draft = await FsspecDraftDeposition.new_draft(
+        settings=settings, api_client=api_client, dataset_id="pudl_test"
+    )
+    for i in range(5):
+        draft = await draft.create_file(
+            f"file_{i}.csv", io.BytesIO(f"a,b\n{i},{i}\n".encode())
+        )
+
+    # Fail partway through moving files to blobs
+    fs = draft.deposition.deposition_path.fs
+    original_mv = fs.mv
+    moves = 0
+
+    def flaky_mv(*args, **kwargs):
+        nonlocal moves
+        moves += 1
+        if moves > 2:
+            raise OSError("Simulated crash")
+        return original_mv(*args, **kwargs)
+
+    mocker.patch.object(fs, "mv", side_effect=flaky_mv)
+    with pytest.raises(OSError, match="Simulated crash"):
+        await draft.publish()
+    assert (deposition_path / PUBLISH_MANIFEST).exists()
+    assert len(list((deposition_path / "workspace").iterdir())) < 5
+
+    mocker.patch.object(fs, "mv", side_effect=original_mv)
+    published = await FsspecPublishedDeposition.get_most_recent_version(
+        settings=settings, api_client=api_client, dataset_id="pudl_test"
+    )
+    assert not (deposition_path / PUBLISH_MANIFEST).exists()
+    assert sorted(await published.list_files()) == [f"file_{i}.csv" for i in range(5)]
+    assert list((deposition_path / "workspace").iterdir()) == []
+
+
+async def _publish_files(
+    api_client: FsspecAPIClient, settings: RunSettings, files: dict[str, bytes]
+) -> FsspecPublishedDeposition:
+    """Publish a new version of a deposition containing exactly ``files``."""
+    draft = await FsspecDraftDeposition.new_draft(
+        settings=settings, api_client=api_client, dataset_id="pudl_test"
+    )
+    for filename in await draft.list_files():
+        if filename not in files:
+            draft = await draft.delete_file(filename)
+    for filename, data in files.items():
+        if draft.get_checksum(filename) != hashlib.md5(data).hexdigest():  # noqa: S324
+            draft = await draft.create_file(filename, io.BytesIO(data))
+    return await draft.publish()
+
+
+@pytest.mark.asyncio
+async def test_versioned_layout(tmp_path, datasource: dict, mocker):
+    """Published versions should share unchanged blobs and stay readable."""
+    deposition_path = tmp_path / "deposition"
+    settings = RunSettings(
+        initialize=True,
+        depositor="fsspec",
+        depositor_args={"deposition_path": str(deposition_path)},
+    )
+    api_client = await FsspecAPIClient.initialize_client(
+        session=None, deposition_path=str(deposition_path)
+    )
+    v1_files = {"unchanged.csv": b"a,b\n1,2\n", "updated.csv": b"a,b\n3,4\n"}
+    v1 = await _publish_files(api_client, settings, v1_files)
+    assert v1.deposition.published_version.version == "1.0.0"
+
+    v2_files = {"unchanged.csv": b"a,b\n1,2\n", "updated.csv": b"a,b\n5,6\n"}
+    mv_spy = mocker.spy(type(v1.deposition.deposition_path.fs), "mv")
+    v2 = await _publish_files(api_client, settings, v2_files)
+    assert v2.deposition.published_version.version == "2.0.0"
+    # Only the updated file should be moved into blobs
+    assert mv_spy.call_count == 1
+    assert len(list((deposition_path / "blobs").iterdir())) == 3
+    for filename, data in v2_files.items():
+        assert await v2.get_file(filename) == data
+
+    # Previous version is still intact
+    v1_manifest = json.loads((deposition_path / "versions" / "1.0.0.json").read_text())
+    for filename, data in v1_files.items():
+        md5_hash = v1_manifest["files"][filename]["md5_hash"]
+        assert (deposition_path / "blobs" / md5_hash / filename).read_bytes() == data
+
+    # Datapackage paths keep the original filenames
+    draft = await v2.open_draft()
+    datapackage = draft.generate_datapackage({filename: {} for filename in v2_files})
+    for resource in datapackage.resources:
+        assert str(resource.path).endswith(f"/{resource.name}")
+
+    # Nothing is unreferenced until a version is deleted
+    assert api_client.prune_blobs() == []
+    (deposition_path / "versions" / "1.0.0.json").unlink()
+    old_hash = hashlib.md5(v1_files["updated.csv"]).hexdigest()  # noqa: S324
+    old_blob = f"{old_hash}/updated.csv"
+    assert api_client.prune_blobs(dry_run=True) == [old_blob]
+    assert (deposition_path / "blobs" / old_blob).exists()
+    assert api_client.prune_blobs() == [old_blob]
+    assert not (deposition_path / "blobs" / old_hash).exists()
+    for filename, data in v2_files.items():
+        assert await v2.get_file(filename) == data
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_deposition(tmp_path, mocker):
+    """Depositions in the old ``published/`` layout should be migrated on publish."""
+    deposition_path = tmp_path / "deposition"
+    (deposition_path / "published").mkdir(parents=True)
+    (deposition_path / "published" / "old.csv").write_bytes(b"a,b\n1,2\n")
+    settings = RunSettings(
+        initialize=False,
+        depositor="fsspec",
+        depositor_args={"deposition_path": str(deposition_path)},
+    )
+    api_client = await FsspecAPIClient.initialize_client(
+        session=None, deposition_path=str(deposition_path)
+    )
+    legacy = await FsspecPublishedDeposition.get_most_recent_version(
+        settings=settings, api_client=api_client, dataset_id="pudl_test"
+    )
+    assert await legacy.list_files() == ["old.csv"]
+    assert await legacy.get_file("old.csv") == b"a,b\n1,2\n"
+    # Reading the deposition doesn't write to it
+    assert not (deposition_path / "versions").exists()
+    # The legacy files are hashed once, and their manifest is saved by a draft
+    await legacy.open_draft()
+    assert (deposition_path / "versions" / "0.1.0.json").exists()
+    md5_spy = mocker.spy(fsspec, "compute_md5")
+    legacy = await FsspecPublishedDeposition.get_most_recent_version(
+        settings=settings, api_client=api_client, dataset_id="pudl_test"
+    )
+    assert await legacy.get_file("old.csv") == b"a,b\n1,2\n"
+    md5_spy.assert_not_called()
+
+    published = await _publish_files(
+        api_client, settings, {"old.csv": b"a,b\n1,2\n", "new.csv": b"a,b\n3,4\n"}
+    )
+    assert published.deposition.published_version.version == "1.0.0"
+    assert list((deposition_path / "published").iterdir()) == []
+    assert sorted(path.name for path in (deposition_path / "versions").iterdir()) == [
+        "0.1.0.json",
+        "1.0.0.json",
+    ]
+    assert await published.get_file("old.csv") == b"a,b\n1,2\n"
+    assert await published.get_file("new.csv") == b"a,b\n3,4\n"
+
+
+@pytest.fixture()
+async def multipart_draft(tmp_path, mocker) -> FsspecDraftDeposition:
+    """Create a draft on the in memory filesystem that uploads in small parts.
+
+    The in memory filesystem stands in for GCS, combining parts like ``compose``.
+    """
+    deposition_path = f"memory://{tmp_path.name}/deposition"
+    mocker.patch(
+        "pudl_archiver.depositors.multipart.COMPOSE_PROTOCOLS", ("gs", "memory")
+    )
+
+    def merge(self, path, paths):
+        self.pipe_file(path, b"".join(self.cat_file(part) for part in paths))
+
+    mocker.patch.object(MemoryFileSystem, "merge", merge, create=True)
+    settings = RunSettings(
+        initialize=True,
+        depositor="fsspec",
+        depositor_args={"deposition_path": deposition_path},
+    )
+    api_client = await FsspecAPIClient.initialize_client(
+        session=None,
+        deposition_path=deposition_path,
+        multipart_part_size=1024,
+        multipart_concurrency=3,
+    )
+    return await FsspecDraftDeposition.new_draft(
+        settings=settings, api_client=api_client, dataset_id="pudl_test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_multipart_upload(multipart_draft, mocker):
+    """Files larger than a part should be uploaded in parts and reassembled."""
+    data = os.urandom(10 * 1024 + 100)
+    part_spy = mocker.spy(ComposeMultipartUpload, "upload_part")
+    draft = await multipart_draft.create_file("large.bin", io.BytesIO(data))
+    small_draft = await draft.create_file("small.bin", io.BytesIO(b"small"))
+
+    assert part_spy.call_count == 11
+    assert await small_draft.get_file("large.bin") == data
+    assert await small_draft.get_file("small.bin") == b"small"
+    assert draft.get_checksum("large.bin") == hashlib.md5(data).hexdigest()  # noqa: S324
+    assert draft.file_metadata["large.bin"].size == len(data)
+    assert (
+        not draft.deposition.get_deposition_path(DepositionDirectory.PARTS)
+        .joinpath("large.bin")
+        .exists()
+    )
+
+
+@pytest.mark.asyncio
+async def test_multipart_upload_retry(multipart_draft, mocker):
+    """A failed part should be retried on its own, and abort the upload if it can't succeed."""
+    mocker.patch("pudl_archiver.depositors.multipart.PART_RETRY_BASE_S", 0)
+    mocker.patch("pudl_archiver.depositors.multipart.PART_RETRY_COUNT", 2)
+    original_upload_part = ComposeMultipartUpload.upload_part
+    failures = []
+
+    async def flaky_upload_part(self, part_number, data):
+        if part_number == 3 and len(failures) < max_failures:
+            failures.append(part_number)
+            raise OSError("Simulated upload failure")
+        return await original_upload_part(self, part_number, data)
+
+    mocker.patch.object(ComposeMultipartUpload, "upload_part", flaky_upload_part)
+    data = os.urandom(5 * 1024)
+
+    max_failures = 1
+    draft = await multipart_draft.create_file("retried.bin", io.BytesIO(data))
+    assert failures == [3]
+    assert await draft.get_file("retried.bin") == data
+
+    failures.clear()
+    max_failures = 2
+    with pytest.raises(OSError, match="Simulated upload failure"):
+        await draft.create_file("failed.bin", io.BytesIO(data))
+    parts_path = draft.deposition.get_deposition_path(DepositionDirectory.PARTS)
+    assert not (parts_path / "failed.bin").exists()
+    assert not (
+        draft.deposition.get_deposition_path(DepositionDirectory.WORKSPACE)
+        / "failed.bin"
+    ).exists()
+
+
+@pytest.mark.asyncio
+async def test_verify_remote_checksum(multipart_draft, tmp_path, mocker):
+    """Uploads should be retried if the hash reported by the filesystem doesn't match."""
+    reported_hashes = iter(["0" * 32, None])
+    mocker.patch.object(
+        fsspec, "_md5_from_info", side_effect=lambda *_: next(reported_hashes)
+    )
+    create_spy = mocker.spy(FsspecDraftDeposition, "create_file")
+    delete_spy = mocker.spy(FsspecDraftDeposition, "delete_file")
+    path = tmp_path / "data.csv"
+    path.write_bytes(b"a,b\n1,2\n")
+
+    draft = await multipart_draft.add_resource(
+        "data.csv", ResourceInfo(local_path=path, partitions={})
+    )
+
+    assert create_spy.call_count == 2
+    assert delete_spy.call_count == 1
+    assert await draft.get_file("data.csv") == path.read_bytes()
+    assert draft.get_checksum("data.csv") == hashlib.md5(path.read_bytes()).hexdigest()  # noqa: S324
+
+
+@pytest.mark.asyncio
+async def test_single_stream_without_compose(tmp_path, mocker):
+    """Filesystems that can't combine parts server side should get a single stream."""
+    deposition_path = tmp_path / "deposition"
+    settings = RunSettings(
+        initialize=True,
+        depositor="fsspec",
+        depositor_args={"deposition_path": str(deposition_path)},
+    )
+    api_client = await FsspecAPIClient.initialize_client(
+        session=None, deposition_path=str(deposition_path), multipart_part_size=1024
+    )
+    draft = await FsspecDraftDeposition.new_draft(
+        settings=settings, api_client=api_client, dataset_id="pudl_test"
+    )
+    part_spy = mocker.spy(ComposeMultipartUpload, "upload_part")
+    data = os.urandom(10 * 1024 + 100)
+
+    draft = await draft.create_file("large.bin", io.BytesIO(data))
+
+    part_spy.assert_not_called()
+    assert await draft.get_file("large.bin") == data
+    assert not draft.deposition.get_deposition_path(DepositionDirectory.PARTS).exists()
+
+
+@pytest.mark.asyncio
+async def test_stream_file(tmp_path):
+    """Files should be streamed to disk from published versions and drafts."""
+    deposition_path = tmp_path / "deposition"
+    settings = RunSettings(
+        initialize=True,
+        depositor="fsspec",
+        depositor_args={"deposition_path": str(deposition_path)},
+    )
+    api_client = await FsspecAPIClient.initialize_client(
+        session=None, deposition_path=str(deposition_path)
+    )
+    data = bytes(range(256)) * 100
+    published = await _publish_files(api_client, settings, {"data.bin": data})
+
+    assert await published.read_range("data.bin", -10) == data[-10:]
+    assert await published.read_range("data.bin", 500, 600) == data[500:600]
+    assert await published.read_range("data.bin", 500, 10**9) == data[500:]
+    path = await published.get_file_to("data.bin", tmp_path / "data.bin")
+    assert path.read_bytes() == data
+    with pytest.raises(FileNotFoundError):
+        await published.read_range("missing.bin")
+
+    draft = await published.open_draft()
+    draft = await draft.create_file("new.bin", io.BytesIO(data[::-1]))
+    chunks = [chunk async for chunk in draft.iter_file("new.bin", chunk_size=1000)]
+    assert max(len(chunk) for chunk in chunks) == 1000
+    assert b"".join(chunks) == data[::-1]
+    assert await draft.read_range("data.bin", 0, 5) == data[:5]
+
+
+@pytest.mark.asyncio
+async def test_zip_member_changes(tmp_path, datasource: dict, mocker):
+    """Run summaries should list changed members of updated zipfiles."""
+    deposition_path = tmp_path / "deposition"
+    deposition_path.mkdir()
+    versions = {
+        "v1": {"same.csv": b"a,b\n1,2\n", "updated.csv": b"a,b\n3,4\n"},
+        "v2": {
+            "same.csv": b"a,b\n1,2\n",
+            "updated.csv": b"a,b\n3,4\n5,6\n",
+            "created.csv": b"a\n",
+        },
+    }
+    for version, members in versions.items():
+        (tmp_path / version).mkdir()
+        with zipfile.ZipFile(tmp_path / version / "data.zip", "w") as archive:
+            for name, data in members.items():
+                archive.writestr(name, data)
+
+    class TestDownloader(AbstractDatasetArchiver):
+        name = "Test Downloader"
+
+        def __init__(self, version: str, **kwargs):
+            super().__init__(**kwargs)
+            self.version = version
+
+        async def get_resources(self):
+            yield self.get_zipfile(), {"part": 1}
+
+        async def get_zipfile(self):
+            return ResourceInfo(
+                local_path=tmp_path / self.version / "data.zip",
+                partitions={"part": 1},
+            )
+
+    settings = RunSettings(
+        auto_publish=True,
+        initialize=True,
+        depositor="fsspec",
+        depositor_args={"deposition_path": str(deposition_path)},
+    )
+    read_range = mocker.spy(FsspecPublishedDeposition, "read_range")
+    await orchestrate_run(
+        dataset="pudl_test",
+        downloader=TestDownloader("v1", session="session"),
+        run_settings=settings,
+        session="session",
+    )
+    summary, _ = await orchestrate_run(
+        dataset="pudl_test",
+        downloader=TestDownloader("v2", session="session"),
+        run_settings=settings.model_copy(update={"initialize": False}),
+        session="session",
+    )
+
+    [file_change] = summary.file_changes
+    assert file_change.name == "data.zip"
+    assert [
+        (diff.name, diff.diff_type, diff.size_diff)
+        for diff in file_change.member_changes
+    ] == [("created.csv", "CREATE", 2), ("updated.csv", "UPDATE", 4)]
+    read_range.assert_called_once()
@@ -33,6 +33,7 @@ async def archive_taxnomies_mock(
     form: xbrl.FercForm,
     output_dir: Path,
     session: aiohttp.ClientSession,
+    archived_taxonomies: dict | None = None,
 ):
     archive_path = output_dir / f"ferc{form.as_int()}-xbrl-taxonomies.zip"
     taxonomies = []
@@ -70,6 +71,10 @@ async def test_archive_year_stability(mocker, tmp_path):
         "pudl_archiver.archivers.ferc.xbrl.archive_taxonomies",
         new=archive_taxnomies_mock,
     )
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl._archive_taxonomy",
+        return_value=b"",
+    )
 
     # Get all rss feeds for indexing
     rss_feeds = xbrl._get_rss_feeds()
@@ -0,0 +1,102 @@
+"""Benchmark finding the taxonomy referenced by large FERC XBRL filings.
+
+The largest FERC filings are tens of MB, but reference their taxonomy in the first
+few KB. These tests log how long it takes to find the taxonomy, and assert on how
+much of each filing is read and how much memory is allocated rather than on
+wall-clock time, so they stay deterministic on slow CI runners.
+"""
+
+import io
+import logging
+import time
+import tracemalloc
+
+import pytest
+
+from pudl_archiver.archivers.ferc import xbrl
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+FILING_SIZES_MB = [1, 10, 40]
+TAXONOMY_URL = "https://ecollection.ferc.gov/taxonomy/form1/2022-01-01/form/form1/form-1_2022-01-01.xsd"
+
+
+def _filing(size_mb: int) -> bytes:
+    """Make a filing about the size of a real one, with a schemaRef at the top."""
+    header = (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance">\n'
+        f'<link:schemaRef xlink:type="simple" xlink:href="{TAXONOMY_URL}"/>\n'
+    ).encode()
+    fact = b'<ferc:Revenue contextRef="c-1" unitRef="USD" decimals="INF">1234567</ferc:Revenue>\n'
+    return header + fact * (size_mb * 2**20 // len(fact)) + b"</xbrli:xbrl>\n"
+
+
+def _old_find_taxonomy_url(filing_data: bytes) -> str | None:
+    """Search a decoded, lower case copy of the whole filing."""
+    if match := xbrl.TAXONOMY_URL_PATTERN.search(filing_data.decode().lower()):
+        return match.group(0)
+    return None
+
+
+def _measure(fn, filing_data: bytes) -> tuple[str | None, float, int]:
+    """Run a function, returning its result, run time and peak memory allocated."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(filing_data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+@pytest.mark.parametrize("size_mb", FILING_SIZES_MB)
+def test_find_taxonomy_url(size_mb):
+    """Finding the taxonomy should only read the start of the filing."""
+    filing_data = _filing(size_mb)
+
+    old_url, old_s, old_peak = _measure(_old_find_taxonomy_url, filing_data)
+
+    def _new_find_taxonomy_url(filing_data: bytes) -> str | None:
+        filing = io.BytesIO(filing_data)
+        url = xbrl.find_taxonomy_url(filing)
+        # Only the first chunk is read
+        assert filing.tell() == xbrl.TAXONOMY_SEARCH_CHUNK_SIZE
+        return url
+
+    new_url, new_s, new_peak = _measure(_new_find_taxonomy_url, filing_data)
+    logger.info(
+        f"Found taxonomy in {size_mb} MB filing in {new_s * 1000:.2f}ms using "
+        f"{new_peak / 2**10:.0f} KiB, down from {old_s * 1000:.2f}ms using "
+        f"{old_peak / 2**20:.1f} MiB"
+    )
+
+    assert new_url == old_url == TAXONOMY_URL
+    # The whole filing is copied twice to decode and lower case it
+    assert old_peak >= 2 * len(filing_data)
+    # Memory doesn't grow with the size of the filing
+    assert new_peak < 4 * xbrl.TAXONOMY_SEARCH_CHUNK_SIZE
+
+
+def test_filing_metadata():
+    """Filing metadata should be built without copying the filing."""
+    filing_data = _filing(FILING_SIZES_MB[-1])
+    entry = xbrl.FeedEntry(
+        title="Filer",
+        summary_detail={
+            "value": 'href="https://ecollection.ferc.gov/download/filer.xbrl">www.filer.xbrl<'
+        },
+        published="Fri, 29 Oct 2021 16:14:44 -0400",
+        ferc_formname=xbrl.FercForm.FORM_1,
+        ferc_year=2021,
+        ferc_period="Q4",
+    )
+
+    metadata, _, peak = _measure(
+        lambda data: xbrl.FilingMetadata.from_rss_metadata(entry, "filer.xbrl", data),
+        filing_data,
+    )
+
+    assert metadata.taxonomy_url == TAXONOMY_URL
+    assert metadata.taxonomy_zip_name == "form-1-2022-01-01.zip"
+    assert peak < 4 * xbrl.TAXONOMY_SEARCH_CHUNK_SIZE
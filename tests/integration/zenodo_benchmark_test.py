@@ -0,0 +1,193 @@
+"""Benchmark the Zenodo depositor against a local fake Zenodo server.
+
+These tests run full archiver runs through ``orchestrate_run`` against the fake server
+in ``tests/fake_zenodo.py``. They log throughput in files and bytes per second so
+regressions can be spotted, and assert on the number of API calls made to each
+endpoint rather than on wall-clock time, so they stay deterministic on slow CI runners.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+import pytest
+
+from pudl_archiver.archivers.classes import AbstractDatasetArchiver, ResourceInfo
+from pudl_archiver.orchestrator import orchestrate_run
+from pudl_archiver.utils import RunSettings
+from tests.fake_zenodo import (
+    FakeZenodo,
+    FakeZenodoConfig,
+    fake_zenodo_session,
+    fake_zenodo_url,
+    start_fake_zenodo,
+)
+
+logger = logging.getLogger(f"catalystcoop.{__name__}")
+
+N_FILES = 50
+FILE_SIZE = 64 * 2**10
+
+
+class _TestDownloader(AbstractDatasetArchiver):
+    name = "Test Downloader"
+
+    def __init__(self, resources: dict[str, ResourceInfo], **kwargs):
+        super().__init__(**kwargs)
+        self.resources = resources
+
+    async def get_resources(self):
+        async def identity(x):
+            return x
+
+        for info in self.resources.values():
+            yield identity(info)
+
+
+def _write_files(directory: Path, n_changed: int = 0) -> dict:
+    """Write CSV files to archive, changing the first ``n_changed`` of them."""
+    directory.mkdir(exist_ok=True)
+    resources = {}
+    for i in range(N_FILES):
+        path = directory / f"file_{i}.csv"
+        row = f"{i},{int(i < n_changed)}\n".encode()
+        path.write_bytes(b"a,b\n" + row * (FILE_SIZE // len(row)))
+        resources[path.name] = ResourceInfo(local_path=path, partitions={})
+    return resources
+
+
+async def _timed_run(
+    fake: FakeZenodo, resources: dict, settings: RunSettings, session, label: str
+):
+    fake.calls.clear()
+    start = time.perf_counter()
+    summary, published = await orchestrate_run(
+        dataset="pudl_test",
+        downloader=_TestDownloader(resources, session=session),
+        run_settings=settings,
+        session=session,
+    )
+    elapsed = time.perf_counter() - start
+    n_bytes = sum(resource.local_path.stat().st_size for resource in resources.values())
+    logger.info(
+        f"{label}: {len(resources)} files in {elapsed:.2f}s "
+        f"({len(resources) / elapsed:.1f} files/s, {n_bytes / elapsed / 2**20:.2f} "
+        f"MiB/s), {fake.total_calls} API calls: {dict(fake.calls)}"
+    )
+    return summary, published
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("latency_s", [0.0, 0.005])
+async def test_orchestrate_run_throughput(zenodo_env, tmp_path, latency_s):
+    """Measure archiving a new dataset, then updating some of its files."""
+    fake = FakeZenodo(FakeZenodoConfig(latency_s=latency_s))
+    server = await start_fake_zenodo(fake)
+    settings = RunSettings(
+        initialize=True,
+        auto_publish=True,
+        clobber_unchanged=True,
+        depositor="zenodo",
+        depositor_args={"sandbox": True, "server_url": fake_zenodo_url()},
+    )
+    try:
+        async with fake_zenodo_session(server) as session:
+            summary, published = await _timed_run(
+                fake,
+                _write_files(tmp_path / "v1"),
+                settings,
+                session,
+                f"New deposition, {latency_s * 1000:.0f}ms latency",
+            )
+            assert summary.success
+            assert sorted(await published.list_files()) == sorted(
+                [f"file_{i}.csv" for i in range(N_FILES)] + ["datapackage.json"]
+            )
+            # One upload for each file and the datapackage, and a single refresh of
+            # the deposition's files before the datapackage is generated
+            assert fake.calls == {
+                "POST /api/deposit/depositions": 1,
+                "PUT /api/files/{bucket_id}/{filename}": N_FILES + 1,
+                "GET /api/deposit/depositions/{id}": 1,
+                "POST /api/deposit/depositions/{id}/actions/publish": 1,
+            }
+
+            n_changed = 10
+            settings = settings.model_copy(update={"initialize": False})
+            summary, published = await _timed_run(
+                fake,
+                _write_files(tmp_path / "v2", n_changed=n_changed),
+                settings,
+                session,
+                f"Updated deposition, {latency_s * 1000:.0f}ms latency",
+            )
+            assert summary.success
+            assert published.deposition.metadata.version == "2.0.0"
+            # Changed files are deleted before they're uploaded. Unchanged files and
+            # the datapackage are uploaded into the new version again. The
+            # deposition is refreshed after every delete, and once more after the
+            # uploads.
+            assert fake.calls == {
+                "GET /api/records/{id}": 1,
+                "GET /api/deposit/depositions/{id}": 2 + n_changed + 1,
+                "GET /records/{id}/files/{filename}": 1,
+                "POST /api/records/{id}/versions": 1,
+                "PUT /api/deposit/depositions/{id}": 1,
+                "DELETE /api/deposit/depositions/{id}/files/{file_id}": n_changed,
+                "PUT /api/files/{bucket_id}/{filename}": N_FILES + 1,
+                "POST /api/deposit/depositions/{id}/actions/publish": 1,
+            }
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_orchestrate_run_with_errors(zenodo_env, tmp_path):
+    """Runs should succeed despite injected errors, by retrying failed requests."""
+    fake = FakeZenodo(FakeZenodoConfig(error_rate=0.1, seed=42))
+    server = await start_fake_zenodo(fake)
+    settings = RunSettings(
+        initialize=True,
+        auto_publish=True,
+        depositor="zenodo",
+        depositor_args={"sandbox": True, "server_url": fake_zenodo_url()},
+    )
+    resources = _write_files(tmp_path / "v1")
+    try:
+        async with fake_zenodo_session(server) as session:
+            summary, published = await _timed_run(
+                fake, resources, settings, session, "New deposition, 10% errors"
+            )
+    finally:
+        await server.close()
+    assert summary.success
+    assert fake.errors_injected > 0
+    files = fake.depositions[published.deposition.id_].files
+    for filename, resource in resources.items():
+        assert files[filename].data == resource.local_path.read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_cap(zenodo_env, tmp_path):
+    """Uploads should take at least as long as the bandwidth cap allows."""
+    bandwidth_bps = 4 * 2**20
+    fake = FakeZenodo(FakeZenodoConfig(bandwidth_bps=bandwidth_bps))
+    server = await start_fake_zenodo(fake)
+    settings = RunSettings(
+        initialize=True,
+        auto_publish=True,
+        depositor="zenodo",
+        depositor_args={"sandbox": True, "server_url": fake_zenodo_url()},
+    )
+    resources = _write_files(tmp_path / "v1")
+    try:
+        async with fake_zenodo_session(server) as session:
+            start = time.perf_counter()
+            summary, _ = await _timed_run(
+                fake, resources, settings, session, "New deposition, 4 MiB/s"
+            )
+            elapsed = time.perf_counter() - start
+    finally:
+        await server.close()
+    assert summary.success
+    assert elapsed >= N_FILES * FILE_SIZE / bandwidth_bps
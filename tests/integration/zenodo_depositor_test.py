@@ -0,0 +1,178 @@
+"""Test the Zenodo depositor against a local fake Zenodo server."""
+
+import asyncio
+import io
+
+import pytest
+from aiohttp.test_utils import TestServer
+
+from pudl_archiver.depositors.zenodo import depositor as zenodo_depositor
+from pudl_archiver.depositors.zenodo.depositor import (
+    ZenodoAPIClient,
+    ZenodoDraftDeposition,
+)
+from pudl_archiver.frictionless import ResourceInfo
+from pudl_archiver.utils import RunSettings
+from tests.fake_zenodo import (
+    FakeZenodo,
+    FakeZenodoConfig,
+    fake_zenodo_session,
+    fake_zenodo_url,
+    start_fake_zenodo,
+)
+
+
+async def _upload_files(server: TestServer, tmp_path, n_files: int):
+    """Add files to a new draft on a fake Zenodo server, returning the draft and files."""
+    settings = RunSettings(
+        initialize=True,
+        depositor="zenodo",
+        depositor_args={"sandbox": True, "server_url": fake_zenodo_url()},
+    )
+    tmp_path.mkdir(exist_ok=True)
+    files = {}
+    for i in range(n_files):
+        path = tmp_path / f"file_{i}.csv"
+        path.write_bytes(b"a,b\n" + f"{i},{i}\n".encode() * 1000)
+        files[path.name] = path
+    async with fake_zenodo_session(server) as session:
+        api_client = await ZenodoAPIClient.initialize_client(
+            session=session, **settings.depositor_args
+        )
+        draft = await ZenodoDraftDeposition.new_draft(
+            settings=settings, api_client=api_client, dataset_id="pudl_test"
+        )
+        for filename, path in files.items():
+            draft = await draft.add_resource(
+                filename, ResourceInfo(local_path=path, partitions={})
+            )
+    return draft, files
+
+
+async def _upload_files_to_fake(fake: FakeZenodo, tmp_path, n_files: int):
+    """Start a fake Zenodo server and add files to a new draft on it."""
+    server = await start_fake_zenodo(fake)
+    try:
+        return await _upload_files(server, tmp_path, n_files)
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_corrupted_upload_retry(zenodo_env, tmp_path, mocker):
+    """Corrupted uploads should be detected from the upload response and resent."""
+    md5_spy = mocker.spy(zenodo_depositor, "compute_md5")
+    fake = FakeZenodo(FakeZenodoConfig(corrupt_rate=0.3, seed=1))
+    n_files = 20
+    draft, files = await _upload_files_to_fake(fake, tmp_path, n_files)
+
+    assert fake.uploads_corrupted > 0
+    stored_files = fake.depositions[draft.deposition.id_].files
+    for filename, path in files.items():
+        assert stored_files[filename].data == path.read_bytes()
+    # Only the corrupted files are deleted and uploaded again
+    assert fake.calls["PUT /api/files/{bucket_id}/{filename}"] == (
+        n_files + fake.uploads_corrupted
+    )
+    assert (
+        fake.calls["DELETE /api/deposit/depositions/{id}/files/{file_id}"]
+        == fake.uploads_corrupted
+    )
+    # Checksums are computed while uploading, not with a separate read
+    assert md5_spy.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_request_retry(zenodo_env, tmp_path, mocker):
+    """Retried upload requests should send the whole file again."""
+    upload_spy = mocker.spy(ZenodoDraftDeposition, "_upload_file")
+    fake = FakeZenodo(FakeZenodoConfig(error_rate=0.3, seed=1))
+    n_files = 20
+    draft, files = await _upload_files_to_fake(fake, tmp_path, n_files)
+
+    assert fake.errors_injected > 0
+    stored_files = fake.depositions[draft.deposition.id_].files
+    for filename, path in files.items():
+        assert stored_files[filename].data == path.read_bytes()
+    # Failed requests are retried without needing to start the upload over
+    assert upload_spy.call_count == n_files
+
+
+@pytest.mark.asyncio
+async def test_rate_limit(zenodo_env, tmp_path):
+    """Concurrent drafts should share the rate limit instead of exceeding it."""
+    fake = FakeZenodo(FakeZenodoConfig(rate_limit=10, rate_limit_window_s=0.25))
+    n_drafts = 3
+    n_files = 10
+    server = await start_fake_zenodo(fake)
+    try:
+        results = await asyncio.gather(
+            *[
+                _upload_files(server, tmp_path / f"draft_{i}", n_files)
+                for i in range(n_drafts)
+            ]
+        )
+    finally:
+        await server.close()
+
+    for draft, files in results:
+        stored_files = fake.depositions[draft.deposition.id_].files
+        assert len(stored_files) == n_files
+        for filename, path in files.items():
+            assert stored_files[filename].data == path.read_bytes()
+    metrics = results[0][0].api_client.rate_limit_metrics()
+    # Every request is paced, and the clients saw every 429 the server sent
+    assert metrics["write"].requests + metrics["read"].requests == fake.total_calls
+    assert metrics["write"].rate_limit_waits > 0
+    assert (
+        metrics["write"].rate_limited + metrics["read"].rate_limited
+        == fake.rate_limited
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_file(zenodo_env, tmp_path):
+    """Files should be streamed to disk, and ranges read without a full download."""
+    fake = FakeZenodo()
+    data = bytes(range(256)) * 1000
+    server = await start_fake_zenodo(fake)
+    try:
+        async with fake_zenodo_session(server) as session:
+            settings = RunSettings(
+                initialize=True,
+                depositor="zenodo",
+                depositor_args={
+                    "sandbox": True,
+                    "server_url": fake_zenodo_url(),
+                },
+            )
+            api_client = await ZenodoAPIClient.initialize_client(
+                session=session, **settings.depositor_args
+            )
+            draft = await ZenodoDraftDeposition.new_draft(
+                settings=settings, api_client=api_client, dataset_id="pudl_test"
+            )
+            draft = await draft.create_file("data.bin", io.BytesIO(data))
+
+            assert await draft.read_range("data.bin", -10) == data[-10:]
+            assert (
+                await draft.read_range("data.bin", 100_000, 100_050)
+                == (data[100_000:100_050])
+            )
+            assert fake.bytes_downloaded == 60
+
+            path = await draft.get_file_to("data.bin", tmp_path / "data.bin")
+            assert path.read_bytes() == data
+            chunks = [
+                chunk
+                async for chunk in draft.iter_file(
+                    "data.bin", start=1000, chunk_size=2**12
+                )
+            ]
+            assert max(len(chunk) for chunk in chunks) <= 2**12
+            assert b"".join(chunks) == data[1000:]
+
+            with pytest.raises(FileNotFoundError):
+                await draft.read_range("missing.bin")
+    finally:
+        await server.close()
@@ -1,18 +1,22 @@
 """Test archiver abstract base class."""
 
+import asyncio
 import copy
 import io
 import logging
 import re
 import tempfile
 import zipfile
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import pytest
 import requests
 from aiohttp import ClientSession
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from pudl_archiver.archivers.classes import AbstractDatasetArchiver, ArchiveAwaitable
+from pudl_archiver.archivers.page_waits import LINKS_IDLE_TIMEOUT_MS
 from pudl_archiver.archivers.validate import ValidationTestResult, validate_filetype
 from pudl_archiver.frictionless import Resource, ResourceInfo
 
@@ -95,10 +99,10 @@ def html_docs():
 @pytest.mark.parametrize(
     "concurrency_limit,directory_per_resource_chunk,download_paths",
     [
-        (1, True, ["path0", "path1", "path2", "path3", "path4"]),
-        (1, False, ["path0", "path0", "path0", "path0", "path0"]),
-        (5, True, ["path0", "path0", "path0", "path0", "path0"]),
-        (2, True, ["path0", "path0", "path1", "path1", "path2"]),
+        (1, True, ["chunk-1", "chunk-2", "chunk-3", "chunk-4", "chunk-5"]),
+        (1, False, ["root", "root", "root", "root", "root"]),
+        (5, True, ["chunk-1", "chunk-1", "chunk-1", "chunk-1", "chunk-1"]),
+        (2, True, ["chunk-1", "chunk-1", "chunk-2", "chunk-2", "chunk-3"]),
     ],
 )
 async def test_resource_chunks(
@@ -123,21 +127,28 @@ async def test_resource_chunks(
                 local_path=Path(self.download_directory), partitions={"idx": i}
             )
 
-    tmpdir_mock = mocker.Mock(side_effect=[Path(f"path{i}") for i in range(6)])
-    mocker.patch(
-        "pudl_archiver.archivers.classes.tempfile.TemporaryDirectory",
-        new=tmpdir_mock,
-    )
-
     # Mock out file validations
     mocker.patch("pudl_archiver.archivers.classes.validate.validate_filetype")
     mocker.patch("pudl_archiver.archivers.classes.validate.validate_file_not_empty")
     mocker.patch("pudl_archiver.archivers.classes.validate.validate_zip_layout")
 
-    # Initialize MockArchiver class
+    # Initialize MockArchiver class. Validate in this process so the mocks apply.
     archiver = MockArchiver(concurrency_limit, directory_per_resource_chunk)
+
+    async def _run_inline(fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+    mocker.patch.object(archiver, "run_cpu", side_effect=_run_inline)
+    root = archiver.workspace.root
     async for name, resource in archiver.download_all_resources():
-        assert download_paths[resource.partitions["idx"]] == name
+        expected = download_paths[resource.partitions["idx"]]
+        assert name == (root.name if expected == "root" else expected)
+        # Directories from previous chunks are deleted
+        assert [path.name for path in root.iterdir()] == (
+            [] if expected == "root" else [expected]
+        )
+    archiver.workspace.cleanup()
+    assert not root.exists()
 
 
 @pytest.mark.asyncio
@@ -167,6 +178,104 @@ async def test_failed_parts(bad_zipfile, good_zipfile):
     assert archiver.failed_partitions["bad.zip"] == {"bad_zip": True, "good_zip": False}
 
 
+@pytest.mark.asyncio
+async def test_streamed_resources(mocker, good_zipfile):
+    """Resources from async generators should be yielded as soon as they're done."""
+    events = []
+    finish = asyncio.Event()
+
+    class MockArchiver(AbstractDatasetArchiver):
+        name = "mock"
+        concurrency_limit = 1
+
+        async def get_resources(self):
+            yield self.stream_resources()
+            yield self.get_resource(2)
+
+        async def stream_resources(self):
+            for i in range(2):
+                events.append(f"downloaded {i}")
+                yield ResourceInfo(local_path=good_zipfile, partitions={"idx": i})
+                # Keep downloading until the first resource has been deposited
+                await finish.wait()
+
+        async def get_resource(self, i):
+            events.append(f"downloaded {i}")
+            return ResourceInfo(local_path=good_zipfile, partitions={"idx": i})
+
+    archiver = MockArchiver(session=None)
+
+    async def _run_inline(fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+    mocker.patch.object(archiver, "run_cpu", side_effect=_run_inline)
+    async for _, resource in archiver.download_all_resources():
+        events.append(f"deposited {resource.partitions['idx']}")
+        finish.set()
+
+    assert events == [
+        "downloaded 0",
+        "deposited 0",
+        "downloaded 1",
+        "deposited 1",
+        "downloaded 2",
+        "deposited 2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_streamed_resource_error(mocker, good_zipfile):
+    """An error part way through an async generator should stop the download."""
+
+    class MockArchiver(AbstractDatasetArchiver):
+        name = "mock"
+
+        async def get_resources(self):
+            yield self.stream_resources()
+
+        async def stream_resources(self):
+            yield ResourceInfo(local_path=good_zipfile, partitions={"idx": 0})
+            raise RuntimeError("Download failed")
+
+    archiver = MockArchiver(session=None)
+    mocker.patch.object(archiver, "run_cpu", return_value=[])
+    downloaded = []
+    with pytest.raises(RuntimeError, match="Download failed"):
+        async for name, _ in archiver.download_all_resources():
+            downloaded.append(name)
+    assert downloaded == [good_zipfile.name]
+
+
+@pytest.mark.asyncio
+async def test_skip_streamed_resource(mocker, good_zipfile):
+    """Skipped resources from async generators should be closed without running."""
+    events = []
+
+    class MockArchiver(AbstractDatasetArchiver):
+        name = "mock"
+
+        async def get_resources(self):
+            yield self.stream_resources(), {"idx": 0}
+            yield self.get_resource(1), {"idx": 1}
+
+        async def stream_resources(self):
+            events.append("streamed 0")
+            yield ResourceInfo(local_path=good_zipfile, partitions={"idx": 0})
+
+        async def get_resource(self, i):
+            events.append(f"downloaded {i}")
+            return ResourceInfo(local_path=good_zipfile, partitions={"idx": i})
+
+    archiver = MockArchiver(session=None)
+    mocker.patch.object(archiver, "run_cpu", return_value=[])
+    async for _, resource in archiver.download_all_resources(
+        skip_partitions=[{"idx": 0}]
+    ):
+        events.append(f"deposited {resource.partitions['idx']}")
+
+    assert events == ["downloaded 1", "deposited 1"]
+
+
 @pytest.mark.asyncio
 async def test_download_zipfile(mocker, bad_zipfile, good_zipfile):
     """Test download zipfile.
@@ -238,13 +347,16 @@ async def test_download_and_zip_file(mocker, file_data):
     # Initialize MockArchiver class
     archiver = MockArchiver(None)
 
-    session_mock = mocker.AsyncMock(name="session_mock")
+    session_mock = mocker.MagicMock(name="session_mock")
     archiver.session = session_mock
 
     # Set return value
-    response_mock = mocker.AsyncMock()
-    response_mock.read = mocker.AsyncMock(return_value=file_data)
-    session_mock.get = mocker.AsyncMock(return_value=response_mock)
+    async def _iter_chunked(size):
+        yield file_data
+
+    response_mock = mocker.MagicMock(status=200)
+    response_mock.content.iter_chunked = _iter_chunked
+    session_mock.get.return_value.__aenter__.return_value = response_mock
 
     # Prepare args
     url = "https://www.fake.url.com"
@@ -260,6 +372,8 @@ async def test_download_and_zip_file(mocker, file_data):
         with zipfile.ZipFile(archive_path) as zf:
             zipped_file = zf.open(file_path)
             assert zipped_file.read() == file_data
+        # The downloaded file is deleted once it's been zipped
+        assert list(Path(path).iterdir()) == [Path(archive_path)]
 
 
 @pytest.mark.asyncio
@@ -307,6 +421,43 @@ async def test_get_hyperlinks(docname, pattern, links, request, html_docs):
     assert set(found_links) == set(links)
 
 
+@pytest.mark.asyncio
+async def test_get_hyperlinks_via_playwright_busy_page(mocker, html_docs):
+    """Links should be read after a short wait from pages that never go idle."""
+    idle_timeouts = []
+
+    class _BusyPage:
+        url = "https://www.fake.link.com"
+
+        async def goto(self, url, wait_until, timeout):
+            pass
+
+        async def wait_for_load_state(self, state, timeout):
+            idle_timeouts.append(timeout)
+            raise PlaywrightTimeoutError("Timeout")
+
+        async def content(self):
+            return html_docs["simple"]
+
+    @asynccontextmanager
+    async def _browser_page():
+        yield _BusyPage()
+
+    archiver = MockArchiver(None)
+    mocker.patch.object(archiver, "browser_page", new=_browser_page)
+
+    found_links = await archiver.get_hyperlinks_via_playwright(
+        "fake_url", re.compile(r"test_\d{4}.zip")
+    )
+
+    assert set(found_links) == {
+        "https://www.fake.link.com/test_2019.zip",
+        "https://www.fake.link.com/test_2020.zip",
+    }
+    assert idle_timeouts == [LINKS_IDLE_TIMEOUT_MS]
+    assert LINKS_IDLE_TIMEOUT_MS <= 10 * 1000
+
+
 @pytest.mark.parametrize(
     "baseline_resources,new_resources,success",
     [
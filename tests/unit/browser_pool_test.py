@@ -0,0 +1,89 @@
+"""Test sharing Playwright browsers between archivers."""
+
+import asyncio
+
+import pytest
+
+from pudl_archiver.archivers import browser_pool
+from pudl_archiver.archivers.browser_pool import (
+    BrowserPool,
+    close_browser_pool,
+    get_browser_pool,
+)
+
+
+@pytest.fixture()
+def playwright(mocker):
+    """Replace Playwright with mocks that record launched browsers."""
+    launched = []
+
+    async def _launch(**kwargs):
+        await asyncio.sleep(0.01)
+        browser = mocker.AsyncMock()
+        # Contexts need awaitable new_page and close methods too
+        browser.new_context.return_value = mocker.AsyncMock()
+        launched.append(browser)
+        return browser
+
+    pw = mocker.AsyncMock()
+    pw.webkit.launch.side_effect = _launch
+    pw.chromium.launch.side_effect = _launch
+    starter = mocker.Mock()
+    starter.start = mocker.AsyncMock(return_value=pw)
+    mocker.patch.object(browser_pool, "async_playwright", return_value=starter)
+    return pw, launched
+
+
+@pytest.mark.asyncio
+async def test_browser_pool(playwright):
+    """Browsers should be launched once per engine, with a limit on open pages."""
+    pw, launched = playwright
+    pool = BrowserPool(max_contexts=2)
+    open_pages = 0
+    max_open_pages = 0
+
+    async def _use_page(engine):
+        nonlocal open_pages, max_open_pages
+        async with pool.page(engine) as page:
+            open_pages += 1
+            max_open_pages = max(max_open_pages, open_pages)
+            await asyncio.sleep(0.01)
+            open_pages -= 1
+            return page
+
+    await asyncio.gather(
+        *[_use_page("webkit") for _ in range(5)], _use_page("chromium")
+    )
+
+    assert pw.webkit.launch.call_count == 1
+    assert pw.chromium.launch.call_count == 1
+    assert max_open_pages == 2
+    assert pool.metrics.contexts == 6
+    assert pool.metrics.max_open_contexts == 2
+    # Every context is closed once it's been used
+    for browser in launched:
+        assert browser.new_context.return_value.close.await_count == (
+            browser.new_context.await_count
+        )
+
+    await pool.close()
+    for browser in launched:
+        browser.close.assert_awaited_once()
+    pw.stop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_shared_browser_pool(playwright):
+    """Archivers in an event loop should share a pool until it's closed."""
+    _, launched = playwright
+    pool = get_browser_pool()
+    assert get_browser_pool() is pool
+
+    async with pool.context():
+        pass
+    await close_browser_pool()
+
+    assert len(launched) == 1
+    launched[0].close.assert_awaited_once()
+    assert get_browser_pool() is not pool
+    await close_browser_pool()
@@ -0,0 +1,55 @@
+"""Test running CPU-bound work in a shared process pool."""
+
+import asyncio
+import hashlib
+import zipfile
+
+import pytest
+
+from pudl_archiver.archivers.cpu_pool import CPUPool, close_cpu_pool, get_cpu_pool
+from pudl_archiver.utils import add_to_zipfile, compute_md5
+
+
+@pytest.mark.asyncio
+async def test_cpu_pool(tmp_path):
+    """Functions should run in worker processes, with queue depth tracked."""
+    pool = CPUPool(max_workers=1)
+    try:
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"{i}.txt"
+            path.write_text(f"file {i}")
+            paths.append(path)
+
+        hashes = await asyncio.gather(*[pool.run(compute_md5, path) for path in paths])
+        assert hashes == [hashlib.md5(path.read_bytes()).hexdigest() for path in paths]  # noqa: S324
+        assert await pool.run(int, "ff", base=16) == 255
+
+        # Exceptions raised in workers are raised by run
+        with pytest.raises(ValueError):
+            await pool.run(int, "not a number")
+    finally:
+        await pool.shutdown()
+
+    assert pool.metrics.workers == 1
+    assert pool.metrics.tasks == 5
+    assert pool.metrics.max_queue_depth == 2
+    assert pool.metrics.busy_s > 0
+    assert 0 < pool.metrics.saturation <= 1
+
+
+@pytest.mark.asyncio
+async def test_shared_cpu_pool(tmp_path):
+    """Archivers in an event loop should share a pool until it's closed."""
+    pool = get_cpu_pool()
+    assert get_cpu_pool() is pool
+
+    zip_path = tmp_path / "archive.zip"
+    await pool.run(add_to_zipfile, zip_path, "a.csv", "a,b\n1,2\n", "w")
+    await pool.run(add_to_zipfile, zip_path, "b.csv", b"c,d\n3,4\n")
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.namelist() == ["a.csv", "b.csv"]
+
+    await close_cpu_pool()
+    assert get_cpu_pool() is not pool
+    await close_cpu_pool()
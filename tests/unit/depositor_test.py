@@ -0,0 +1,40 @@
+"""Test generic depositor helpers."""
+
+import hashlib
+import io
+
+from pudl_archiver.depositors.depositor import HashingReader, resolve_byte_range
+
+
+def test_hashing_reader():
+    """Reader should hash everything read, restarting when it seeks to the start."""
+    data = b"abcdefghij" * 100
+    expected = hashlib.md5(data).hexdigest()  # noqa: S324
+    raw = io.BytesIO(b"header" + data)
+    raw.seek(6)
+    reader = HashingReader(raw)
+
+    assert reader.read(10) == data[:10]
+    reader.seek(6)
+    assert reader.read() == data
+    assert reader.md5 == expected
+
+    # Hash is unknown after skipping part of the file
+    reader.seek(20)
+    reader.read()
+    assert reader.md5 is None
+
+    # Closing the reader doesn't close the wrapped file
+    reader.close()
+    assert not raw.closed
+
+
+def test_resolve_byte_range():
+    """Byte ranges should behave like slices of the file."""
+    assert resolve_byte_range(0, None, 100) == (0, 100)
+    assert resolve_byte_range(-10, None, 100) == (90, 100)
+    assert resolve_byte_range(-1000, None, 100) == (0, 100)
+    assert resolve_byte_range(10, 20, 100) == (10, 20)
+    assert resolve_byte_range(10, 1000, 100) == (10, 100)
+    assert resolve_byte_range(50, 20, 100) == (50, 50)
+    assert resolve_byte_range(200, None, 100) == (100, 100)
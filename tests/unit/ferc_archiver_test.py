@@ -1,10 +1,23 @@
+import asyncio
+import contextlib
+import datetime
+import inspect
+import io
 import json
+import random
+import weakref
 import zipfile
 from collections import defaultdict
 from pathlib import Path
+from types import SimpleNamespace
 
+import aiohttp
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
+from pudl_archiver.archivers.ferc import ferc_online_helpers, xbrl
 from pudl_archiver.archivers.ferc.ferc1 import Ferc1Archiver
 from pudl_archiver.archivers.ferc.ferc2 import Ferc2Archiver
 from pudl_archiver.archivers.ferc.ferc6 import Ferc6Archiver
@@ -14,6 +27,9 @@ from pudl_archiver.archivers.ferc.xbrl import (
     TAXONOMY_URL_PATTERN,
     FeedEntry,
     FercForm,
+    IndexedFilings,
+    _download_filings,
+    archive_xbrl_for_form,
     archive_year,
 )
 
@@ -57,9 +73,11 @@ async def test_valid_years(
     mock_session = mocker.AsyncMock()
     archiver = form_class(mock_session, only_years=valid_years)
     resources = [r async for r in archiver.get_resources()]
-    # Await the mocked coroutines so nothing is left unawaited.
+    # Await the mocked coroutines so nothing is left unawaited. DBF years are
+    # downloaded by an async generator, which doesn't need awaiting.
     for resource in resources:
-        await resource
+        if inspect.isawaitable(resource):
+            await resource
     dbf_mock.assert_called_once_with(
         ferc_form=ferc_number,
         years=called_with_years,
@@ -179,3 +197,670 @@ async def test_archive_year_metadata(tmpdir):
             ).encode()
             == f.read()
         )
+
+
+def _rss_item(name: str, form: str, year: int, published: str) -> str:
+    return f"""<item>
+<title>{name}</title>
+<description>&lt;a href="https://ecollection.ferc.gov/download/{name}.xbrl"&gt;{name}.xbrl&lt;/a&gt;</description>
+<pubDate>{published}</pubDate>
+<guid>{name}</guid>
+<ferc:formname>{form}</ferc:formname>
+<ferc:year>{year}</ferc:year>
+<ferc:period>Q4</ferc:period>
+</item>"""
+
+
+def _rss_feed(*items: str) -> str:
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0" xmlns:ferc="https://ecollection.ferc.gov/api/rssfeed">
+<channel><title>FERC</title><link>https://ecollection.ferc.gov</link>
+<description>FERC filings</description>
+{"".join(items)}
+</channel></rss>"""
+
+
+@pytest.fixture()
+def rss_cache(tmp_path, monkeypatch):
+    """Cache FERC files in a temporary directory, and don't share them between tests."""
+    monkeypatch.setenv("PUDL_ARCHIVER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(xbrl, "_feed_entries", weakref.WeakKeyDictionary())
+    monkeypatch.setattr(xbrl, "_taxonomy_documents", weakref.WeakKeyDictionary())
+
+
+@pytest.mark.asyncio
+async def test_index_available_entries(mocker, rss_cache):
+    """RSS feeds should be fetched concurrently and merged deterministically."""
+    early = "Fri, 29 Oct 2021 16:14:44 -0400"
+    late = "Mon, 01 Nov 2021 09:00:00 -0400"
+    feeds = {
+        "/2021-10": _rss_feed(
+            _rss_item("filer1", "Form 1", 2021, early),
+            _rss_item("filer2", "Form 2", 2021, early),
+            _rss_item("Test filer", "Form 1", 2021, early),
+        ),
+        "/2021-11": _rss_feed(
+            _rss_item("filer3", "Form 1", 2020, late),
+            _rss_item("filer1", "Form 1", 2021, late),
+        ),
+        "/latest": _rss_feed(_rss_item("filer1", "Form 1", 2021, early)),
+    }
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Finish fetching feeds in a different order each time
+        await asyncio.sleep(random.uniform(0.02, 0.1))  # noqa: S311
+        in_flight -= 1
+        return web.Response(text=feeds[request.path])
+
+    app = web.Application()
+    for path in feeds:
+        app.router.add_get(path, handler)
+    server = TestServer(app)
+    await server.start_server()
+    urls = [str(server.make_url(path)) for path in feeds]
+    try:
+        async with aiohttp.ClientSession() as session:
+            indexes = []
+            for _ in range(3):
+                # Don't share the entries between runs
+                xbrl._feed_entries.clear()
+                mocker.patch(
+                    "pudl_archiver.archivers.ferc.xbrl._get_rss_feeds",
+                    return_value=urls,
+                )
+                indexes.append(
+                    await IndexedFilings.index_available_entries(
+                        FercForm.FORM_1, session
+                    )
+                )
+    finally:
+        await server.close()
+
+    assert max_in_flight == len(feeds)
+    assert all(index == indexes[0] for index in indexes)
+    filings = indexes[0].filings_per_year
+    assert list(filings) == [2020, 2021]
+    assert {filing.title for filing in filings[2020]} == {"filer3"}
+    # The entry from the first feed listing a filing is kept
+    [filer1] = filings[2021]
+    assert filer1.title == "filer1"
+    assert filer1.published_parsed.day == 29
+
+
+@pytest.mark.asyncio
+async def test_rss_cache(mocker, rss_cache):
+    """Closed months should be cached, and other feeds revalidated by ETag."""
+    published = "Fri, 29 Oct 2021 16:14:44 -0400"
+    latest_month = datetime.datetime.now(tz=datetime.UTC).replace(
+        day=1
+    ) - datetime.timedelta(days=1)
+    feeds = {
+        "/rssfeed?month=10&year=2021": _rss_feed(
+            _rss_item("filer1", "Form 1", 2021, published),
+            _rss_item("filer2", "Form 2", 2021, published),
+        ),
+        f"/rssfeed?month={latest_month.month}&year={latest_month.year}": _rss_feed(
+            _rss_item("filer3", "Form 1", 2022, published),
+        ),
+        "/rssfeed": _rss_feed(_rss_item("filer4", "Form 1", 2022, published)),
+    }
+    requests = []
+
+    async def handler(request: web.Request) -> web.Response:
+        etag = f'"{hash(feeds[request.path_qs])}"'
+        if_none_match = request.headers.get("If-None-Match")
+        requests.append((request.path_qs, if_none_match))
+        if if_none_match == etag:
+            return web.Response(status=304)
+        return web.Response(text=feeds[request.path_qs], headers={"ETag": etag})
+
+    app = web.Application()
+    app.router.add_get("/rssfeed", handler)
+    server = TestServer(app)
+    await server.start_server()
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl._get_rss_feeds",
+        return_value=[str(server.make_url(path)) for path in feeds],
+    )
+    try:
+        async with aiohttp.ClientSession() as session:
+            form1 = await IndexedFilings.index_available_entries(
+                FercForm.FORM_1, session
+            )
+            form2 = await IndexedFilings.index_available_entries(
+                FercForm.FORM_2, session
+            )
+            # Entries are shared by all forms in the event loop
+            assert sorted(requests) == sorted((path, None) for path in feeds)
+
+            requests.clear()
+            xbrl._feed_entries.clear()
+            cached_form1 = await IndexedFilings.index_available_entries(
+                FercForm.FORM_1, session
+            )
+    finally:
+        await server.close()
+
+    # Closed months aren't requested again, and other feeds haven't changed
+    assert sorted(path for path, _ in requests) == sorted(list(feeds)[1:])
+    assert all(etag is not None for _, etag in requests)
+    assert cached_form1 == form1
+    assert {
+        year: {filing.title for filing in filings}
+        for year, filings in form1.filings_per_year.items()
+    } == {2021: {"filer1"}, 2022: {"filer3", "filer4"}}
+    assert {filing.title for filing in form2.filings_per_year[2021]} == {"filer2"}
+
+
+@pytest.mark.asyncio
+async def test_invalid_feed_entry(mocker, rss_cache):
+    """An entry that can't be parsed should only fail indexing for its own form."""
+    published = "Fri, 29 Oct 2021 16:14:44 -0400"
+    feed = _rss_feed(
+        _rss_item("filer1", "Form 1", 2021, published),
+        _rss_item("filer2", "Form 2", 2021, "not a date"),
+    )
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(text=feed)
+
+    app = web.Application()
+    app.router.add_get("/rssfeed", handler)
+    server = TestServer(app)
+    await server.start_server()
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl._get_rss_feeds",
+        return_value=[str(server.make_url("/rssfeed"))],
+    )
+    try:
+        async with aiohttp.ClientSession() as session:
+            form1 = await IndexedFilings.index_available_entries(
+                FercForm.FORM_1, session
+            )
+            with pytest.raises(RuntimeError, match="1 RSS feed entries for Form 2"):
+                await IndexedFilings.index_available_entries(FercForm.FORM_2, session)
+    finally:
+        await server.close()
+
+    assert {filing.title for filing in form1.filings_per_year[2021]} == {"filer1"}
+
+
+@pytest.mark.asyncio
+async def test_download_filings_order(mocker, tmp_path):
+    """Filings should download concurrently but be archived in a stable order."""
+    filings = [
+        FeedEntry(
+            title=f"Filer {i}",
+            summary_detail={
+                "value": f'href="https://ecollection.ferc.gov/download/filer{i}.xbrl">www.filer{i}.xbrl<'
+            },
+            published="Fri, 29 Oct 2021 16:14:44 -0400",
+            ferc_formname=FercForm.FORM_1,
+            ferc_year=2021,
+            ferc_period="Q4",
+        )
+        for i in range(25)
+    ]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def _download_filing(filing, session):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(random.uniform(0, 0.02))  # noqa: S311
+        in_flight -= 1
+        return b"https://ecollection.ferc.gov/taxonomy/form1/2021-01-01/form/form1/form-1_2021-01-01.xsd"
+
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl._download_filing", new=_download_filing
+    )
+    mocker.patch("pudl_archiver.archivers.ferc.xbrl.FILING_DOWNLOAD_CONCURRENCY", 4)
+
+    with zipfile.ZipFile(tmp_path / "filings.zip", "w") as archive:
+        metadata = await _download_filings(
+            archive, 2021, set(filings), FercForm.FORM_1, None
+        )
+        names = archive.namelist()
+
+    assert max_in_flight == 4
+    expected = sorted(filings, key=lambda f: f.download_url)
+    assert names == [
+        f"Filer_{filing.title.split()[1]}_form1_Q4_1635538484.xbrl"
+        for filing in expected
+    ]
+    assert list(metadata) == sorted(f"{filing.title}Q4" for filing in filings)
+
+
+@pytest.mark.asyncio
+async def test_archive_xbrl_for_form(mocker, tmp_path):
+    """Years should be archived concurrently, starting taxonomies early."""
+
+    def _filing(year: int, i: int) -> FeedEntry:
+        return FeedEntry(
+            title=f"Filer {i}",
+            summary_detail={
+                "value": f'href="https://ecollection.ferc.gov/download/{year}/filer{i}.xbrl">www.filer{i}.xbrl<'
+            },
+            published="Fri, 29 Oct 2021 16:14:44 -0400",
+            ferc_formname=FercForm.FORM_1,
+            ferc_year=year,
+            ferc_period="Q4",
+        )
+
+    def _taxonomy(year: int) -> str:
+        return f"https://ecollection.ferc.gov/taxonomy/form1/{year}-01-01/form/form1/form-1_{year}-01-01.xsd"
+
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl.IndexedFilings.index_available_entries",
+        return_value=IndexedFilings(
+            filings_per_year={
+                2021: {_filing(2021, i) for i in range(6)},
+                2022: {_filing(2022, i) for i in range(2)},
+            }
+        ),
+    )
+    in_flight = 0
+    max_in_flight = 0
+    events = []
+
+    async def _download_filing(filing, session):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # The 2021 filings take longer to download
+        await asyncio.sleep(0.05 if filing.ferc_year == 2021 else 0.01)
+        in_flight -= 1
+        return _taxonomy(filing.ferc_year).encode()
+
+    async def _archive_taxonomy(taxonomy, session):
+        events.append(f"taxonomy {taxonomy}")
+        return taxonomy.encode()
+
+    async def _archive_year(year, *args):
+        resource = await archive_year(year, *args)
+        events.append(f"year {year}")
+        return resource
+
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl._download_filing", new=_download_filing
+    )
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl._archive_taxonomy", new=_archive_taxonomy
+    )
+    mocker.patch("pudl_archiver.archivers.ferc.xbrl.archive_year", new=_archive_year)
+    mocker.patch("pudl_archiver.archivers.ferc.xbrl.FILING_DOWNLOAD_CONCURRENCY", 4)
+
+    resources = await archive_xbrl_for_form(
+        FercForm.FORM_1, tmp_path, lambda year: True, None
+    )
+
+    # Both years download at once, within the shared limit
+    assert max_in_flight == 4
+    # The 2022 taxonomy is archived before the 2021 filings finish
+    assert events == [
+        "year 2022",
+        f"taxonomy {_taxonomy(2022)}",
+        "year 2021",
+        f"taxonomy {_taxonomy(2021)}",
+    ]
+    assert [resource.partitions.get("year") for resource in resources] == [
+        2021,
+        2022,
+        None,
+    ]
+    with zipfile.ZipFile(resources[-1].local_path) as archive:
+        assert archive.namelist() == ["form-1-2021-01-01.zip", "form-1-2022-01-01.zip"]
+        assert archive.read("form-1-2022-01-01.zip") == _taxonomy(2022).encode()
+
+
+@pytest.mark.asyncio
+async def test_download_window_shared(mocker, tmp_path):
+    """Downloaded filings held in memory should be limited across all years."""
+
+    def _filing(year: int, i: int) -> FeedEntry:
+        return FeedEntry(
+            title=f"Filer {i}",
+            summary_detail={
+                "value": f'href="https://ecollection.ferc.gov/download/{year}/filer{i}.xbrl">www.filer{i}.xbrl<'
+            },
+            published="Fri, 29 Oct 2021 16:14:44 -0400",
+            ferc_formname=FercForm.FORM_1,
+            ferc_year=year,
+            ferc_period="Q4",
+        )
+
+    years = [2020, 2021, 2022]
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl.IndexedFilings.index_available_entries",
+        return_value=IndexedFilings(
+            filings_per_year={
+                year: {_filing(year, i) for i in range(8)} for year in years
+            }
+        ),
+    )
+    held = 0
+    max_held = 0
+
+    async def _download_filing(filing, session):
+        nonlocal held, max_held
+        held += 1
+        max_held = max(max_held, held)
+        await asyncio.sleep(random.uniform(0, 0.01))  # noqa: S311
+        return b"https://ecollection.ferc.gov/taxonomy/form1/2021-01-01/form/form1/form-1_2021-01-01.xsd"
+
+    def _add_to_archive(archive, filename, data):
+        nonlocal held
+        if filename.endswith(".xbrl"):
+            held -= 1
+
+    async def _archive_taxonomy(taxonomy, session):
+        return taxonomy.encode()
+
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl._download_filing", new=_download_filing
+    )
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl.add_to_archive_stable_hash",
+        new=_add_to_archive,
+    )
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl._archive_taxonomy", new=_archive_taxonomy
+    )
+    mocker.patch("pudl_archiver.archivers.ferc.xbrl.FILING_DOWNLOAD_CONCURRENCY", 2)
+    mocker.patch("pudl_archiver.archivers.ferc.xbrl.FILING_DOWNLOAD_WINDOW", 3)
+
+    resources = await asyncio.wait_for(
+        archive_xbrl_for_form(FercForm.FORM_1, tmp_path, lambda year: True, None),
+        timeout=10,
+    )
+
+    assert [resource.partitions.get("year") for resource in resources] == [
+        *years,
+        None,
+    ]
+    assert held == 0
+    assert max_held == 3
+
+
+@pytest.mark.asyncio
+async def test_archive_xbrl_for_form_year_fails(mocker, tmp_path):
+    """A single failed year should raise its own error, not an exception group."""
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl.IndexedFilings.index_available_entries",
+        return_value=IndexedFilings(filings_per_year={2020: set(), 2021: set()}),
+    )
+
+    async def _archive_year(year, *args):
+        if year == 2021:
+            raise RuntimeError("Failed to archive 2021")
+        await asyncio.sleep(10)
+
+    mocker.patch("pudl_archiver.archivers.ferc.xbrl.archive_year", new=_archive_year)
+
+    with pytest.raises(RuntimeError, match="Failed to archive 2021"):
+        await asyncio.wait_for(
+            archive_xbrl_for_form(FercForm.FORM_1, tmp_path, lambda year: True, None),
+            timeout=5,
+        )
+
+
+@pytest.mark.asyncio
+async def test_incremental_archive(mocker, tmp_path, rss_cache):
+    """Unchanged filings should be reused from the previous archive of each year."""
+
+    def _filing(i: int, published: str = "Fri, 29 Oct 2021 16:14:44 -0400"):
+        return FeedEntry(
+            title=f"Filer {i}",
+            summary_detail={
+                "value": f'href="https://ecollection.ferc.gov/download/filer{i}.xbrl">www.filer{i}.xbrl<'
+            },
+            published=published,
+            ferc_formname=FercForm.FORM_1,
+            ferc_year=2021,
+            ferc_period="Q4",
+        )
+
+    downloaded = []
+
+    async def _download_filing(filing, session):
+        downloaded.append(filing.title)
+        # Filings differ, but all reference the same taxonomy
+        return f"{filing.title} {filing.published_parsed} https://ecollection.ferc.gov/taxonomy/form1/2021-01-01/form/form1/form-1_2021-01-01.xsd".encode()
+
+    async def _archive_taxonomy(taxonomy, session):
+        return b"taxonomy"
+
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl._download_filing", new=_download_filing
+    )
+    mocker.patch(
+        "pudl_archiver.archivers.ferc.xbrl._archive_taxonomy", new=_archive_taxonomy
+    )
+    published_dir = tmp_path / "published"
+    published_dir.mkdir()
+
+    async def _previous_file(filename: str, path: Path) -> Path | None:
+        if not (published_dir / filename).exists():
+            return None
+        path.write_bytes((published_dir / filename).read_bytes())
+        return path
+
+    async def _archive(filings: set[FeedEntry]) -> bytes:
+        output_dir = tmp_path / f"output-{len(list(tmp_path.iterdir()))}"
+        output_dir.mkdir()
+        mocker.patch(
+            "pudl_archiver.archivers.ferc.xbrl.IndexedFilings.index_available_entries",
+            return_value=IndexedFilings(filings_per_year={2021: filings}),
+        )
+        downloaded.clear()
+        resources = await archive_xbrl_for_form(
+            FercForm.FORM_1,
+            output_dir,
+            lambda year: True,
+            None,
+            previous_file=_previous_file,
+        )
+        # Downloaded previous versions are cleaned up
+        assert not list(output_dir.glob("previous-*"))
+        return resources[0].local_path.read_bytes()
+
+    # Nothing to reuse on the first run
+    first = await _archive({_filing(i) for i in range(3)})
+    assert sorted(downloaded) == ["Filer 0", "Filer 1", "Filer 2"]
+
+    # Nothing changed, so the cached archive is reused in full
+    assert await _archive({_filing(i) for i in range(3)}) == first
+    assert downloaded == []
+
+    # Without a cache, the published archive is used. Only the updated and new
+    # filings are downloaded, and the archive matches a full download.
+    (published_dir / "ferc1-xbrl-2021.zip").write_bytes(first)
+    (xbrl._xbrl_cache_dir() / "ferc1-xbrl-2021.zip").unlink()
+    filings = {
+        _filing(0),
+        _filing(1, published="Mon, 1 Nov 2021 10:00:00 -0400"),
+        _filing(2),
+        _filing(3),
+    }
+    incremental = await _archive(filings)
+    assert sorted(downloaded) == ["Filer 1", "Filer 3"]
+
+    (xbrl._xbrl_cache_dir() / "ferc1-xbrl-2021.zip").unlink()
+    published_dir.joinpath("ferc1-xbrl-2021.zip").unlink()
+    assert await _archive(filings) == incremental
+    assert len(downloaded) == 4
+
+
+@pytest.mark.asyncio
+async def test_archive_taxonomy(mocker, rss_cache):
+    """Taxonomy files should be fetched once per run, and cached between runs."""
+    base_url = "https://ecollection.ferc.gov/taxonomy/form1"
+    entry_points = {
+        f"{base_url}/2022-01-01/form/form1/form-1_2022-01-01.xsd": [
+            f"{base_url}/2022-01-01/form/form1/form-1_2022-01-01.xsd",
+            f"{base_url}/shared/core.xsd",
+            "http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd",
+        ],
+        f"{base_url}/2023-01-01/form/form1/form-1_2023-01-01.xsd": [
+            f"{base_url}/2023-01-01/form/form1/form-1_2023-01-01.xsd",
+            f"{base_url}/shared/core.xsd",
+        ],
+    }
+    requested = []
+
+    class _Session:
+        async def get(self, url, raise_for_status=False):
+            requested.append(url)
+            await asyncio.sleep(0.01)
+            return mocker.Mock(
+                content=mocker.Mock(read=mocker.AsyncMock(return_value=url.encode()))
+            )
+
+    run_cpu = mocker.patch.object(
+        xbrl.get_cpu_pool(),
+        "run",
+        side_effect=lambda fn, entry_point: entry_points[entry_point],
+    )
+
+    async def _archive_all() -> list[bytes]:
+        return await asyncio.gather(
+            *[
+                xbrl._archive_taxonomy(entry_point, _Session())
+                for entry_point in entry_points
+            ]
+        )
+
+    first = await _archive_all()
+    # Shared files are only fetched once, and non-FERC files are skipped
+    assert sorted(requested) == sorted([*entry_points, f"{base_url}/shared/core.xsd"])
+    assert run_cpu.call_count == 2
+    with zipfile.ZipFile(io.BytesIO(first[0])) as archive:
+        assert archive.namelist() == [
+            "taxonomy/form1/2022-01-01/form/form1/form-1_2022-01-01.xsd",
+            "taxonomy/form1/shared/core.xsd",
+        ]
+        assert (
+            archive.read("taxonomy/form1/shared/core.xsd")
+            == f"{base_url}/shared/core.xsd".encode()
+        )
+
+    # Another run reads everything from the cache
+    xbrl._taxonomy_documents.clear()
+    requested.clear()
+    assert await _archive_all() == first
+    assert requested == []
+    assert run_cpu.call_count == 2
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 2**16])
+def test_find_taxonomy_url(chunk_size):
+    """The first taxonomy URL should be found wherever chunks split it."""
+    taxonomy_url = "https://ecollection.ferc.gov/taxonomy/form1/2022-01-01/form/form1/form-1_2022-01-01.xsd"
+    filing = io.BytesIO(
+        b'<?xml version="1.0"?>\n<xbrli:xbrl>\n'
+        + f'<link:schemaRef xlink:href="{taxonomy_url.upper()}"/>\n'.encode()
+        + b"<fact/>\n" * 10000
+        + taxonomy_url.replace("2022", "2023").encode()
+    )
+
+    assert xbrl.find_taxonomy_url(filing, chunk_size=chunk_size) == taxonomy_url.lower()
+    # Reading stops once the URL is found
+    assert filing.tell() < 200 + chunk_size
+
+    # URLs outside the search window aren't found
+    filing.seek(0)
+    assert xbrl.find_taxonomy_url(filing, window=50, chunk_size=chunk_size) is None
+    assert filing.tell() == 50
+
+
+class _FakeFercOnlinePage:
+    """Page of the ferc online app that downloads a year when its link is clicked."""
+
+    def __init__(self, downloads: dict, fail_year: str | None = None):
+        self.downloads = downloads
+        self.fail_year = fail_year
+        self.clicked = None
+
+    async def goto(self, url, timeout):
+        pass
+
+    def get_by_role(self, role, name, exact=False):
+        async def _click(timeout=None):
+            if name == self.fail_year:
+                raise PlaywrightTimeoutError("Timeout exceeded")
+            self.clicked = name
+
+        return SimpleNamespace(click=_click)
+
+    @contextlib.asynccontextmanager
+    async def expect_download(self, timeout):
+        async def _download():
+            year = self.clicked
+            self.downloads["in_flight"] += 1
+            self.downloads["max_in_flight"] = max(
+                self.downloads["max_in_flight"], self.downloads["in_flight"]
+            )
+            await asyncio.sleep(
+                {"2001": 0.2, "2002": 0.04, "2003": 0.1, "2004": 0.02, "2005": 0.08}[
+                    year
+                ]
+            )
+            self.downloads["in_flight"] -= 1
+
+            async def _save_as(path):
+                path.write_text(year)
+
+            return SimpleNamespace(save_as=_save_as)
+
+        info = SimpleNamespace(value=None)
+        yield info
+        info.value = _download()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fail_year", [None, "2003"])
+async def test_get_resources_for_form(mocker, tmp_path, fail_year):
+    """Years should download concurrently and be yielded as soon as they finish."""
+    downloads = {"in_flight": 0, "max_in_flight": 0}
+    pages = []
+
+    async def _new_page():
+        pages.append(_FakeFercOnlinePage(downloads, fail_year))
+        return pages[-1]
+
+    context = SimpleNamespace(new_page=_new_page)
+
+    @contextlib.asynccontextmanager
+    async def _context():
+        yield context
+
+    mocker.patch.object(
+        ferc_online_helpers,
+        "get_browser_pool",
+        return_value=SimpleNamespace(context=_context),
+    )
+
+    resources = ferc_online_helpers.get_resources_for_form(
+        ferc_form="1",
+        years=[2001, 2002, 2003, 2004, 2005],
+        partitions_base={"data_format": "dbf"},
+        download_directory=tmp_path,
+        concurrency=3,
+    )
+    if fail_year is not None:
+        with pytest.raises(RuntimeError, match="Timed out waiting for ferc1 2003"):
+            [resource async for resource in resources]
+        return
+
+    years = [resource.partitions["year"] async for resource in resources]
+    assert len(pages) == 3
+    assert downloads["max_in_flight"] == 3
+    # Each year is yielded as soon as it's downloaded
+    assert years == [2002, 2004, 2003, 2005, 2001]
+    assert (tmp_path / "ferc1-2004.zip").read_text() == "2004"
@@ -0,0 +1,41 @@
+"""Test the run journal."""
+
+import pytest
+
+from pudl_archiver.frictionless import ResourceInfo
+from pudl_archiver.journal import RunJournal
+from pudl_archiver.utils import RunSettings
+
+
+@pytest.mark.asyncio
+async def test_journal_round_trip(tmp_path):
+    """Entries should be read back, ignoring a last line cut off by a crash."""
+    path = tmp_path / "journal.jsonl"
+    settings = RunSettings(depositor="fsspec", only_years=[2020])
+    journal = RunJournal.create(path, "eia860", settings)
+    for year in [2020, 2021]:
+        await journal.record_resource(
+            f"eia860-{year}.zip",
+            ResourceInfo(
+                local_path=tmp_path / f"{year}.zip", partitions={"year": year}
+            ),
+            md5_hash=f"hash{year}",
+            action="CREATE",
+        )
+    with path.open("a") as f:
+        f.write('{"entry_type": "resource", "name": "eia86')
+
+    journal = RunJournal.load(path)
+    assert journal.dataset == "eia860"
+    assert journal.start.run_settings == settings
+    assert [
+        (entry.name, entry.partitions, entry.md5_hash) for entry in journal.resources
+    ] == [
+        ("eia860-2020.zip", {"year": 2020}, "hash2020"),
+        ("eia860-2021.zip", {"year": 2021}, "hash2021"),
+    ]
+
+    # Only the last line may be incomplete
+    path.write_text(path.read_text().replace('"hash2020"', '"hash2020'))
+    with pytest.raises(ValueError):
+        RunJournal.load(path)
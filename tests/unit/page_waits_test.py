@@ -0,0 +1,120 @@
+"""Test waiting for Playwright pages to be ready."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from pudl_archiver.archivers import page_waits
+from pudl_archiver.archivers.page_waits import (
+    PageWaitMetrics,
+    wait_for_network_idle,
+    wait_for_response,
+    wait_for_stable_count,
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(mocker):
+    """Poll locators often, so tests run quickly."""
+    mocker.patch.object(page_waits, "POLL_INTERVAL_MS", 5)
+
+
+class _FakeLocator:
+    """Locator matching more elements over time, like a list rendered in batches."""
+
+    def __init__(self, counts: list[tuple[float, int]]):
+        """Match ``count`` elements from ``seconds`` after creation."""
+        self.counts = counts
+        self.start = time.monotonic()
+
+    async def count(self) -> int:
+        elapsed = time.monotonic() - self.start
+        return max(
+            (count for seconds, count in self.counts if seconds <= elapsed), default=0
+        )
+
+
+@pytest.mark.asyncio
+async def test_wait_for_stable_count():
+    """Wait should return once the count stops changing, not after a fixed time."""
+    locator = _FakeLocator([(0.02, 10), (0.04, 30), (0.06, 50)])
+    metrics = PageWaitMetrics()
+
+    count = await wait_for_stable_count(locator, stable_for_ms=50, metrics=metrics)
+
+    assert count == 50
+    assert metrics.waits == {"stable count": 1}
+    # Last batch rendered at 60ms, and the count must stay the same for 50ms
+    assert 0.11 <= metrics.total_s["stable count"] < 0.5
+
+
+@pytest.mark.asyncio
+async def test_wait_for_stable_count_timeout():
+    """Wait should fail if too few elements are found in time."""
+    locator = _FakeLocator([(0.0, 2)])
+    metrics = PageWaitMetrics()
+
+    with pytest.raises(TimeoutError, match="matched 2 elements"):
+        await wait_for_stable_count(
+            locator, min_count=3, timeout_ms=50, metrics=metrics
+        )
+    assert metrics.waits == {}
+
+
+class _FakePage:
+    """Page that goes idle, or responds, after a delay."""
+
+    url = "https://example.com"
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.requested = asyncio.Event()
+
+    async def wait_for_load_state(self, state, timeout):
+        assert state == "networkidle"
+        if self.delay * 1000 > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise PlaywrightTimeoutError("Timeout")
+        await asyncio.sleep(self.delay)
+
+    @asynccontextmanager
+    async def expect_response(self, url_pattern, timeout):
+        async def _response():
+            await self.requested.wait()
+            await asyncio.sleep(self.delay)
+            return f"response to {url_pattern}"
+
+        class _Info:
+            value = asyncio.ensure_future(_response())
+
+        yield _Info
+
+
+@pytest.mark.asyncio
+async def test_wait_for_network_idle():
+    """Pages that never go idle shouldn't fail."""
+    metrics = PageWaitMetrics()
+
+    assert await wait_for_network_idle(_FakePage(0.01), metrics=metrics)
+    assert not await wait_for_network_idle(_FakePage(1), timeout_ms=10, metrics=metrics)
+    assert metrics.waits == {"network idle": 2}
+    assert metrics.max_s["network idle"] < 0.5
+
+
+@pytest.mark.asyncio
+async def test_wait_for_response():
+    """Response triggered by the action should be returned once it arrives."""
+    page = _FakePage(0.01)
+    metrics = PageWaitMetrics()
+
+    async def _click():
+        page.requested.set()
+
+    response = await wait_for_response(page, "**/downloads", _click, metrics=metrics)
+
+    assert response == "response to **/downloads"
+    assert metrics.waits == {"response": 1}
+    assert "1 response" in metrics.summarize()
@@ -0,0 +1,169 @@
+"""Test predicting which resources will change before downloading them."""
+
+import datetime
+import email.utils
+import hashlib
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pudl_archiver.archivers.classes import AbstractDatasetArchiver
+from pudl_archiver.archivers.plan import RemoteSource, predict_changes, record_source
+from pudl_archiver.frictionless import DataPackage, Resource, ResourceInfo
+
+PUBLISHED = datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC)
+BEFORE = email.utils.format_datetime(PUBLISHED - datetime.timedelta(days=1), True)
+AFTER = email.utils.format_datetime(PUBLISHED + datetime.timedelta(days=1), True)
+
+DATA = b"Some file contents"
+DATA_MD5 = hashlib.md5(DATA).hexdigest()  # noqa: S324
+
+# Response headers for each file on the fake server
+FILES = {
+    "/md5_match.zip": {"ETag": f'"{DATA_MD5}"'},
+    "/md5_mismatch.zip": {"ETag": f'"{"0" * 32}"'},
+    "/old_a.csv": {"Last-Modified": BEFORE, "ETag": '"abc-2"'},
+    "/old_b.csv": {"Last-Modified": BEFORE},
+    "/new_b.csv": {"Last-Modified": AFTER},
+    "/same_size.zip": {"Content-Length": str(len(DATA))},
+}
+
+
+def _resource(name: str, year: int) -> Resource:
+    return Resource(
+        name=name,
+        path=f"https://www.example.com/{name}",
+        title=name,
+        parts={"year": year},
+        mediatype="application/zip",
+        format="zip",
+        bytes=len(DATA),
+        hash=DATA_MD5,
+    )
+
+
+class _PlanArchiver(AbstractDatasetArchiver):
+    name = "test_archiver"
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    async def get_resources(self):
+        single_files = {
+            2015: "/md5_match.zip",
+            2016: "/md5_mismatch.zip",
+            2019: "/same_size.zip",
+            2021: "/md5_match.zip",
+        }
+        for year, path in single_files.items():
+            yield self.get_zipfile(path, year), {"year": year}
+        yield self.get_csvs(["/old_a.csv", "/old_b.csv"], 2017), {"year": 2017}
+        yield self.get_csvs(["/old_a.csv", "/new_b.csv"], 2018), {"year": 2018}
+        yield self.get_parsed(2020), {"year": 2020}
+
+    async def get_zipfile(self, path: str, year: int) -> ResourceInfo:
+        zip_path = self.download_directory / f"{year}.zip"
+        await self.download_zipfile(f"{self.base_url}{path}", zip_path)
+        return ResourceInfo(local_path=zip_path, partitions={"year": year})
+
+    async def get_csvs(self, paths: list[str], year: int) -> ResourceInfo:
+        zip_path = self.download_directory / f"{year}.zip"
+        for path in paths:
+            await self.download_add_to_archive_and_unlink(
+                f"{self.base_url}{path}", path.strip("/"), zip_path
+            )
+        return ResourceInfo(local_path=zip_path, partitions={"year": year})
+
+    async def get_parsed(self, year: int) -> ResourceInfo:
+        path = self.download_directory / f"{year}.csv"
+        await self.download_file(f"{self.base_url}/old_a.csv", path)
+        # Reading the downloaded file fails when planning
+        path.read_text()
+        return ResourceInfo(local_path=path, partitions={"year": year})
+
+
+@pytest.mark.asyncio
+async def test_plan_resources():
+    """Resources should be planned with HEAD requests and compared to a datapackage."""
+    requests = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request.method)
+        return web.Response(body=DATA, headers=FILES[request.path])
+
+    app = web.Application()
+    for path in FILES:
+        app.router.add_route("*", path, handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            archiver = _PlanArchiver(str(server.make_url("")), session=session)
+            planned_resources = await archiver.plan_resources()
+    finally:
+        await server.close()
+
+    assert set(requests) == {"HEAD"}
+    datapackage = DataPackage(
+        name="test",
+        title="test",
+        description="",
+        keywords=[],
+        contributors=[],
+        sources=[],
+        licenses=[],
+        resources=[
+            _resource(f"test-{year}.zip", year)
+            for year in [2014, 2015, 2016, 2017, 2018, 2019, 2020]
+        ],
+        created=PUBLISHED.isoformat(),
+    )
+    change_plan = predict_changes("test", planned_resources, datapackage)
+
+    predictions = {
+        prediction.partitions["year"]: prediction.prediction
+        for prediction in change_plan.predictions
+    }
+    assert predictions == {
+        2014: "deleted",
+        2015: "unchanged",
+        2016: "changed",
+        2017: "unknown",
+        2018: "changed",
+        2019: "unknown",
+        2020: "unknown",
+        2021: "new",
+    }
+    assert change_plan.unchanged_partitions == {
+        "test-2015.zip": {"year": 2015},
+    }
+
+
+@pytest.mark.asyncio
+async def test_plan_streamed_resource():
+    """Resources streamed from async generators should be planned too."""
+
+    class _StreamArchiver(AbstractDatasetArchiver):
+        name = "test_stream_archiver"
+
+        async def get_resources(self):
+            yield self.stream_resources(), {"year": 2020}
+
+        async def stream_resources(self):
+            for i in range(2):
+                record_source(RemoteSource(url=f"https://www.example.com/{i}.zip"))
+                yield ResourceInfo(
+                    local_path=self.download_directory / f"{i}.zip",
+                    partitions={"year": 2020},
+                )
+
+    [planned] = await _StreamArchiver(session=None).plan_resources()
+
+    assert planned.complete
+    assert [source.url for source in planned.sources] == [
+        "https://www.example.com/0.zip",
+        "https://www.example.com/1.zip",
+    ]
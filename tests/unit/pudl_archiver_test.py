@@ -1,9 +1,14 @@
 """Test archiver pudl_archiver."""
 
+import asyncio
+
 import pytest
 
-from pudl_archiver import archive_dataset
+from pudl_archiver import archive_dataset, archive_datasets
+from pudl_archiver.archivers.classes import AbstractDatasetArchiver
+from pudl_archiver.archivers.plan import ChangePlan, ResourcePrediction
 from pudl_archiver.archivers.validate import RunSummary, ValidationTestResult
+from pudl_archiver.frictionless import DataPackage, Resource, ResourceInfo
 from pudl_archiver.utils import RunSettings
 
 
@@ -89,3 +94,143 @@ async def test_archive_dataset(
     with pytest.raises(RuntimeError):
         await archive_dataset("eia860", run_settings=settings)
     mocked_json_dump.assert_called_once_with(failed_run.model_dump(), indent=2)
+
+
+@pytest.mark.asyncio
+async def test_archive_dataset_journal(
+    successful_run: RunSummary, failed_run: RunSummary, mocker, tmp_path
+):
+    """Journals should be kept after a failed run, and deleted after a successful one."""
+    journal_file = tmp_path / "eia860_run_journal.jsonl"
+    settings = RunSettings(journal_file=str(journal_file))
+
+    mocker.patch(
+        "pudl_archiver.orchestrate_run",
+        new=mocker.AsyncMock(return_value=(failed_run, None)),
+    )
+    with pytest.raises(RuntimeError):
+        await archive_dataset("eia860", run_settings=settings)
+    assert journal_file.exists()
+
+    mocker.patch(
+        "pudl_archiver.orchestrate_run",
+        new=mocker.AsyncMock(return_value=(successful_run, "published")),
+    )
+    await archive_dataset("eia860", run_settings=settings)
+    assert not journal_file.exists()
+
+
+@pytest.mark.asyncio
+async def test_archive_datasets(
+    successful_run: RunSummary,
+    failed_run: RunSummary,
+    mocker,
+    tmp_path,
+):
+    """Datasets should be archived concurrently, each writing its own summary."""
+    running = 0
+    max_running = 0
+    sessions = set()
+
+    async def _orchestrate_run(dataset, downloader, run_settings, session, **kwargs):
+        nonlocal running, max_running
+        sessions.add(session)
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return (failed_run if dataset == "eia861" else successful_run), None
+
+    mocker.patch("pudl_archiver.orchestrate_run", new=_orchestrate_run)
+    datasets = ["eia860", "eia861", "eia923", "ferc1"]
+    run_settings = {
+        dataset: RunSettings(summary_file=str(tmp_path / f"{dataset}.json"))
+        for dataset in datasets
+    }
+
+    with pytest.raises(RuntimeError, match="Failed to archive datasets: eia861$"):
+        await archive_datasets(run_settings, max_concurrent_datasets=2)
+
+    assert max_running == 2
+    assert len(sessions) == 1
+    for dataset in datasets:
+        summary = RunSummary.model_validate_json(
+            (tmp_path / f"{dataset}.json").read_text()
+        )
+        expected = failed_run if dataset == "eia861" else successful_run
+        assert summary.dataset_name == expected.dataset_name
+
+
+@pytest.mark.asyncio
+async def test_archive_dataset_only_changed(successful_run: RunSummary, mocker):
+    """Resources predicted to be unchanged should be skipped with ``only_changed``."""
+    change_plan = ChangePlan(
+        dataset="eia860",
+        predictions=[
+            ResourcePrediction(
+                name=f"eia860-{year}.zip",
+                partitions={"year": year},
+                prediction=prediction,
+                reason="",
+            )
+            for year, prediction in [(2020, "unchanged"), (2021, "changed")]
+        ],
+    )
+    mocker.patch("pudl_archiver._plan_dataset", return_value=change_plan)
+    mocked_orchestrator = mocker.AsyncMock(return_value=(successful_run, None))
+    mocker.patch("pudl_archiver.orchestrate_run", new=mocked_orchestrator)
+
+    await archive_dataset("eia860", run_settings=RunSettings(only_changed=True))
+
+    assert mocked_orchestrator.await_args.kwargs["skip_partitions"] == {
+        "eia860-2020.zip": {"year": 2020}
+    }
+
+
+class _UnpartitionedArchiver(AbstractDatasetArchiver):
+    name = "unpartitioned"
+
+    async def get_resources(self):
+        yield self.get_year(2020)
+
+    async def get_year(self, year: int) -> ResourceInfo:
+        raise AssertionError("Resources shouldn't be downloaded when planning")
+
+
+@pytest.mark.asyncio
+async def test_archive_dataset_only_changed_unpartitioned(
+    successful_run: RunSummary, mocker
+):
+    """Archivers that don't return partitions should download every resource."""
+    mocker.patch.dict(
+        "pudl_archiver.ARCHIVERS", {"unpartitioned": _UnpartitionedArchiver}
+    )
+    datapackage = DataPackage(
+        name="unpartitioned",
+        title="unpartitioned",
+        description="",
+        keywords=[],
+        contributors=[],
+        sources=[],
+        licenses=[],
+        resources=[
+            Resource(
+                name="unpartitioned-2020.zip",
+                path="https://www.example.com/unpartitioned-2020.zip",
+                title="unpartitioned-2020.zip",
+                parts={"year": 2020},
+                mediatype="application/zip",
+                format="zip",
+                bytes=1,
+                hash="0" * 32,
+            )
+        ],
+        created="2025-01-01T00:00:00+00:00",
+    )
+    mocker.patch("pudl_archiver.get_published_datapackage", return_value=datapackage)
+    mocked_orchestrator = mocker.AsyncMock(return_value=(successful_run, None))
+    mocker.patch("pudl_archiver.orchestrate_run", new=mocked_orchestrator)
+
+    await archive_dataset("unpartitioned", run_settings=RunSettings(only_changed=True))
+
+    assert mocked_orchestrator.await_args.kwargs["skip_partitions"] == {}
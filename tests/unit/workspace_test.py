@@ -0,0 +1,136 @@
+"""Test limiting and cleaning up local disk usage while downloading."""
+
+import asyncio
+
+import pytest
+
+from pudl_archiver.archivers.classes import AbstractDatasetArchiver
+from pudl_archiver.archivers.workspace import DownloadWorkspace
+from pudl_archiver.frictionless import ResourceInfo
+
+
+@pytest.mark.asyncio
+async def test_release(tmp_path):
+    """Only files inside the workspace should be deleted when released."""
+    workspace = DownloadWorkspace()
+    inside = workspace.directory / "inside.zip"
+    inside.write_bytes(b"x" * 100)
+    outside = tmp_path / "outside.zip"
+    outside.write_bytes(b"x" * 100)
+    await workspace.add(inside)
+    await workspace.add(outside)
+
+    assert workspace.bytes_on_disk() == 100
+    await workspace.release(inside)
+    await workspace.release(outside)
+
+    assert not inside.exists()
+    assert outside.exists()
+    assert workspace.bytes_on_disk() == 0
+    assert workspace.metrics.files_released == 1
+    assert workspace.metrics.bytes_released == 100
+    assert workspace.metrics.peak_bytes == 100
+    workspace.cleanup()
+    assert not workspace.root.exists()
+
+
+@pytest.mark.asyncio
+async def test_new_directory():
+    """Starting a new directory should delete the previous one."""
+    workspace = DownloadWorkspace()
+    first = workspace.new_directory()
+    (first / "leftover.csv").write_text("leftover")
+    await workspace.add(first / "leftover.csv")
+    assert workspace.bytes_on_disk() == 8
+    second = workspace.new_directory()
+
+    assert first != second
+    assert not first.exists()
+    assert list(workspace.root.iterdir()) == [second]
+    assert workspace.bytes_on_disk() == 0
+    workspace.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_space():
+    """Downloads should pause while over the high-water mark and others are running."""
+    workspace = DownloadWorkspace(high_water_bytes=100)
+    existing = workspace.directory / "existing.zip"
+    existing.write_bytes(b"x" * 150)
+    await workspace.add(existing)
+    started = []
+
+    async def _download(name: str):
+        async with workspace.downloading():
+            await workspace.wait_for_space()
+            started.append(name)
+
+    async def _deposit():
+        with workspace.depositing():
+            await asyncio.sleep(0.05)
+            assert started == []
+            await workspace.release(existing)
+
+    await asyncio.gather(_deposit(), _download("a"), _download("b"))
+
+    assert sorted(started) == ["a", "b"]
+    assert workspace.metrics.pauses == 2
+    assert workspace.metrics.pause_s > 0
+    workspace.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_space_alone():
+    """A download shouldn't wait when nothing else could free up space."""
+    workspace = DownloadWorkspace(high_water_bytes=100)
+    (workspace.directory / "existing.zip").write_bytes(b"x" * 150)
+    await workspace.add(workspace.directory / "existing.zip")
+
+    async with workspace.downloading():
+        await asyncio.wait_for(workspace.wait_for_space(), timeout=1)
+
+    assert workspace.metrics.pauses == 0
+    workspace.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_space_oversized_resources(mocker):
+    """Resources larger than the high-water mark should each be downloaded in turn."""
+
+    class _LargeArchiver(AbstractDatasetArchiver):
+        name = "large"
+
+        async def get_resources(self):
+            for i in range(2):
+                yield self.get_resource(i)
+            yield self.stream_resources()
+
+        async def _download(self, i: int) -> ResourceInfo:
+            await self.workspace.wait_for_space()
+            path = self.download_directory / f"{i}.csv"
+            path.write_bytes(b"x" * 150)
+            return ResourceInfo(local_path=path, partitions={"idx": i})
+
+        async def get_resource(self, i: int) -> ResourceInfo:
+            return await self._download(i)
+
+        async def stream_resources(self):
+            for i in range(2, 4):
+                yield await self._download(i)
+
+    archiver = _LargeArchiver(session=None, max_disk_bytes=100)
+    mocker.patch.object(archiver, "run_cpu", return_value=[])
+
+    async def _deposit_all():
+        deposited = []
+        async for name, resource in archiver.download_all_resources():
+            await asyncio.sleep(0.01)
+            await archiver.workspace.release(resource.local_path)
+            deposited.append(name)
+        return deposited
+
+    deposited = await asyncio.wait_for(_deposit_all(), timeout=5)
+
+    assert sorted(deposited) == ["0.csv", "1.csv", "2.csv", "3.csv"]
+    assert archiver.workspace.metrics.files_released == 4
+    archiver.workspace.cleanup()
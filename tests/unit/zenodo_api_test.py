@@ -1,9 +1,15 @@
 """Test zenodo API client."""
 
+import time
+
 import pydantic
 import pytest
 
 from pudl_archiver.depositors.zenodo.depositor import DatasetSettings
+from pudl_archiver.depositors.zenodo.rate_limit import (
+    RateLimitBudget,
+    ZenodoRateLimiter,
+)
 
 
 def test_dataset_settings():
@@ -26,3 +32,43 @@ def test_dataset_settings():
             sandbox_doi="random string",
             production_doi="other random string",
         )
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_budget():
+    """Requests should wait for the window to reset once the budget is used up."""
+    budget = RateLimitBudget("write", max_concurrency=4)
+    reset_at = time.time() + 0.2
+    budget.update(
+        200, {"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": str(reset_at)}
+    )
+    # Responses from earlier in the window don't increase the remaining budget
+    budget.update(
+        200, {"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": str(reset_at)}
+    )
+
+    for _ in range(2):
+        async with budget.slot():
+            pass
+    assert budget.metrics.rate_limit_waits == 0
+
+    async with budget.slot():
+        assert time.time() >= reset_at
+    assert budget.metrics.rate_limit_waits == 1
+    assert 0 < budget.metrics.rate_limit_wait_s <= 0.2
+    assert budget.metrics.requests == 3
+
+    # A 429 response without rate limit headers waits for Retry-After
+    budget.update(429, {"Retry-After": "0.1"})
+    assert budget.metrics.rate_limited == 1
+    start = time.time()
+    async with budget.slot():
+        assert time.time() - start >= 0.09
+
+
+def test_rate_limiter_budgets():
+    """Reads and writes should use separate budgets."""
+    limiter = ZenodoRateLimiter(max_concurrent_reads=2, max_concurrent_writes=1)
+    assert limiter.budget_for("GET") is limiter.read
+    assert limiter.budget_for("put") is limiter.write
+    assert limiter.budget_for("POST") is limiter.write
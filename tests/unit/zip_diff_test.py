@@ -0,0 +1,63 @@
+"""Test comparing zipfile members using their central directories."""
+
+import io
+import random
+import zipfile
+
+import pytest
+
+from pudl_archiver.archivers.zip_diff import diff_zipfile
+
+
+def _make_zip(path, members: dict[str, bytes], comment: bytes = b"") -> bytes:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+        archive.comment = comment
+    return path.read_bytes()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tail_size", [2**22, 100])
+async def test_diff_zipfile(tmp_path, tail_size):
+    """Member changes should be found from the tail of the published zipfile."""
+    # Enough members that the central directory doesn't fit in the smallest tail
+    common = {f"member_{i:04}.csv": f"a,b\n{i},{i}\n".encode() for i in range(2000)}
+    common["padding.bin"] = random.Random(0).randbytes(1_000_000)  # noqa: S311
+    baseline = _make_zip(
+        tmp_path / "old.zip",
+        common
+        | {
+            "updated.csv": b"a,b\n3,4\n",
+            "deleted.csv": b"a,b\n5,6\n",
+        },
+        comment=b"published version",
+    )
+    _make_zip(
+        tmp_path / "new.zip",
+        common
+        | {
+            "updated.csv": b"a,b\n3,40\n",
+            "created.csv": b"a,b\n7,8\n",
+        },
+    )
+    ranges_read = []
+
+    async def read_range(start: int, end: int) -> bytes:
+        ranges_read.append((start, end))
+        return baseline[start:end]
+
+    member_changes = await diff_zipfile(
+        tmp_path / "new.zip", read_range, len(baseline), tail_size
+    )
+
+    assert [(diff.name, diff.diff_type, diff.size_diff) for diff in member_changes] == [
+        ("created.csv", "CREATE", 8),
+        ("deleted.csv", "DELETE", -8),
+        ("updated.csv", "UPDATE", 1),
+    ]
+    if tail_size < len(baseline):
+        # Only the central directory and end of the file are read
+        central_directory_start = zipfile.ZipFile(io.BytesIO(baseline)).start_dir
+        assert ranges_read[-1][0] == central_directory_start
+        assert len(ranges_read) == 2